@@ -13,7 +13,7 @@ ExportAgent - 데이터 내보내기 전담 에이전트
 import csv
 import json
 import io
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime
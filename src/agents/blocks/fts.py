@@ -0,0 +1,14 @@
+"""
+FTS5 전문 검색 공통 설정
+
+StorageAgent(create_fts_index)와 QueryAgent(full_text_search)가 같은
+컬럼 정의를 사용하도록 한 곳에서 관리합니다.
+"""
+
+from typing import Dict, List
+
+# 테이블 → FTS5 인덱스/LIKE 검색 대상 컬럼
+FTS_COLUMNS: Dict[str, List[str]] = {
+    "video_files": ["filename", "title", "description"],
+    "video_metadata": ["event_name", "stage", "extra"],
+}
@@ -11,6 +11,7 @@ ParserAgent - 파일명 파싱 전담 에이전트
 """
 
 import re
+import string
 from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -20,10 +21,18 @@ from ...core.agent_context import AgentContext
 from ...core.agent_result import AgentResult
 from ...core.exceptions import AgentExecutionError
 
+# RE2 (선형 시간 정규식 엔진, 선택 의존성)
+try:
+    import re2
 
-@dataclass
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+
+@dataclass(slots=True)
 class ParsedMetadata:
-    """파싱된 메타데이터"""
+    """파싱된 메타데이터 (배치 파싱 시 인스턴스가 대량 생성되므로 __slots__ 사용)"""
 
     filename: str
     project: Optional[str] = None
@@ -56,6 +65,153 @@ class ParsedMetadata:
         }
 
 
+# ASCII 대문자 → 소문자 변환 테이블
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _fold_case(text: str) -> str:
+    """
+    정규식 매칭용 소문자 변환
+
+    re.IGNORECASE 대신 파일명을 한 번만 소문자로 바꿔 매칭합니다.
+    매치 위치로 원본 문자열을 잘라내므로 길이가 보존되어야 하며,
+    lower()가 길이를 바꾸는 일부 유니코드 문자(예: 'İ')가 있으면
+    ASCII 문자만 변환합니다.
+    """
+    folded = text.lower()
+    if len(folded) != len(text):
+        folded = text.translate(_ASCII_LOWER)
+    return folded
+
+
+def _compile_project_pattern(pattern: str) -> Any:
+    """
+    프로젝트 패턴 컴파일
+
+    프로젝트 패턴의 lazy 클래스([^-]+?)와 선택 그룹은 백트래킹 비용이 크므로
+    RE2가 설치되어 있으면 선형 시간 엔진으로 컴파일합니다.
+    RE2가 없거나 패턴을 지원하지 않으면 표준 re 모듈을 사용합니다.
+    """
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+
+def _original_group(match: re.Match, original: str, name: str) -> str:
+    """소문자 변환 문자열의 매치 그룹에 해당하는 원본 문자열 반환"""
+    # RE2 매치 객체는 start()/end()에 그룹 이름을 받지 않으므로 인덱스로 변환
+    start, end = match.span(match.re.groupindex[name])
+    return original[start:end]
+
+
+# ─────────────────────────────────────────────────────────────────
+# 프로젝트별 그룹 추출기
+#
+# 각 함수는 해당 프로젝트 패턴이 정의한 named group만 다룹니다.
+# groupdict() 대신 match.group(*names)로 필요한 그룹만 튜플로 꺼냅니다.
+# match는 소문자 변환된 파일명 기준이므로 문자열 값은 원본(filename)에서 잘라냅니다.
+# 숫자 그룹은 \d 로 제한되므로 int() 변환은 실패하지 않습니다.
+# confidence는 누적 신뢰도이며, 추출된 필드의 가산치를 더한 값을 반환합니다.
+# (가산 순서를 유지해 합계의 부동소수점 값이 항상 같도록 함)
+# ─────────────────────────────────────────────────────────────────
+
+
+def _extract_wsop(
+    match: re.Match,
+    filename: str,
+    result: ParsedMetadata,
+    confidence: float,
+) -> float:
+    """WSOP: year, event_num, event_name, day, part"""
+    year, event_num, event_name, day, part = match.group(
+        "year", "event_num", "event_name", "day", "part"
+    )
+    if year:
+        result.year = int(year)
+        confidence += 0.15
+    if event_num:
+        result.event_number = int(event_num)
+        confidence += 0.1
+    if event_name:
+        result.event_name = _original_group(match, filename, "event_name").strip()
+        confidence += 0.1
+    if day:
+        result.stage = f"Day {day}"
+        confidence += 0.1
+    if part:
+        result.part = int(part)
+        confidence += 0.05
+    return confidence
+
+
+def _extract_wpt(
+    match: re.Match,
+    filename: str,
+    result: ParsedMetadata,
+    confidence: float,
+) -> float:
+    """WPT: year, event_name, episode, part"""
+    year, event_name, episode, part = match.group(
+        "year", "event_name", "episode", "part"
+    )
+    if year:
+        result.year = int(year)
+        confidence += 0.15
+    if event_name:
+        result.event_name = _original_group(match, filename, "event_name").strip()
+        confidence += 0.1
+    if part:
+        result.part = int(part)
+        confidence += 0.05
+    if episode:
+        result.episode = int(episode)
+        confidence += 0.05
+    return confidence
+
+
+def _extract_ggpk(
+    match: re.Match,
+    filename: str,
+    result: ParsedMetadata,
+    confidence: float,
+) -> float:
+    """GGPK: year, event_name, part"""
+    year, event_name, part = match.group("year", "event_name", "part")
+    if year:
+        result.year = int(year)
+        confidence += 0.15
+    if event_name:
+        result.event_name = _original_group(match, filename, "event_name").strip()
+        confidence += 0.1
+    if part:
+        result.part = int(part)
+        confidence += 0.05
+    return confidence
+
+
+def _extract_ept_apt(
+    match: re.Match,
+    filename: str,
+    result: ParsedMetadata,
+    confidence: float,
+) -> float:
+    """EPT/APT: year, event_name, day (EPT의 location은 사용하지 않음)"""
+    year, event_name, day = match.group("year", "event_name", "day")
+    if year:
+        result.year = int(year)
+        confidence += 0.15
+    if event_name:
+        result.event_name = _original_group(match, filename, "event_name").strip()
+        confidence += 0.1
+    if day:
+        result.stage = f"Day {day}"
+        confidence += 0.1
+    return confidence
+
+
 class ParserAgent(BaseAgent):
     """
     파일명 파싱 전담 에이전트
@@ -85,52 +241,57 @@ class ParserAgent(BaseAgent):
         - suggest_normalization: 정규화된 파일명 제안
     """
 
-    # 프로젝트 패턴 정의 (컴파일된 정규식)
+    # 프로젝트 패턴 정의 (컴파일된 정규식, RE2 사용 가능 시 RE2)
+    # 프로젝트/스테이지 패턴은 소문자 기준이며 _fold_case() 결과에 적용합니다.
     PROJECT_PATTERNS = {
-        "WSOP": re.compile(
-            r"WSOP\s*(?P<year>\d{4})?\s*"
-            r"(?:Event\s*#?(?P<event_num>\d+))?\s*"
+        "WSOP": _compile_project_pattern(
+            r"wsop\s*(?P<year>\d{4})?\s*"
+            r"(?:event\s*#?(?P<event_num>\d+))?\s*"
             r"(?P<event_name>[^-]+?)?\s*"
-            r"(?:Day\s*(?P<day>\d+))?\s*"
-            r"(?:Part\s*(?P<part>\d+))?",
-            re.IGNORECASE,
+            r"(?:day\s*(?P<day>\d+))?\s*"
+            r"(?:part\s*(?P<part>\d+))?"
         ),
-        "WPT": re.compile(
-            r"WPT\s*(?P<year>\d{4})?\s*"
+        "WPT": _compile_project_pattern(
+            r"wpt\s*(?P<year>\d{4})?\s*"
             r"(?P<event_name>[^-]+?)?\s*"
-            r"(?:Ep(?:isode)?\s*(?P<episode>\d+))?\s*"
-            r"(?:Part\s*(?P<part>\d+))?",
-            re.IGNORECASE,
+            r"(?:ep(?:isode)?\s*(?P<episode>\d+))?\s*"
+            r"(?:part\s*(?P<part>\d+))?"
         ),
-        "GGPK": re.compile(
-            r"(?:GG\s*(?:Poker)?|GGPK)\s*"
+        "GGPK": _compile_project_pattern(
+            r"(?:gg\s*(?:poker)?|ggpk)\s*"
             r"(?P<year>\d{4})?\s*"
             r"(?P<event_name>[^-]+?)?\s*"
-            r"(?:Part\s*(?P<part>\d+))?",
-            re.IGNORECASE,
+            r"(?:part\s*(?P<part>\d+))?"
         ),
-        "EPT": re.compile(
-            r"EPT\s*(?P<year>\d{4})?\s*"
-            r"(?P<location>[A-Za-z]+)?\s*"
+        "EPT": _compile_project_pattern(
+            r"ept\s*(?P<year>\d{4})?\s*"
+            r"(?P<location>[a-z]+)?\s*"
             r"(?P<event_name>[^-]+?)?\s*"
-            r"(?:Day\s*(?P<day>\d+))?",
-            re.IGNORECASE,
+            r"(?:day\s*(?P<day>\d+))?"
         ),
-        "APT": re.compile(
-            r"APT\s*(?P<year>\d{4})?\s*"
+        "APT": _compile_project_pattern(
+            r"apt\s*(?P<year>\d{4})?\s*"
             r"(?P<event_name>[^-]+?)?\s*"
-            r"(?:Day\s*(?P<day>\d+))?",
-            re.IGNORECASE,
+            r"(?:day\s*(?P<day>\d+))?"
         ),
     }
 
+    # 프로젝트별 그룹 추출기 (PROJECT_PATTERNS와 키 동일)
+    PROJECT_EXTRACTORS = {
+        "WSOP": _extract_wsop,
+        "WPT": _extract_wpt,
+        "GGPK": _extract_ggpk,
+        "EPT": _extract_ept_apt,
+        "APT": _extract_ept_apt,
+    }
+
     # 스테이지 패턴
     STAGE_PATTERNS = [
-        (re.compile(r"Final\s*Table", re.IGNORECASE), "Final Table"),
-        (re.compile(r"Day\s*(\d+)", re.IGNORECASE), "Day {0}"),
-        (re.compile(r"Heads?\s*Up", re.IGNORECASE), "Heads Up"),
-        (re.compile(r"Bubble", re.IGNORECASE), "Bubble"),
-        (re.compile(r"ITM|In\s*The\s*Money", re.IGNORECASE), "ITM"),
+        (re.compile(r"final\s*table"), "Final Table"),
+        (re.compile(r"day\s*(\d+)"), "Day {0}"),
+        (re.compile(r"heads?\s*up"), "Heads Up"),
+        (re.compile(r"bubble"), "Bubble"),
+        (re.compile(r"itm|in\s*the\s*money"), "ITM"),
     ]
 
     # 날짜 패턴
@@ -140,6 +301,17 @@ class ParserAgent(BaseAgent):
         re.compile(r"(\d{4})(\d{2})(\d{2})"),  # YYYYMMDD
     ]
 
+    # 프로젝트 미감지 시 키워드 패턴
+    POKER_KEYWORD_PATTERN = re.compile(r"poker")
+
+    # 부가 정보 패턴 (해상도/코덱을 단일 패스로 탐지)
+    EXTRA_PATTERN = re.compile(
+        r"(?P<res_p>\d{3,4})p"
+        r"|(?P<res_wh>(?P<res_w>\d{3,4})x(?P<res_h>\d{3,4}))"
+        r"|(?P<codec>h264|h265|hevc|x264|x265|av1)",
+        re.IGNORECASE,
+    )
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Args:
@@ -152,6 +324,12 @@ class ParserAgent(BaseAgent):
         self._strict_mode = self.config.get("strict_mode", False)
         self._min_confidence = self.config.get("min_confidence", 0.5)
 
+        # _do_parse 핫루프용 (이름, 바운드 search, 추출기) 튜플
+        self._project_matchers = tuple(
+            (name, pattern.search, self.PROJECT_EXTRACTORS[name])
+            for name, pattern in self.PROJECT_PATTERNS.items()
+        )
+
     def get_capabilities(self) -> List[str]:
         """에이전트 능력 목록"""
         return [
@@ -174,6 +352,7 @@ class ParserAgent(BaseAgent):
                 - action: 수행할 액션 (parse_filename, parse_batch, detect_project)
                 - filename: 파일명 (단일)
                 - filenames: 파일명 목록 (배치)
+                - include_parsed: suggest_normalization 결과에 파싱 상세 포함 여부 (기본: False)
 
         Returns:
             AgentResult: 파싱 결과
@@ -232,11 +411,13 @@ class ParserAgent(BaseAgent):
                 error_type="ValidationError",
             )
 
+        # 토큰 추적 (배치 전체를 한 번에 반영)
+        self._track_tokens(sum(self._estimate_tokens(f) for f in filenames))
+
         results = []
         warnings = []
 
         for filename in filenames:
-            self._track_tokens(self._estimate_tokens(filename))
             parsed = self._do_parse(filename)
 
             if parsed.confidence < self._min_confidence:
@@ -266,9 +447,10 @@ class ParserAgent(BaseAgent):
 
         project = None
         confidence = 0.0
+        folded = _fold_case(filename)
 
-        for project_name, pattern in self.PROJECT_PATTERNS.items():
-            match = pattern.search(filename)
+        for project_name, search, extractor in self._project_matchers:
+            match = search(folded)
             if match:
                 project = project_name
                 confidence = 0.9
@@ -276,8 +458,7 @@ class ParserAgent(BaseAgent):
 
         if not project:
             # 키워드 기반 추측
-            filename_lower = filename.lower()
-            if "poker" in filename_lower:
+            if self.POKER_KEYWORD_PATTERN.search(folded):
                 project = "GENERAL_POKER"
                 confidence = 0.5
             else:
@@ -306,33 +487,31 @@ class ParserAgent(BaseAgent):
         extra = {}
 
         # 파일 확장자
-        if "." in filename:
-            extra["extension"] = filename.rsplit(".", 1)[-1].lower()
-
-        # 해상도 감지
-        resolution_match = re.search(
-            r"(\d{3,4})[pP]|(\d{3,4})x(\d{3,4})", filename
-        )
-        if resolution_match:
-            if resolution_match.group(1):
-                extra["resolution"] = f"{resolution_match.group(1)}p"
-            else:
-                extra["resolution"] = (
-                    f"{resolution_match.group(2)}x{resolution_match.group(3)}"
-                )
-
-        # 코덱 감지
-        codec_patterns = ["h264", "h265", "hevc", "x264", "x265", "av1"]
-        for codec in codec_patterns:
-            if codec in filename.lower():
-                extra["codec"] = codec
+        dot = filename.rfind(".")
+        if dot >= 0:
+            extra["extension"] = filename[dot + 1:].lower()
+
+        # 해상도/코덱 감지 (단일 패스, 각 항목은 처음 발견된 값 사용)
+        for match in self.EXTRA_PATTERN.finditer(filename):
+            kind = match.lastgroup
+            if kind == "codec":
+                extra.setdefault("codec", match.group("codec").lower())
+            elif "resolution" not in extra:
+                if kind == "res_p":
+                    extra["resolution"] = f"{match.group('res_p')}p"
+                else:  # res_wh
+                    extra["resolution"] = (
+                        f"{match.group('res_w')}x{match.group('res_h')}"
+                    )
+            if "codec" in extra and "resolution" in extra:
                 break
 
         parsed.extra.update(extra)
 
+        data = parsed.to_dict()
         return AgentResult.success_result(
-            data=parsed.to_dict(),
-            metrics={"fields_extracted": len([v for v in parsed.to_dict().values() if v])},
+            data=data,
+            metrics={"fields_extracted": sum(1 for v in data.values() if v)},
         )
 
     async def _suggest_normalization(self, input_data: Dict[str, Any]) -> AgentResult:
@@ -367,19 +546,18 @@ class ParserAgent(BaseAgent):
         if parts:
             normalized = "_".join(parts)
             # 확장자 유지
-            if "." in filename:
-                ext = filename.rsplit(".", 1)[-1]
-                normalized = f"{normalized}.{ext}"
+            dot = filename.rfind(".")
+            if dot >= 0:
+                normalized = f"{normalized}.{filename[dot + 1:]}"
         else:
             normalized = filename
 
-        return AgentResult.success_result(
-            data={
-                "original": filename,
-                "normalized": normalized,
-                "parsed": parsed.to_dict(),
-            },
-        )
+        data = {"original": filename, "normalized": normalized}
+        # 파싱 상세는 요청 시에만 포함 (to_dict 재구성 비용 절감)
+        if input_data.get("include_parsed", False):
+            data["parsed"] = parsed.to_dict()
+
+        return AgentResult.success_result(data=data)
 
     def _do_parse(self, filename: str) -> ParsedMetadata:
         """
@@ -392,72 +570,39 @@ class ParserAgent(BaseAgent):
             ParsedMetadata: 파싱 결과
         """
         result = ParsedMetadata(filename=filename)
-        confidence_factors = []
+        confidence = 0.0
+        # 패턴 매칭은 소문자 사본에, 문자열 값 추출은 원본에 수행
+        folded = _fold_case(filename)
 
         # 1. 프로젝트 패턴 매칭
-        for project_name, pattern in self.PROJECT_PATTERNS.items():
-            match = pattern.search(filename)
+        for project_name, search, extractor in self._project_matchers:
+            match = search(folded)
             if match:
                 result.project = project_name
-                result.raw_match = match.group(0)
-                confidence_factors.append(0.4)
-
-                # 그룹에서 데이터 추출
-                groups = match.groupdict()
-
-                if groups.get("year"):
-                    try:
-                        result.year = int(groups["year"])
-                        confidence_factors.append(0.15)
-                    except ValueError:
-                        pass
-
-                if groups.get("event_num"):
-                    try:
-                        result.event_number = int(groups["event_num"])
-                        confidence_factors.append(0.1)
-                    except ValueError:
-                        pass
-
-                if groups.get("event_name"):
-                    result.event_name = groups["event_name"].strip()
-                    confidence_factors.append(0.1)
-
-                if groups.get("day"):
-                    result.stage = f"Day {groups['day']}"
-                    confidence_factors.append(0.1)
-
-                if groups.get("part"):
-                    try:
-                        result.part = int(groups["part"])
-                        confidence_factors.append(0.05)
-                    except ValueError:
-                        pass
-
-                if groups.get("episode"):
-                    try:
-                        result.episode = int(groups["episode"])
-                        confidence_factors.append(0.05)
-                    except ValueError:
-                        pass
+                result.raw_match = filename[match.start():match.end()]
+                confidence += 0.4
+
+                # 프로젝트별 그룹 추출 (패턴이 정의한 그룹만 처리)
+                confidence = extractor(match, filename, result, confidence)
 
                 break
 
         # 2. 스테이지 패턴 매칭 (프로젝트와 별개로)
+        # 카테고리별 독립 검색: 인접한 스테이지/날짜 토큰이 서로를 가리지 않도록 함
         if not result.stage:
             for stage_pattern, stage_template in self.STAGE_PATTERNS:
-                stage_match = stage_pattern.search(filename)
+                stage_match = stage_pattern.search(folded)
                 if stage_match:
                     if stage_match.groups():
                         result.stage = stage_template.format(*stage_match.groups())
                     else:
                         result.stage = stage_template
-                    confidence_factors.append(0.05)
+                    confidence += 0.05
                     break
 
         # 3. 날짜 패턴 매칭
         for date_pattern in self.DATE_PATTERNS:
-            date_match = date_pattern.search(filename)
+            date_match = date_pattern.search(folded)
             if date_match:
                 groups = date_match.groups()
                 if len(groups) == 3:
@@ -469,21 +614,15 @@ class ParserAgent(BaseAgent):
 
                     # 연도 추출 (없으면)
                     if not result.year:
-                        try:
-                            year = int(groups[0]) if len(groups[0]) == 4 else int(groups[2])
-                            if 2000 <= year <= 2030:
-                                result.year = year
-                        except ValueError:
-                            pass
-
-                    confidence_factors.append(0.1)
+                        year = int(groups[0]) if len(groups[0]) == 4 else int(groups[2])
+                        if 2000 <= year <= 2030:
+                            result.year = year
+
+                    confidence += 0.1
                 break
 
         # 4. 신뢰도 계산
-        result.confidence = min(1.0, sum(confidence_factors))
-
         # 프로젝트를 찾지 못한 경우 낮은 신뢰도
-        if not result.project:
-            result.confidence = min(result.confidence, 0.3)
+        result.confidence = min(1.0 if result.project else 0.3, confidence)
 
         return result
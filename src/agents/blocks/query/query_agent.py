@@ -10,16 +10,52 @@ QueryAgent - 고급 검색 전담 에이전트
 - 집계 연산
 """
 
+import asyncio
+import hashlib
+import json
+import re
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from dataclasses import dataclass, field
 from enum import Enum
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from ...core.base_agent import BaseAgent
 from ...core.agent_context import AgentContext
 from ...core.agent_result import AgentResult
 from ...core.exceptions import AgentExecutionError
+from ..fts import FTS_COLUMNS
+from ..sqlite_pragmas import CONNECTION_PRAGMAS
+
+# orjson (결과 캐시 키 직렬화, 선택 의존성)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# APSW (SQLITE_PREPARE_PERSISTENT 지원, 선택 의존성)
+try:
+    import apsw
+
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
 
 
 class SortOrder(Enum):
@@ -28,44 +64,209 @@ class SortOrder(Enum):
     DESC = "DESC"
 
 
-@dataclass
+# 식별자에 허용되지 않는 문자 (str.isalnum() 또는 "_"가 아닌 문자와 동일)
+_NON_IDENTIFIER_CHARS = re.compile(r"\W")
+
+
+def _sanitize_identifier(name: str) -> str:
+    """SQL 식별자 sanitize (영숫자, 언더스코어만 허용)"""
+    return _NON_IDENTIFIER_CHARS.sub("", name)
+
+
+# 연산자 → (조건문 렌더러(필드, IN 값 개수), 바인딩 값 변환)
+_OPERATORS: Dict[str, Tuple[Callable[[str, int], str], Callable[[Any], List[Any]]]] = {
+    "eq": (lambda f, n: f"{f} = ?", lambda v: [v]),
+    "ne": (lambda f, n: f"{f} != ?", lambda v: [v]),
+    "gt": (lambda f, n: f"{f} > ?", lambda v: [v]),
+    "gte": (lambda f, n: f"{f} >= ?", lambda v: [v]),
+    "lt": (lambda f, n: f"{f} < ?", lambda v: [v]),
+    "lte": (lambda f, n: f"{f} <= ?", lambda v: [v]),
+    "like": (lambda f, n: f"{f} LIKE ?", lambda v: [f"%{v}%"]),
+    "in": (lambda f, n: f"{f} IN ({', '.join('?' * n)})", list),
+    "between": (lambda f, n: f"{f} BETWEEN ? AND ?", lambda v: list(v[:2])),
+    "is_null": (lambda f, n: f"{f} IS NULL", lambda v: []),
+    "is_not_null": (lambda f, n: f"{f} IS NOT NULL", lambda v: []),
+}
+
+
+def _get_operator(
+    operator: str,
+) -> Tuple[Callable[[str, int], str], Callable[[Any], List[Any]]]:
+    """연산자 조회 (알 수 없는 연산자는 ValueError)"""
+    try:
+        return _OPERATORS[operator]
+    except KeyError:
+        raise ValueError(f"Unknown operator: {operator}") from None
+
+
+@lru_cache(maxsize=512)
+def _render_condition(field: str, operator: str, arity: int) -> str:
+    """
+    필터 조건 SQL 렌더링 (값 제외)
+
+    Args:
+        field: 필드명 (sanitize 전)
+        operator: 연산자
+        arity: IN 연산자의 값 개수 (그 외 0)
+
+    Returns:
+        ? 플레이스홀더를 포함한 조건문
+    """
+    render, _ = _get_operator(operator)
+    return render(_sanitize_identifier(field), arity)
+
+
+def _fts_match_expression(query: str) -> str:
+    """
+    사용자 입력을 FTS5 MATCH 식으로 변환
+
+    각 단어를 큰따옴표로 감싸 FTS5 연산자(AND/OR/NEAR, -, : 등)로
+    해석되지 않게 하고, 접두어 검색(*)을 붙입니다. LIKE '%q%'와 달리
+    토큰 앞부분만 매칭됩니다.
+    """
+    terms = ['"' + term.replace('"', '""') + '"*' for term in query.split()]
+    return " ".join(terms)
+
+
+@dataclass(slots=True)
 class QueryFilter:
-    """쿼리 필터"""
+    """쿼리 필터 (요청마다 필터 수만큼 생성되므로 __slots__ 사용)"""
 
     field: str
     operator: str  # eq, ne, gt, gte, lt, lte, like, in, between
     value: Any
     logic: str = "AND"  # AND, OR
 
+    def shape(self) -> Tuple[str, str, str, int]:
+        """값을 제외한 필터 형태 (SQL 렌더링 캐시 키)"""
+        arity = len(self.value) if self.operator == "in" else 0
+        return (self.field, self.operator, self.logic, arity)
+
+    def bind_values(self) -> List[Any]:
+        """플레이스홀더에 바인딩할 값 목록"""
+        _, transform = _get_operator(self.operator)
+        return transform(self.value)
+
     def to_sql(self) -> Tuple[str, List[Any]]:
         """SQL 조건문으로 변환"""
-        field_safe = "".join(c if c.isalnum() or c == "_" else "" for c in self.field)
-
-        if self.operator == "eq":
-            return f"{field_safe} = ?", [self.value]
-        elif self.operator == "ne":
-            return f"{field_safe} != ?", [self.value]
-        elif self.operator == "gt":
-            return f"{field_safe} > ?", [self.value]
-        elif self.operator == "gte":
-            return f"{field_safe} >= ?", [self.value]
-        elif self.operator == "lt":
-            return f"{field_safe} < ?", [self.value]
-        elif self.operator == "lte":
-            return f"{field_safe} <= ?", [self.value]
-        elif self.operator == "like":
-            return f"{field_safe} LIKE ?", [f"%{self.value}%"]
-        elif self.operator == "in":
-            placeholders = ", ".join("?" for _ in self.value)
-            return f"{field_safe} IN ({placeholders})", list(self.value)
-        elif self.operator == "between":
-            return f"{field_safe} BETWEEN ? AND ?", list(self.value[:2])
-        elif self.operator == "is_null":
-            return f"{field_safe} IS NULL", []
-        elif self.operator == "is_not_null":
-            return f"{field_safe} IS NOT NULL", []
+        field, operator, _, arity = self.shape()
+        return _render_condition(field, operator, arity), self.bind_values()
+
+
+@lru_cache(maxsize=512)
+def _render_where(filters: Tuple[Tuple[str, str, str, int], ...]) -> str:
+    """필터 형태 목록으로부터 WHERE 조건문 렌더링 (WHERE 키워드 제외)"""
+    conditions = []
+    for i, (field, operator, logic, arity) in enumerate(filters):
+        condition = _render_condition(field, operator, arity)
+        if i > 0:
+            conditions.append(f"{logic} {condition}")
         else:
-            raise ValueError(f"Unknown operator: {self.operator}")
+            conditions.append(condition)
+    return " ".join(conditions)
+
+
+@lru_cache(maxsize=512)
+def _render_query(shape: Tuple[Any, ...]) -> str:
+    """
+    QueryBuilder 형태(shape)로부터 SQL 렌더링
+
+    값은 모두 ? 로 바인딩되므로 형태가 같은 쿼리는 같은 SQL 텍스트를
+    공유하며, 문자열 조립/식별자 sanitize는 형태당 한 번만 수행됩니다.
+    """
+    (
+        table,
+        columns,
+        filters,
+        order_by,
+        group_by,
+        having,
+        has_limit,
+        has_offset,
+        joins,
+    ) = shape
+
+    table_safe = _sanitize_identifier(table)
+
+    # SELECT
+    if columns == ("*",):
+        col_str = "*"
+    else:
+        col_str = ", ".join(columns)
+
+    sql = f"SELECT {col_str} FROM {table_safe}"
+
+    # JOINs
+    for join in joins:
+        sql += f" {join}"
+
+    # WHERE
+    if filters:
+        sql += f" WHERE {_render_where(filters)}"
+
+    # GROUP BY
+    if group_by:
+        group_cols = ", ".join(_sanitize_identifier(col) for col in group_by)
+        sql += f" GROUP BY {group_cols}"
+
+    # HAVING
+    if having:
+        having_conditions = [
+            _render_condition(field, operator, arity)
+            for field, operator, _, arity in having
+        ]
+        sql += f" HAVING {' AND '.join(having_conditions)}"
+
+    # ORDER BY
+    if order_by:
+        order_parts = []
+        for col, order in order_by:
+            col_safe = _sanitize_identifier(col)
+            order_parts.append(f"{col_safe} {order}")
+        sql += f" ORDER BY {', '.join(order_parts)}"
+
+    # LIMIT/OFFSET (값은 바인딩: 페이지가 달라도 SQL 텍스트 동일)
+    if has_limit:
+        sql += " LIMIT ? OFFSET ?"
+    elif has_offset:
+        # SQLite는 LIMIT 없는 OFFSET을 허용하지 않음
+        sql += " LIMIT -1 OFFSET ?"
+
+    return sql
+
+
+@lru_cache(maxsize=128)
+def _render_facet_query(table: str, facet_fields: Tuple[str, ...], limit: int) -> str:
+    """
+    패싯 집계 SQL 렌더링 (모든 패싯을 UNION ALL 한 번의 쿼리로)
+
+    각 행은 (facet, value, count)이며 facet은 facet_fields의 인덱스입니다.
+    패싯별 ORDER BY/LIMIT은 서브쿼리 안에서 적용됩니다.
+    """
+    arms = []
+    for i, facet_field in enumerate(facet_fields):
+        facet_safe = _sanitize_identifier(facet_field)
+        arms.append(
+            f"SELECT * FROM (SELECT {i} AS facet, {facet_safe} AS value, "
+            f"COUNT(*) AS count FROM {table} GROUP BY {facet_safe} "
+            f"ORDER BY count DESC LIMIT {int(limit)})"
+        )
+    return " UNION ALL ".join(arms)
+
+
+@dataclass
+class BuiltQuery:
+    """
+    QueryBuilder 빌드 결과
+
+    where_clause/where_params는 같은 조건의 COUNT 등 파생 쿼리에서
+    필터를 다시 렌더링하지 않고 재사용하기 위한 값입니다.
+    """
+
+    sql: str
+    params: List[Any]
+    where_clause: str = ""
+    where_params: List[Any] = field(default_factory=list)
 
 
 @dataclass
@@ -81,90 +282,159 @@ class QueryBuilder:
     limit: Optional[int] = None
     offset: int = 0
     joins: List[str] = field(default_factory=list)
+    # 페이지 조회 시 전체 매칭 수 필요 여부 (SQL에는 영향 없음, _fetch_page가 별도 COUNT)
+    with_total: bool = False
+
+    def shape_key(self) -> Tuple[Any, ...]:
+        """바인딩 값을 제외한 쿼리 형태 (렌더링 캐시 키)"""
+        return (
+            self.table,
+            tuple(self.columns),
+            tuple(f.shape() for f in self.filters),
+            tuple((col, order.value) for col, order in self.order_by),
+            tuple(self.group_by),
+            tuple(h.shape() for h in self.having),
+            self.limit is not None,
+            self.offset > 0,
+            tuple(self.joins),
+        )
 
-    def build(self) -> Tuple[str, List[Any]]:
+    def build(self) -> BuiltQuery:
         """SQL 쿼리 생성"""
-        params = []
-        table_safe = "".join(c if c.isalnum() or c == "_" else "" for c in self.table)
+        shape = self.shape_key()
+
+        # 형태 순서(WHERE → HAVING → LIMIT/OFFSET)대로 바인딩 값 연결
+        where_params = []
+        for f in self.filters:
+            where_params.extend(f.bind_values())
+        params = list(where_params)
+        for h in self.having:
+            params.extend(h.bind_values())
+        if self.limit is not None:
+            params.extend((int(self.limit), int(self.offset)))
+        elif self.offset > 0:
+            params.append(int(self.offset))
+
+        return BuiltQuery(
+            sql=_render_query(shape),
+            params=params,
+            where_clause=_render_where(shape[2]) if self.filters else "",
+            where_params=where_params,
+        )
 
-        # SELECT
-        if self.columns == ["*"]:
-            col_str = "*"
-        else:
-            col_str = ", ".join(self.columns)
 
-        sql = f"SELECT {col_str} FROM {table_safe}"
+def _pack_items(
+    columns: List[str], rows: List[tuple], layout: str
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    튜플 행을 응답 items 형식으로 변환
 
-        # JOINs
-        for join in self.joins:
-            sql += f" {join}"
+    soa 레이아웃은 컬럼명을 한 번만 담아 행마다 키 문자열이 반복되지 않습니다.
+    """
+    if layout == "soa":
+        return {"columns": columns, "rows": rows}
+    return [dict(zip(columns, row)) for row in rows]
 
-        # WHERE
-        if self.filters:
-            conditions = []
-            for i, f in enumerate(self.filters):
-                condition, values = f.to_sql()
-                if i > 0:
-                    conditions.append(f"{f.logic} {condition}")
-                else:
-                    conditions.append(condition)
-                params.extend(values)
 
-            sql += f" WHERE {' '.join(conditions)}"
+class _ResultCache:
+    """
+    검색 결과 TTL + LRU 캐시
 
-        # GROUP BY
-        if self.group_by:
-            group_cols = ", ".join(
-                "".join(c if c.isalnum() or c == "_" else "" for c in col)
-                for col in self.group_by
-            )
-            sql += f" GROUP BY {group_cols}"
-
-        # HAVING
-        if self.having:
-            having_conditions = []
-            for h in self.having:
-                condition, values = h.to_sql()
-                having_conditions.append(condition)
-                params.extend(values)
-            sql += f" HAVING {' AND '.join(having_conditions)}"
-
-        # ORDER BY
-        if self.order_by:
-            order_parts = []
-            for col, order in self.order_by:
-                col_safe = "".join(c if c.isalnum() or c == "_" else "" for c in col)
-                order_parts.append(f"{col_safe} {order.value}")
-            sql += f" ORDER BY {', '.join(order_parts)}"
-
-        # LIMIT/OFFSET
-        if self.limit is not None:
-            sql += f" LIMIT {int(self.limit)}"
-        if self.offset > 0:
-            sql += f" OFFSET {int(self.offset)}"
+    키는 (세대, PRAGMA data_version, 입력 해시)입니다. 다른 연결이 커밋하면
+    data_version이 바뀌어 이전 항목은 더 이상 조회되지 않습니다 (LRU로 정리됨).
+    invalidate()는 세대를 올려 전체 항목을 즉시 무효화합니다.
+    적중 시 저장된 결과 객체를 복사 없이 그대로 반환하므로 (복사 비용이 쿼리와
+    비슷함), 호출자는 캐시 대상 액션의 result.data를 수정하면 안 됩니다.
+    """
 
-        return sql, params
+    def __init__(self, maxsize: int, ttl: float):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._generation = 0
+        self._entries: "OrderedDict[Tuple[int, int, bytes], Tuple[float, Any]]" = OrderedDict()
+
+    def make_key(
+        self, input_data: Dict[str, Any], data_version: int
+    ) -> Tuple[int, int, bytes]:
+        """입력 데이터의 정규화 해시 키 (data_version 포함)"""
+        if ORJSON_AVAILABLE:
+            canonical = orjson.dumps(
+                input_data,
+                default=str,
+                option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            )
+        else:
+            canonical = json.dumps(
+                input_data, sort_keys=True, default=str, separators=(",", ":")
+            ).encode()
+        digest = hashlib.blake2b(canonical, digest_size=16).digest()
+        return (self._generation, data_version, digest)
+
+    def get(self, key: Tuple[int, int, bytes]) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple[int, int, bytes], value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self._ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries.clear()
 
 
 @dataclass
 class SearchResult:
     """검색 결과"""
 
-    items: List[Dict[str, Any]] = field(default_factory=list)
-    total: int = 0
+    items: Union[List[Dict[str, Any]], Dict[str, Any]] = field(default_factory=list)
+    total: Optional[int] = 0  # include_total=False 요청 시 None
     page: int = 1
     page_size: int = 20
     facets: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    has_more: Optional[bool] = None
+
+    @property
+    def returned_count(self) -> int:
+        """반환 행 수 (레이아웃 무관)"""
+        if isinstance(self.items, dict):
+            return len(self.items["rows"])
+        return len(self.items)
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
+        data = {
             "items": self.items,
             "total": self.total,
             "page": self.page,
             "page_size": self.page_size,
-            "total_pages": (self.total + self.page_size - 1) // self.page_size if self.page_size > 0 else 0,
-            "facets": self.facets,
         }
+        if self.total is None:
+            data["has_more"] = self.has_more
+        else:
+            data["total_pages"] = (self.total + self.page_size - 1) // self.page_size if self.page_size > 0 else 0
+        data["facets"] = self.facets
+        return data
+
+
+@dataclass
+class _SearchPlan:
+    """검증/빌드가 끝난 search 실행 계획"""
+
+    builder: QueryBuilder
+    built: BuiltQuery
+    referenced: List[str]
+    layout: str
+    page: int
+    page_size: int
 
 
 class QueryAgent(BaseAgent):
@@ -174,17 +444,22 @@ class QueryAgent(BaseAgent):
     복잡한 검색 쿼리와 집계를 수행합니다.
 
     사용법:
-        agent = QueryAgent(config={"db_path": "pokervod.db"})
-        result = await agent.execute(context, {
-            "action": "search",
-            "table": "video_files",
-            "query": "WSOP 2023",
-            "filters": [{"field": "project", "operator": "eq", "value": "WSOP"}],
-            "facets": ["project", "year"]
-        })
+        async with QueryAgent(config={"db_path": "pokervod.db"}) as agent:
+            result = await agent.execute(context, {
+                "action": "search",
+                "table": "video_files",
+                "query": "WSOP 2023",
+                "filters": [{"field": "project", "operator": "eq", "value": "WSOP"}],
+                "facets": ["project", "year"]
+            })
+
+    Note:
+        스레드별 영속 연결과 스레드 풀은 close()에서만 해제됩니다.
+        async with 없이 생성했다면 사용 후 close()를 호출하세요.
 
     Capabilities:
         - search: 검색 실행
+        - search_batch: 여러 검색을 한 번에 실행
         - full_text_search: 전문 검색
         - faceted_search: 패싯 검색
         - build_query: 동적 쿼리 빌드
@@ -195,12 +470,38 @@ class QueryAgent(BaseAgent):
     # 검색 가능한 테이블
     SEARCHABLE_TABLES = {"video_files", "video_metadata", "projects", "events"}
 
-    # FTS 컬럼 (전문 검색)
-    FTS_COLUMNS = {
-        "video_files": ["filename", "title", "description"],
-        "video_metadata": ["event_name", "stage", "extra"],
+    # FTS 컬럼 (전문 검색, StorageAgent와 공유)
+    FTS_COLUMNS = FTS_COLUMNS
+
+    # 결과 캐시 대상 액션 (읽기 전용)
+    CACHEABLE_ACTIONS = {
+        "search",
+        "search_batch",
+        "full_text_search",
+        "faceted_search",
+        "aggregate",
+        "count",
     }
 
+    # 검색 결과 items 레이아웃
+    # aos: [{컬럼: 값}, ...], soa: {"columns": [...], "rows": [[...], ...]}
+    ITEM_LAYOUTS = ("aos", "soa")
+
+    # 패싯별 최대 값 개수
+    FACET_LIMIT = 20
+
+    # CTE 구체화 힌트 (SQLite 3.35+에서만 지원)
+    _CTE_MATERIALIZED = (
+        "MATERIALIZED " if sqlite3.sqlite_version_info >= (3, 35, 0) else ""
+    )
+
+    # 연결당 prepared statement 캐시 크기
+    STATEMENT_CACHE_SIZE = 256
+
+    # 연결 생성 시 한 번 적용하는 PRAGMA (공통 튜닝 + 잠금 대기 시간)
+    # journal_mode(WAL)는 DB 파일 설정이므로 쓰기 담당인 StorageAgent가 지정
+    CONNECTION_PRAGMAS = CONNECTION_PRAGMAS + ("PRAGMA busy_timeout=5000",)
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Args:
@@ -208,17 +509,52 @@ class QueryAgent(BaseAgent):
                 - db_path: 데이터베이스 경로
                 - default_page_size: 기본 페이지 크기
                 - max_page_size: 최대 페이지 크기
+                - max_workers: SQLite 작업 스레드 수 (기본: 4)
+                - use_apsw: 핫 경로(search/count)를 APSW 영속 statement로 실행
+                  (기본: False, apsw 미설치 시 무시)
+                - result_cache_ttl: 검색 결과 캐시 유지 시간(초) (기본: 0, 비활성)
+                  (활성화 시 캐시 대상 액션의 result.data는 읽기 전용으로 취급)
+                - result_cache_size: 검색 결과 캐시 최대 항목 수 (기본: 1024)
+                - stream_batch_size: stream_rows의 fetchmany 크기 (기본: 256)
         """
         super().__init__("BLOCK_QUERY", config)
 
         self._db_path = self.config.get("db_path", "")
         self._default_page_size = self.config.get("default_page_size", 20)
         self._max_page_size = self.config.get("max_page_size", 100)
+        self._stream_batch_size = self.config.get("stream_batch_size", 256)
+
+        # 스레드별 영속 연결 (같은 SQL 텍스트의 prepared statement 재사용)
+        self._local = threading.local()
+        self._connections: List[Any] = []  # sqlite3 / apsw 연결
+        self._connections_lock = threading.Lock()
+
+        use_apsw = self.config.get("use_apsw", False)
+        if use_apsw and not APSW_AVAILABLE:
+            self.logger.warning("apsw is not installed; using sqlite3 for all queries")
+        self._use_apsw = use_apsw and APSW_AVAILABLE
+
+        # 테이블별 컬럼 허용 목록 (PRAGMA table_info, 테이블당 1회 조회)
+        self._table_columns: Dict[str, frozenset] = {}
+
+        # 블로킹 SQLite 작업 전용 스레드 풀 (이벤트 루프 블로킹 방지)
+        self._max_workers = self.config.get("max_workers", 4)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+        # 읽기 결과 캐시 (PRAGMA data_version 변경 시 자동 무효화,
+        # 적중 결과는 공유 객체이므로 result.data를 수정하지 말 것)
+        cache_ttl = self.config.get("result_cache_ttl", 0)
+        self._result_cache: Optional[_ResultCache] = (
+            _ResultCache(self.config.get("result_cache_size", 1024), cache_ttl)
+            if cache_ttl > 0
+            else None
+        )
 
     def get_capabilities(self) -> List[str]:
         """에이전트 능력 목록"""
         return [
             "search",
+            "search_batch",
             "full_text_search",
             "faceted_search",
             "build_query",
@@ -228,17 +564,243 @@ class QueryAgent(BaseAgent):
 
     @contextmanager
     def _get_connection(self):
-        """데이터베이스 연결"""
+        """
+        데이터베이스 연결
+
+        호출 스레드마다 하나의 연결을 열어 두고 재사용합니다.
+        sqlite3 모듈의 statement 캐시는 연결 단위이므로, 연결을 유지해야
+        같은 형태의 쿼리(값은 ? 바인딩)가 SQL 재파싱 없이 실행됩니다.
+        """
         if not self._db_path:
             raise AgentExecutionError("db_path is not configured", self.block_id)
 
-        conn = sqlite3.connect(self._db_path, detect_types=sqlite3.PARSE_DECLTYPES)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+
+        yield conn
+
+    def _connect(self) -> sqlite3.Connection:
+        """PRAGMA가 적용된 새 sqlite3 연결 생성"""
+        conn = sqlite3.connect(
+            self._db_path,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            # close()/스트리밍은 생성 스레드 외의 스레드에서 호출될 수 있음
+            check_same_thread=False,
+        )
         conn.row_factory = sqlite3.Row
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _get_apsw_connection(self) -> "apsw.Connection":
+        """스레드별 APSW 연결 (sqlite3 연결과 같은 PRAGMA 적용)"""
+        conn = getattr(self._local, "apsw_conn", None)
+        if conn is None:
+            conn = apsw.Connection(self._db_path)
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(pragma).fetchall()
+            self._local.apsw_conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _fetch_rows(
+        self, conn: sqlite3.Connection, sql: str, params: List[Any]
+    ) -> Tuple[List[str], List[tuple]]:
+        """
+        쿼리 실행 후 (컬럼명 목록, 튜플 행 목록) 반환
+
+        행마다 sqlite3.Row를 만들지 않도록 커서의 row_factory를 끄고,
+        컬럼명은 cursor.description에서 한 번만 읽습니다.
 
+        use_apsw 설정 시 SQLITE_PREPARE_PERSISTENT로 준비해 statement가
+        lookaside 대신 힙에 장기 캐시되도록 합니다. APSW는 SQL 텍스트 단위로
+        statement를 캐시하며, SQL 텍스트는 쿼리 형태(shape)마다 하나입니다.
+        """
+        if not self._use_apsw:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(sql, params)
+            columns = [d[0] for d in cursor.description]
+            return columns, cursor.fetchall()
+
+        cursor = self._get_apsw_connection().cursor()
+        cursor.execute(sql, params, prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT)
         try:
-            yield conn
-        finally:
-            conn.close()
+            columns = [d[0] for d in cursor.getdescription()]
+        except apsw.ExecutionCompleteError:
+            # 결과 행 없음
+            return [], []
+        return columns, cursor.fetchall()
+
+    async def _run_blocking(self, func, *args):
+        """
+        블로킹 SQLite 작업을 전용 스레드 풀에서 실행
+
+        WAL 모드에서는 작업 스레드별 연결이 병렬로 읽기를 수행합니다.
+        풀은 첫 호출 시 생성되어 close()(async with 종료,
+        AgentRegistry.close_all() 포함)에서 해제되고, 이후 호출 시 다시 생성됩니다.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix=self.block_id,
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def close(self) -> None:
+        """스레드 풀과 열려 있는 모든 영속 연결 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _has_fts_index(self, conn: sqlite3.Connection, table: str) -> bool:
+        """{table}_fts FTS5 인덱스 존재 여부 (StorageAgent create_fts_index로 생성)"""
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (f"{table}_fts",),
+        ).fetchone()
+        return row is not None
+
+    def _fetch_page(
+        self,
+        conn: sqlite3.Connection,
+        builder: QueryBuilder,
+        built: BuiltQuery,
+    ) -> Tuple[List[str], List[tuple], Optional[int]]:
+        """
+        페이지 쿼리 실행 후 (columns, rows, total) 반환
+
+        with_total이면 같은 WHERE(where_clause/where_params)로 COUNT를 따로
+        실행합니다. COUNT(*) OVER ()는 LIMIT 전에 매칭 행을 모두 계산해야 하므로
+        쓰지 않습니다. 페이지가 덜 찼으면 COUNT 없이 offset + 행 수가 전체 수이고,
+        필터가 없으면 data_version 기준으로 캐시된 전체 행 수를 씁니다.
+        with_total이 아니면 total은 None.
+        """
+        columns, rows = self._fetch_rows(conn, built.sql, built.params)
+        if not builder.with_total:
+            return columns, rows, None
+
+        limit = builder.limit
+        if limit is not None and len(rows) < limit and (rows or builder.offset <= 0):
+            return columns, rows, builder.offset + len(rows)
+
+        count_sql = f"SELECT COUNT(*) as cnt FROM {_sanitize_identifier(builder.table)}"
+        if not built.where_clause:
+            return columns, rows, self._count_unfiltered(conn, builder.table, count_sql)
+
+        count_sql += f" WHERE {built.where_clause}"
+        _, count_rows = self._fetch_rows(conn, count_sql, built.where_params)
+        return columns, rows, count_rows[0][0]
+
+    def _page_builder(
+        self, input_data: Dict[str, Any], page: int, page_size: int, **kwargs: Any
+    ) -> QueryBuilder:
+        """
+        페이지 조회용 QueryBuilder 생성
+
+        include_total=False이면 COUNT 대신 page_size + 1행을 조회해
+        다음 페이지 존재 여부(has_more)만 판단합니다.
+        """
+        include_total = input_data.get("include_total", True)
+        return QueryBuilder(
+            limit=page_size if include_total else page_size + 1,
+            offset=(page - 1) * page_size,
+            with_total=include_total,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _trim_peek(
+        rows: List[tuple], total: Optional[int], page_size: int
+    ) -> Tuple[List[tuple], Optional[bool]]:
+        """include_total=False 조회의 초과 1행을 잘라내고 has_more 계산"""
+        if total is not None:
+            return rows, None
+        return rows[:page_size], len(rows) > page_size
+
+    def _build_where(
+        self, table: str, filters_data: List[Dict[str, Any]]
+    ) -> BuiltQuery:
+        """입력 필터 목록을 AND로 결합한 WHERE 조건/바인딩 값 생성"""
+        builder = QueryBuilder(
+            table=table,
+            filters=[
+                QueryFilter(
+                    field=f["field"],
+                    operator=f.get("operator", "eq"),
+                    value=f["value"],
+                )
+                for f in filters_data
+            ],
+        )
+        return builder.build()
+
+    def _get_layout(self, input_data: Dict[str, Any]) -> str:
+        """결과 레이아웃 검증 (aos: 행별 딕셔너리, soa: columns + rows)"""
+        layout = input_data.get("layout", "aos")
+        if layout not in self.ITEM_LAYOUTS:
+            raise AgentExecutionError(
+                f"Unknown layout: {layout}. Allowed: {self.ITEM_LAYOUTS}",
+                self.block_id,
+            )
+        return layout
+
+    def _check_columns(
+        self, conn: sqlite3.Connection, table: str, names: List[str]
+    ) -> None:
+        """
+        컬럼명 허용 목록 검증
+
+        테이블 컬럼 목록은 처음 사용할 때 PRAGMA table_info로 한 번 읽어
+        캐시하며, 목록에 없는 컬럼은 SQL 실행 전에 거부합니다.
+        """
+        allowed = self._table_columns.get(table)
+        if allowed is None:
+            rows = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            allowed = frozenset(row[1] for row in rows)
+            self._table_columns[table] = allowed
+
+        unknown = [name for name in names if name not in allowed]
+        if unknown:
+            raise AgentExecutionError(
+                f"Unknown column(s) for {table}: {unknown}", self.block_id
+            )
+
+    def _count_unfiltered(
+        self, conn: sqlite3.Connection, table: str, sql: str
+    ) -> int:
+        """
+        필터 없는 전체 행 수 (데이터 변경 전까지 캐시)
+
+        PRAGMA data_version은 다른 연결이 커밋할 때만 바뀌므로, 값이 같으면
+        마지막 COUNT 이후 테이블이 변경되지 않은 것입니다. 캐시는 연결
+        (스레드)별로 유지합니다. QueryAgent는 쓰기를 하지 않으므로 자기 연결의
+        변경은 고려하지 않습니다.
+        """
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        row_counts = getattr(self._local, "row_counts", None)
+        if row_counts is None:
+            row_counts = self._local.row_counts = {}
+
+        cached = row_counts.get(table)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        _, rows = self._fetch_rows(conn, sql, [])
+        row_counts[table] = (version, rows[0][0])
+        return rows[0][0]
 
     def _validate_table(self, table: str) -> bool:
         """테이블 검증"""
@@ -267,8 +829,23 @@ class QueryAgent(BaseAgent):
 
             action = input_data.get("action", "search")
 
+            cache_key = None
+            if self._result_cache is not None and action in self.CACHEABLE_ACTIONS:
+                cache_key = self._result_cache.make_key(
+                    input_data, self._data_version()
+                )
+                cached = self._result_cache.get(cache_key)
+                if cached is not None:
+                    result = AgentResult.success_result(
+                        data=cached, metrics={"cache_hit": True}
+                    )
+                    await self.post_execute(result)
+                    return result
+
             if action == "search":
                 result = await self._search(input_data)
+            elif action == "search_batch":
+                result = await self._search_batch(input_data)
             elif action == "full_text_search":
                 result = await self._full_text_search(input_data)
             elif action == "faceted_search":
@@ -284,14 +861,101 @@ class QueryAgent(BaseAgent):
                     f"Unknown action: {action}", self.block_id
                 )
 
+            if cache_key is not None and result.success:
+                self._result_cache.put(cache_key, result.data)
+
             await self.post_execute(result)
             return result
 
         except Exception as e:
             return await self.handle_error(e, context)
 
-    async def _search(self, input_data: Dict[str, Any]) -> AgentResult:
-        """기본 검색"""
+    def _data_version(self) -> int:
+        """
+        현재 스레드 연결의 PRAGMA data_version
+
+        다른 연결의 커밋마다 값이 바뀌므로 결과 캐시 키에 포함합니다.
+        값은 연결 단위로만 비교 가능하므로 항상 호출(이벤트 루프) 스레드의
+        연결에서 읽습니다.
+        """
+        with self._get_connection() as conn:
+            return conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def invalidate_cache(self) -> None:
+        """결과/스키마 캐시 무효화 (스키마 변경 등 data_version 밖의 변경 시)"""
+        if self._result_cache is not None:
+            self._result_cache.invalidate()
+        self._table_columns.clear()
+
+    async def stream_rows(
+        self, input_data: Dict[str, Any]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        검색 결과 스트리밍 (페이지 없이 전체 결과를 행 단위로 전달)
+
+        전체 결과를 fetchall()로 메모리에 올리지 않고 stream_batch_size
+        단위로 fetchmany하여 행 딕셔너리를 하나씩 yield합니다.
+        커서는 전용 연결에서 열리며 순회가 끝나거나 중단되면 닫힙니다.
+
+        Args:
+            input_data: search와 동일 (table, columns, filters, order_by).
+                page/page_size는 무시됩니다.
+
+        사용법:
+            async for row in agent.stream_rows({"table": "video_files"}):
+                ...
+        """
+        table = input_data.get("table", "video_files")
+        columns = input_data.get("columns", ["*"])
+        self._validate_table(table)
+
+        filters = [
+            QueryFilter(
+                field=f["field"],
+                operator=f.get("operator", "eq"),
+                value=f["value"],
+                logic=f.get("logic", "AND"),
+            )
+            for f in input_data.get("filters", [])
+        ]
+        order = [
+            (o["field"], SortOrder(o.get("order", "ASC").upper()))
+            for o in input_data.get("order_by", [])
+        ]
+        built = QueryBuilder(
+            table=table, columns=columns, filters=filters, order_by=order
+        ).build()
+        self._track_tokens(self._estimate_tokens(built.sql))
+
+        referenced = [] if columns == ["*"] else list(columns)
+        referenced += [f.field for f in filters]
+        referenced += [col for col, _ in order]
+
+        if not self._db_path:
+            raise AgentExecutionError("db_path is not configured", self.block_id)
+        conn = await self._run_blocking(self._connect)
+
+        def open_cursor() -> sqlite3.Cursor:
+            self._check_columns(conn, table, referenced)
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.arraysize = self._stream_batch_size
+            return cursor.execute(built.sql, built.params)
+
+        try:
+            cursor = await self._run_blocking(open_cursor)
+            names = [d[0] for d in cursor.description]
+            while True:
+                rows = await self._run_blocking(cursor.fetchmany)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(names, row))
+        finally:
+            conn.close()
+
+    def _plan_search(self, input_data: Dict[str, Any]) -> "_SearchPlan":
+        """search 입력을 검증하고 실행 계획(빌드된 쿼리 등) 생성"""
         table = input_data.get("table", "video_files")
         filters_data = input_data.get("filters", [])
         columns = input_data.get("columns", ["*"])
@@ -303,6 +967,7 @@ class QueryAgent(BaseAgent):
         )
 
         self._validate_table(table)
+        layout = self._get_layout(input_data)
 
         # 필터 변환
         filters = [
@@ -322,96 +987,195 @@ class QueryAgent(BaseAgent):
         ] if order_by else []
 
         # 쿼리 빌드
-        builder = QueryBuilder(
+        builder = self._page_builder(
+            input_data,
+            page,
+            page_size,
             table=table,
             columns=columns,
             filters=filters,
             order_by=order,
-            limit=page_size,
-            offset=(page - 1) * page_size,
         )
 
-        sql, params = builder.build()
-        self._track_tokens(self._estimate_tokens(sql))
+        # 조회/필터/정렬 컬럼 (허용 목록 검증 대상)
+        referenced = [] if columns == ["*"] else list(columns)
+        referenced += [f.field for f in filters]
+        referenced += [col for col, _ in order]
 
-        # 실행
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, params)
-            items = [dict(row) for row in cursor.fetchall()]
-
-            # 총 개수
-            count_sql = f"SELECT COUNT(*) as cnt FROM {table}"
-            if filters:
-                where_parts = []
-                count_params = []
-                for f in filters:
-                    cond, vals = f.to_sql()
-                    where_parts.append(cond)
-                    count_params.extend(vals)
-                count_sql += f" WHERE {' AND '.join(where_parts)}"
-            else:
-                count_params = []
+        return _SearchPlan(
+            builder=builder,
+            built=builder.build(),
+            referenced=referenced,
+            layout=layout,
+            page=page,
+            page_size=page_size,
+        )
 
-            count_cursor = conn.execute(count_sql, count_params)
-            total = count_cursor.fetchone()["cnt"]
+    def _run_search_plan(
+        self, conn: sqlite3.Connection, plan: "_SearchPlan"
+    ) -> SearchResult:
+        """검색 계획 실행 (작업 스레드에서 호출)"""
+        self._check_columns(conn, plan.builder.table, plan.referenced)
+        columns, rows, total = self._fetch_page(conn, plan.builder, plan.built)
+        rows, has_more = self._trim_peek(rows, total, plan.page_size)
 
-        result = SearchResult(
-            items=items,
+        return SearchResult(
+            items=_pack_items(columns, rows, plan.layout),
             total=total,
-            page=page,
-            page_size=page_size,
+            page=plan.page,
+            page_size=plan.page_size,
+            has_more=has_more,
         )
 
+    async def _search(self, input_data: Dict[str, Any]) -> AgentResult:
+        """기본 검색"""
+        plan = self._plan_search(input_data)
+        self._track_tokens(self._estimate_tokens(plan.built.sql))
+
+        # 실행
+        def run_query():
+            with self._get_connection() as conn:
+                return self._run_search_plan(conn, plan)
+
+        result = await self._run_blocking(run_query)
+
         return AgentResult.success_result(
             data=result.to_dict(),
-            metrics={"items_returned": len(items), "total": total},
+            metrics={
+                "items_returned": result.returned_count,
+                "total": result.total,
+            },
+        )
+
+    async def _search_batch(self, input_data: Dict[str, Any]) -> AgentResult:
+        """
+        배치 검색
+
+        여러 search 입력을 한 번의 스레드 풀 작업, 하나의 연결에서 실행합니다.
+        같은 형태(SQL 텍스트)의 쿼리끼리 묶어 연속 실행하므로 prepared
+        statement 하나가 그룹 전체에 재사용됩니다.
+        """
+        queries = input_data.get("queries", [])
+
+        if not queries:
+            return AgentResult.failure_result(
+                error="queries is required for search_batch",
+                error_type="ValidationError",
+            )
+
+        plans = [self._plan_search(query) for query in queries]
+
+        # 형태(SQL 텍스트)별 그룹
+        groups: Dict[str, List[int]] = {}
+        for index, plan in enumerate(plans):
+            groups.setdefault(plan.built.sql, []).append(index)
+        self._track_tokens(sum(self._estimate_tokens(sql) for sql in groups))
+
+        def run_query():
+            results: List[Optional[SearchResult]] = [None] * len(plans)
+            with self._get_connection() as conn:
+                for indexes in groups.values():
+                    for index in indexes:
+                        results[index] = self._run_search_plan(conn, plans[index])
+            return results
+
+        results = await self._run_blocking(run_query)
+
+        return AgentResult.success_result(
+            data={"results": [result.to_dict() for result in results]},
+            metrics={"queries": len(plans), "shapes": len(groups)},
         )
 
     async def _full_text_search(self, input_data: Dict[str, Any]) -> AgentResult:
-        """전문 검색"""
+        """
+        전문 검색
+
+        {table}_fts 인덱스(StorageAgent create_fts_index)가 있으면 FTS5 MATCH로
+        검색합니다. 이때 매칭은 토큰 접두어 단위입니다: 쿼리의 각 단어가
+        컬럼 토큰의 앞부분과 일치해야 하며(모든 단어 AND), 단어 중간 부분
+        문자열은 매칭되지 않습니다 (예: "poker"는 "GGPoker"에 매칭되지 않음).
+        인덱스가 없으면 기존처럼 LIKE '%query%' 부분 문자열 검색을 합니다.
+        """
         table = input_data.get("table", "video_files")
         query = input_data.get("query", "")
+        filters_data = input_data.get("filters", [])
         page = input_data.get("page", 1)
         page_size = min(
             input_data.get("page_size", self._default_page_size),
             self._max_page_size,
         )
 
-        if not query:
+        if not query.strip():
+            # 공백뿐인 쿼리는 빈 MATCH 식(FTS5 구문 오류)이 되므로 거부
             return AgentResult.failure_result(
-                errors=["query is required for full text search"],
+                error="query is required for full text search",
                 error_type="ValidationError",
             )
 
         self._validate_table(table)
+        layout = self._get_layout(input_data)
+
+        # 추가 필터 (예: project = ?)
+        filter_where = self._build_where(table, filters_data)
+        filter_clause = filter_where.where_clause
+        filter_params = filter_where.where_params
+
+        def run_query():
+            with self._get_connection() as conn:
+                has_fts = self._has_fts_index(conn, table)
+
+                if has_fts and filter_clause:
+                    # FTS 매칭을 CTE로 먼저 구체화한 뒤 조인/필터
+                    # (평면 WHERE에 섞으면 플래너가 FTS 인덱스를 쓰지 않을 수 있음)
+                    fts = f"{table}_fts"
+                    cte = (
+                        f"WITH fts_matches AS {self._CTE_MATERIALIZED}("
+                        f"SELECT rowid FROM {fts} WHERE {fts} MATCH ?)"
+                    )
+                    body = (
+                        f"FROM {table} JOIN fts_matches ON {table}.rowid = fts_matches.rowid "
+                        f"WHERE {filter_clause}"
+                    )
+                    where_params = [_fts_match_expression(query)] + filter_params
+                    sql = f"{cte} SELECT {table}.* {body}"
+                    count_sql = f"{cte} SELECT COUNT(*) as cnt {body}"
+                else:
+                    if has_fts:
+                        # FTS5 인덱스 검색 (매칭 행만 탐색)
+                        fts = f"{table}_fts"
+                        where_clause = (
+                            f"rowid IN (SELECT rowid FROM {fts} WHERE {fts} MATCH ?)"
+                        )
+                        where_params = [_fts_match_expression(query)]
+                    else:
+                        # LIKE 기반 검색 (FTS 인덱스 미생성 시)
+                        fts_columns = self.FTS_COLUMNS.get(table, ["filename"])
+                        where_clause = " OR ".join(f"{col} LIKE ?" for col in fts_columns)
+                        where_params = [f"%{query}%"] * len(fts_columns)
+
+                    if filter_clause:
+                        where_clause = f"({where_clause}) AND {filter_clause}"
+                        where_params += filter_params
+
+                    sql = f"SELECT * FROM {table} WHERE {where_clause}"
+                    count_sql = f"SELECT COUNT(*) as cnt FROM {table} WHERE {where_clause}"
+
+                sql += " LIMIT ? OFFSET ?"
+
+                columns, rows = self._fetch_rows(
+                    conn, sql, where_params + [page_size, (page - 1) * page_size]
+                )
 
-        # FTS 컬럼 확인
-        fts_columns = self.FTS_COLUMNS.get(table, ["filename"])
-
-        # LIKE 기반 검색 (SQLite FTS 미설정 시)
-        conditions = []
-        params = []
-        for col in fts_columns:
-            conditions.append(f"{col} LIKE ?")
-            params.append(f"%{query}%")
-
-        where_clause = " OR ".join(conditions)
-        sql = f"SELECT * FROM {table} WHERE {where_clause} LIMIT ? OFFSET ?"
-        params.extend([page_size, (page - 1) * page_size])
+                # 총 개수 (같은 WHERE 재사용)
+                count_cursor = conn.execute(count_sql, where_params)
+                total = count_cursor.fetchone()["cnt"]
+                return sql, columns, rows, total
 
+        sql, columns, rows, total = await self._run_blocking(run_query)
         self._track_tokens(self._estimate_tokens(sql))
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, params)
-            items = [dict(row) for row in cursor.fetchall()]
-
-            # 총 개수
-            count_sql = f"SELECT COUNT(*) as cnt FROM {table} WHERE {where_clause}"
-            count_cursor = conn.execute(count_sql, params[:-2])
-            total = count_cursor.fetchone()["cnt"]
-
         result = SearchResult(
-            items=items,
+            items=_pack_items(columns, rows, layout),
             total=total,
             page=page,
             page_size=page_size,
@@ -419,7 +1183,7 @@ class QueryAgent(BaseAgent):
 
         return AgentResult.success_result(
             data=result.to_dict(),
-            metrics={"items_returned": len(items), "total": total, "query": query},
+            metrics={"items_returned": len(rows), "total": total, "query": query},
         )
 
     async def _faceted_search(self, input_data: Dict[str, Any]) -> AgentResult:
@@ -434,6 +1198,7 @@ class QueryAgent(BaseAgent):
         )
 
         self._validate_table(table)
+        layout = self._get_layout(input_data)
 
         # 필터 변환
         filters = [
@@ -446,66 +1211,57 @@ class QueryAgent(BaseAgent):
         ]
 
         # 기본 검색
-        builder = QueryBuilder(
-            table=table,
-            filters=filters,
-            limit=page_size,
-            offset=(page - 1) * page_size,
+        builder = self._page_builder(
+            input_data, page, page_size, table=table, filters=filters
         )
 
-        sql, params = builder.build()
-        self._track_tokens(self._estimate_tokens(sql))
+        built = builder.build()
+        self._track_tokens(self._estimate_tokens(built.sql))
 
-        facets = {}
+        def run_query():
+            facets = {}
 
-        with self._get_connection() as conn:
-            # 메인 결과
-            cursor = conn.execute(sql, params)
-            items = [dict(row) for row in cursor.fetchall()]
-
-            # 총 개수
-            count_sql = f"SELECT COUNT(*) as cnt FROM {table}"
-            if filters:
-                where_parts = []
-                count_params = []
-                for f in filters:
-                    cond, vals = f.to_sql()
-                    where_parts.append(cond)
-                    count_params.extend(vals)
-                count_sql += f" WHERE {' AND '.join(where_parts)}"
-            else:
-                count_params = []
+            with self._get_connection() as conn:
+                self._check_columns(
+                    conn, table, [f.field for f in filters] + list(facet_fields)
+                )
 
-            count_cursor = conn.execute(count_sql, count_params)
-            total = count_cursor.fetchone()["cnt"]
+                # 메인 결과 + 총 개수
+                columns, rows, total = self._fetch_page(conn, builder, built)
 
-            # 패싯 집계
-            for facet_field in facet_fields:
-                facet_safe = "".join(
-                    c if c.isalnum() or c == "_" else "" for c in facet_field
-                )
-                facet_sql = (
-                    f"SELECT {facet_safe} as value, COUNT(*) as count "
-                    f"FROM {table} GROUP BY {facet_safe} ORDER BY count DESC LIMIT 20"
-                )
-                facet_cursor = conn.execute(facet_sql)
-                facets[facet_field] = [
-                    {"value": row["value"], "count": row["count"]}
-                    for row in facet_cursor.fetchall()
-                    if row["value"] is not None
-                ]
+                # 패싯 집계 (단일 쿼리)
+                if facet_fields:
+                    facet_sql = _render_facet_query(
+                        table, tuple(facet_fields), self.FACET_LIMIT
+                    )
+                    buckets: List[List[Tuple[int, Any]]] = [[] for _ in facet_fields]
+                    for facet_index, value, count in conn.execute(facet_sql).fetchall():
+                        if value is not None:
+                            buckets[facet_index].append((count, value))
+
+                    for facet_field, bucket in zip(facet_fields, buckets):
+                        bucket.sort(key=lambda item: item[0], reverse=True)
+                        facets[facet_field] = [
+                            {"value": value, "count": count} for count, value in bucket
+                        ]
+
+            return columns, rows, total, facets
+
+        columns, rows, total, facets = await self._run_blocking(run_query)
+        rows, has_more = self._trim_peek(rows, total, page_size)
 
         result = SearchResult(
-            items=items,
+            items=_pack_items(columns, rows, layout),
             total=total,
             page=page,
             page_size=page_size,
             facets=facets,
+            has_more=has_more,
         )
 
         return AgentResult.success_result(
             data=result.to_dict(),
-            metrics={"items_returned": len(items), "facet_count": len(facets)},
+            metrics={"items_returned": len(rows), "facet_count": len(facets)},
         )
 
     async def _build_query(self, input_data: Dict[str, Any]) -> AgentResult:
@@ -546,10 +1302,10 @@ class QueryAgent(BaseAgent):
             limit=limit,
         )
 
-        sql, params = builder.build()
+        built = builder.build()
 
         return AgentResult.success_result(
-            data={"sql": sql, "params": params},
+            data={"sql": built.sql, "params": built.params},
         )
 
     async def _aggregate(self, input_data: Dict[str, Any]) -> AgentResult:
@@ -574,19 +1330,14 @@ class QueryAgent(BaseAgent):
             field = agg.get("field", "*")
             alias = agg.get("alias", f"{func.lower()}_{field}")
 
-            field_safe = "*" if field == "*" else "".join(
-                c if c.isalnum() or c == "_" else "" for c in field
-            )
-            alias_safe = "".join(c if c.isalnum() or c == "_" else "" for c in alias)
+            field_safe = "*" if field == "*" else _sanitize_identifier(field)
+            alias_safe = _sanitize_identifier(alias)
 
             agg_parts.append(f"{func}({field_safe}) as {alias_safe}")
 
         # GROUP BY
         if group_by:
-            group_safe = [
-                "".join(c if c.isalnum() or c == "_" else "" for c in col)
-                for col in group_by
-            ]
+            group_safe = [_sanitize_identifier(col) for col in group_by]
             select_cols = group_safe + agg_parts
             sql = f"SELECT {', '.join(select_cols)} FROM {table}"
         else:
@@ -595,20 +1346,9 @@ class QueryAgent(BaseAgent):
         # WHERE
         params = []
         if filters_data:
-            filters = [
-                QueryFilter(
-                    field=f["field"],
-                    operator=f.get("operator", "eq"),
-                    value=f["value"],
-                )
-                for f in filters_data
-            ]
-            where_parts = []
-            for f in filters:
-                cond, vals = f.to_sql()
-                where_parts.append(cond)
-                params.extend(vals)
-            sql += f" WHERE {' AND '.join(where_parts)}"
+            built = self._build_where(table, filters_data)
+            sql += f" WHERE {built.where_clause}"
+            params = built.where_params
 
         # GROUP BY
         if group_by:
@@ -616,9 +1356,12 @@ class QueryAgent(BaseAgent):
 
         self._track_tokens(self._estimate_tokens(sql))
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, params)
-            rows = [dict(row) for row in cursor.fetchall()]
+        def run_query():
+            with self._get_connection() as conn:
+                columns, rows = self._fetch_rows(conn, sql, params)
+                return [dict(zip(columns, row)) for row in rows]
+
+        rows = await self._run_blocking(run_query)
 
         return AgentResult.success_result(
             data={"results": rows, "sql": sql},
@@ -638,30 +1381,27 @@ class QueryAgent(BaseAgent):
 
         self._validate_table(table)
 
+        # COUNT(*) 유지: SQLite는 COUNT(*)에 가장 작은 커버링 인덱스를 고르고
+        # 필터가 없으면 행을 읽지 않는 OP_Count 경로를 씁니다.
+        # COUNT(pk)는 행마다 NULL 검사를 하므로 오히려 느립니다.
         sql = f"SELECT COUNT(*) as count FROM {table}"
         params = []
 
         if filters_data:
-            filters = [
-                QueryFilter(
-                    field=f["field"],
-                    operator=f.get("operator", "eq"),
-                    value=f["value"],
-                )
-                for f in filters_data
-            ]
-            where_parts = []
-            for f in filters:
-                cond, vals = f.to_sql()
-                where_parts.append(cond)
-                params.extend(vals)
-            sql += f" WHERE {' AND '.join(where_parts)}"
+            built = self._build_where(table, filters_data)
+            sql += f" WHERE {built.where_clause}"
+            params = built.where_params
 
         self._track_tokens(self._estimate_tokens(sql))
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, params)
-            count = cursor.fetchone()["count"]
+        def run_query():
+            with self._get_connection() as conn:
+                if not filters_data:
+                    return self._count_unfiltered(conn, table, sql)
+                _, rows = self._fetch_rows(conn, sql, params)
+                return rows[0][0]
+
+        count = await self._run_blocking(run_query)
 
         return AgentResult.success_result(
             data={"count": count},
@@ -0,0 +1,15 @@
+"""
+SQLite 연결 공통 PRAGMA
+
+StorageAgent, QueryAgent, ValidationAgent가 연결마다 적용하는 튜닝 값을
+한 곳에서 관리합니다. journal_mode는 DB 파일에 영속되는 설정이므로
+여기에 두지 않고 쓰기 담당인 StorageAgent만 설정합니다.
+"""
+
+# 연결 단위 PRAGMA (연결을 열 때마다 적용)
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
@@ -10,24 +10,105 @@ SQLite 데이터베이스에 대한 CRUD 작업을 담당합니다.
 - 스키마 검증
 """
 
+import asyncio
+import queue
+import re
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple, Union
+import threading
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 from dataclasses import dataclass, field
 from pathlib import Path
 from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import deque
+from functools import lru_cache
+from itertools import chain
+from operator import itemgetter
 import json
 
 from ...core.base_agent import BaseAgent
 from ...core.agent_context import AgentContext
 from ...core.agent_result import AgentResult
 from ...core.exceptions import AgentExecutionError
+from ..fts import FTS_COLUMNS
+from ..sqlite_pragmas import CONNECTION_PRAGMAS
+
+# orjson (C 구현 JSON 직렬화, 선택 의존성)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# APSW (얇은 SQLite C API 바인딩, 선택 의존성)
+try:
+    import apsw
+
+    APSW_AVAILABLE = True
+except ImportError:
+    APSW_AVAILABLE = False
+
+
+# 식별자에 허용되지 않는 문자 (str.isalnum() 또는 "_"가 아닌 문자와 동일)
+_NON_IDENTIFIER_CHARS = re.compile(r"\W")
+
+
+@lru_cache(maxsize=512)
+def _sanitize_identifier(name: str) -> str:
+    """SQL 식별자 sanitize (영숫자, 언더스코어만 허용)"""
+    return _NON_IDENTIFIER_CHARS.sub("", name)
+
+
+def _json_dumps(value: Any) -> str:
+    """중첩 값(dict/list)을 JSON 텍스트로 직렬화"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _json_loads(text: Any) -> Any:
+    """JSON 텍스트 역직렬화 (NULL 등 문자열이 아닌 값은 그대로)"""
+    if not isinstance(text, (str, bytes)):
+        return text
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _encode_values(values: List[Any]) -> List[Any]:
+    """바인딩 값 중 dict/list를 JSON 텍스트로 변환"""
+    return [_json_dumps(v) if isinstance(v, (dict, list)) else v for v in values]
+
+
+def _pack_rows(
+    columns: List[str], rows: List[tuple], layout: str
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    튜플 행을 응답 rows 형식으로 변환
+
+    soa 레이아웃은 컬럼명을 한 번만 담아 행마다 딕셔너리를 만들지 않습니다.
+    """
+    if layout == "soa":
+        return {"columns": columns, "rows": rows}
+    return [dict(zip(columns, row)) for row in rows]
 
 
 @dataclass
 class QueryResult:
     """쿼리 결과"""
 
-    rows: List[Dict[str, Any]] = field(default_factory=list)
+    rows: Union[List[Dict[str, Any]], Dict[str, Any]] = field(default_factory=list)
     affected_rows: int = 0
     last_insert_id: Optional[int] = None
 
@@ -60,6 +141,8 @@ class StorageAgent(BaseAgent):
         - query_records: 레코드 조회
         - bulk_upsert: 대량 upsert
         - execute_sql: 직접 SQL 실행 (읽기 전용)
+        - create_fts_index: FTS5 전문 검색 인덱스 생성
+        - create_indexes: 보조 인덱스(INDEXES) 생성
     """
 
     # 보호된 테이블 (스키마 변경 금지)
@@ -75,6 +158,40 @@ class StorageAgent(BaseAgent):
         "validation_logs",
     }
 
+    # FTS5 전문 검색 인덱스 컬럼 (QueryAgent와 공유)
+    FTS_COLUMNS = FTS_COLUMNS
+
+    # 보조 인덱스: 테이블 → [(인덱스명, 컬럼 목록)] (create_indexes 액션으로 생성)
+    INDEXES = {
+        # ValidationAgent 중복 파일명 체크 (GROUP BY filename)
+        "video_files": [("idx_vf_filename", ["filename"])],
+    }
+
+    # 연결마다 적용하는 PRAGMA (Query/ValidationAgent와 공유,
+    # 잠금 대기는 sqlite3.connect의 timeout 설정을 사용)
+    CONNECTION_PRAGMAS = CONNECTION_PRAGMAS
+
+    # 연결별 prepared statement 캐시 크기 / SQL 문자열 메모이즈 상한
+    STATEMENT_CACHE_SIZE = 256
+    SQL_CACHE_SIZE = 1024
+
+    # 삽입 id를 같은 문장에서 반환 (SQLite 3.35+, 미지원 시 lastrowid 사용)
+    _RETURNING = " RETURNING rowid" if sqlite3.sqlite_version_info >= (3, 35, 0) else ""
+
+    # 한 트랜잭션으로 묶어 커밋할 최대 단일 쓰기 수
+    MAX_WRITE_BATCH = 500
+
+    # 조회 결과 rows 레이아웃
+    # aos: [{컬럼: 값}, ...], soa: {"columns": [...], "rows": [[...], ...]}
+    ROW_LAYOUTS = ("aos", "soa")
+
+    # bulk_upsert 다중 행 INSERT의 문장당 행 수 / SQLite 바인딩 변수 상한 (3.32+)
+    MULTI_ROW_SIZE = 128
+    MAX_VARIABLE_NUMBER = 32766
+
+    # vfs_extension 경로 → 확장을 로드한 연결 (닫으면 VFS가 해제되므로 유지)
+    _vfs_loaders: Dict[str, sqlite3.Connection] = {}
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Args:
@@ -82,13 +199,53 @@ class StorageAgent(BaseAgent):
                 - db_path: 데이터베이스 파일 경로
                 - readonly: 읽기 전용 모드 (기본: False)
                 - timeout: 연결 타임아웃 (기본: 30)
+                - max_readers: 읽기 작업 스레드 수 (기본: 4)
+                - parse_decltypes: 선언 타입 기반 변환기 적용 (기본: False)
+                - use_apsw: 읽기 경로를 APSW 연결로 실행
+                  (기본: False, apsw 미설치 시 무시, parse_decltypes 미적용)
+                - vfs: 사용할 SQLite VFS 이름 (예: io_uring 기반 VFS, 기본: 플랫폼 기본값)
+                - vfs_extension: vfs를 등록하는 SQLite 확장 라이브러리 경로
         """
         super().__init__("BLOCK_STORAGE", config)
 
         self._db_path = self.config.get("db_path", "")
         self._readonly = self.config.get("readonly", False)
         self._timeout = self.config.get("timeout", 30)
+        self._max_readers = self.config.get("max_readers", 4)
+        # 선언 타입(TIMESTAMP 등) 변환은 행마다 비용이 들어 필요할 때만 활성화
+        self._detect_types = (
+            sqlite3.PARSE_DECLTYPES if self.config.get("parse_decltypes", False) else 0
+        )
+        use_apsw = self.config.get("use_apsw", False)
+        if use_apsw and not APSW_AVAILABLE:
+            self.logger.warning("apsw is not installed; using sqlite3 for reads")
+        self._use_apsw = use_apsw and APSW_AVAILABLE
+        self._vfs = self._resolve_vfs()
         self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._ro_pool: "queue.SimpleQueue[sqlite3.Connection]" = queue.SimpleQueue()
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._readers: Optional[ThreadPoolExecutor] = None
+        # 쓰기 대기열 (sql, values, future) — writer 스레드가 묶어서 커밋
+        self._pending_writes: Deque[Tuple[str, List[Any], Future]] = deque()
+        self._pending_lock = threading.Lock()
+        self._drain_scheduled = False
+        self._sql_cache: Dict[Tuple[Any, ...], Tuple[str, int]] = {}
+        self._json_column_cache: Dict[str, FrozenSet[str]] = {}
+        self._validated_tables: set = set()
+
+        # 액션 → 핸들러 (if/elif 비교 대신 딕셔너리 조회 1회)
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            "save_record": self._save_record,
+            "update_record": self._update_record,
+            "delete_record": self._delete_record,
+            "query_records": self._query_records,
+            "bulk_upsert": self._bulk_upsert,
+            "execute_sql": self._execute_sql,
+            "get_schema": self._get_schema,
+            "create_fts_index": self._create_fts_index,
+            "create_indexes": self._create_indexes,
+        }
 
     def get_capabilities(self) -> List[str]:
         """에이전트 능력 목록"""
@@ -100,46 +257,337 @@ class StorageAgent(BaseAgent):
             "bulk_upsert",
             "execute_sql",
             "get_schema",
+            "create_fts_index",
+            "create_indexes",
         ]
 
     @contextmanager
     def _get_connection(self):
-        """데이터베이스 연결 컨텍스트 매니저"""
+        """
+        쓰기용 데이터베이스 연결 컨텍스트 매니저
+
+        에이전트 수명 동안 하나의 영속 연결을 재사용합니다.
+        연결은 autocommit(isolation_level=None)이며, 트랜잭션은 여기서만
+        BEGIN IMMEDIATE / COMMIT / ROLLBACK으로 명시적으로 제어합니다.
+        """
+        if not self._db_path:
+            raise AgentExecutionError("db_path is not configured", self.block_id)
+
+        with self._lock:
+            if self._connection is None:
+                self._connection = self._connect()
+            conn = self._connection
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("ROLLBACK" if self._readonly else "COMMIT")
+            except Exception:
+                # 일부 오류(SQLITE_FULL 등)는 SQLite가 이미 롤백했을 수 있음
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    @contextmanager
+    def _get_ro_connection(self):
+        """
+        읽기 전용 연결 컨텍스트 매니저
+
+        mode=ro URI로 연 연결을 풀에서 꺼내 쓰고 반납합니다.
+        페이지 캐시가 요청 간에 유지되며, 커밋하지 않습니다.
+        """
         if not self._db_path:
             raise AgentExecutionError("db_path is not configured", self.block_id)
 
+        try:
+            conn = self._ro_pool.get_nowait()
+        except queue.Empty:
+            conn = self._connect_ro()
+
+        try:
+            yield conn
+        finally:
+            self._ro_pool.put(conn)
+
+    def _connect_ro(self) -> Any:
+        """읽기 전용 연결 생성 (use_apsw 설정 시 APSW 연결)"""
+        if not Path(self._db_path).exists():
+            # mode=ro는 DB 파일을 만들지 않으므로, 아직 없으면 쓰기 연결로
+            # 빈 DB를 먼저 생성 (첫 조회가 빈 결과를 반환하던 기존 동작 유지)
+            with self._get_connection():
+                pass
+        if self._use_apsw:
+            conn = apsw.Connection(
+                self._db_path,
+                flags=apsw.SQLITE_OPEN_READONLY,
+                vfs=self._vfs,
+                statementcachesize=self.STATEMENT_CACHE_SIZE,
+            )
+            conn.setbusytimeout(int(self._timeout * 1000))
+        else:
+            conn = sqlite3.connect(
+                self._db_uri(mode="ro"),
+                uri=True,
+                timeout=self._timeout,
+                isolation_level=None,
+                detect_types=self._detect_types,
+                cached_statements=self.STATEMENT_CACHE_SIZE,
+                check_same_thread=False,
+            )
+        # 읽기 경로는 튜플 행을 받아 컬럼명과 직접 묶음 (sqlite3.Row 변환 생략)
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma).fetchall()
+        return conn
+
+    def _db_uri(self, **params: str) -> str:
+        """DB 파일 URI (vfs 설정 시 vfs 파라미터 포함)"""
+        if self._vfs:
+            params["vfs"] = self._vfs
+        query = "&".join(f"{k}={v}" for k, v in params.items())
+        return f"{Path(self._db_path).resolve().as_uri()}?{query}"
+
+    def _resolve_vfs(self) -> Optional[str]:
+        """
+        설정된 SQLite VFS 확인 (vfs_extension이 있으면 먼저 로드)
+
+        확장 로드 실패나 미등록 VFS는 경고 후 기본 VFS로 대체합니다.
+        """
+        vfs = self.config.get("vfs")
+        if not vfs:
+            return None
+
+        extension = self.config.get("vfs_extension")
+        try:
+            if extension and extension not in self._vfs_loaders:
+                # VFS가 확장 라이브러리에 있으므로 로드한 연결을 프로세스 동안 유지
+                loader = sqlite3.connect(":memory:", check_same_thread=False)
+                loader.enable_load_extension(True)
+                loader.load_extension(extension)
+                loader.enable_load_extension(False)
+                StorageAgent._vfs_loaders[extension] = loader
+            sqlite3.connect(f"file:vfs_probe?mode=memory&vfs={vfs}", uri=True).close()
+        except (AttributeError, sqlite3.Error) as e:
+            self.logger.warning(f"SQLite VFS '{vfs}' unavailable ({e}); using default VFS")
+            return None
+        return vfs
+
+    def _connect(self) -> sqlite3.Connection:
+        """PRAGMA가 적용된 새 sqlite3 연결 생성"""
         conn = sqlite3.connect(
-            self._db_path,
+            self._db_uri() if self._vfs else self._db_path,
+            uri=bool(self._vfs),
             timeout=self._timeout,
-            detect_types=sqlite3.PARSE_DECLTYPES,
+            # sqlite3 모듈의 암묵적 BEGIN을 끄고 _get_connection에서 직접 제어
+            isolation_level=None,
+            detect_types=self._detect_types,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            # 이벤트 루프/워커 스레드 어디에서든 사용 (직렬화는 _lock이 담당)
+            check_same_thread=False,
         )
-        conn.row_factory = sqlite3.Row
+        # journal_mode는 DB 파일에 영속되지만, 파일이 다시 생성됐을 수 있으므로
+        # 연결마다 설정 (이미 WAL이면 모드 확인만 하므로 비용이 작음)
+        if not self._readonly:
+            conn.execute("PRAGMA journal_mode=WAL")
+        for pragma in self.CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        # INSERT OR REPLACE의 암묵적 삭제에도 FTS 동기화 DELETE 트리거가 실행되도록
+        conn.execute("PRAGMA recursive_triggers=ON")
+        return conn
+
+    async def _run_write(self, func, *args):
+        """
+        쓰기 작업을 단일 writer 스레드에서 실행
+
+        SQLite는 쓰기를 직렬화하므로 스레드 1개로 순서를 보장하고
+        이벤트 루프는 블로킹하지 않습니다.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_writer(), func, *args)
+
+    def _get_writer(self) -> ThreadPoolExecutor:
+        """단일 writer 스레드 풀 (지연 생성)"""
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"{self.block_id}-writer"
+            )
+        return self._writer
 
+    async def _submit_write(self, sql: str, values: List[Any]) -> Tuple[int, Optional[int]]:
+        """
+        단일 문장 쓰기를 대기열에 넣고 (rowcount, lastrowid) 반환
+
+        writer 스레드가 쌓인 쓰기를 한 트랜잭션(커밋 1회)으로 묶어 처리합니다.
+        """
+        future: Future = Future()
+        with self._pending_lock:
+            self._pending_writes.append((sql, values, future))
+            schedule = not self._drain_scheduled
+            self._drain_scheduled = True
+        if schedule:
+            self._get_writer().submit(self._drain_writes)
+        return await asyncio.wrap_future(future)
+
+    def _drain_writes(self) -> None:
+        """
+        대기 중인 쓰기를 MAX_WRITE_BATCH 단위 트랜잭션으로 실행 (writer 스레드)
+
+        각 쓰기는 SAVEPOINT로 감싸 실패한 쓰기만 되돌리고,
+        결과는 커밋이 끝난 뒤에 전달합니다.
+        """
+        while True:
+            with self._pending_lock:
+                if not self._pending_writes:
+                    self._drain_scheduled = False
+                    return
+                count = min(len(self._pending_writes), self.MAX_WRITE_BATCH)
+                batch = [self._pending_writes.popleft() for _ in range(count)]
+
+            # 대기 중 취소된 요청은 실행하지 않음
+            batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            outcomes: List[Any] = []
+            try:
+                with self._get_connection() as conn:
+                    for sql, values, _ in batch:
+                        conn.execute("SAVEPOINT coalesced_write")
+                        try:
+                            cursor = conn.execute(sql, values)
+                            # RETURNING rowid가 있으면 같은 문장에서 id를 받음
+                            returned = cursor.fetchall()
+                        except Exception as e:
+                            conn.execute("ROLLBACK TO coalesced_write")
+                            outcomes.append(e)
+                        else:
+                            rowid = returned[0][0] if returned else cursor.lastrowid
+                            outcomes.append((cursor.rowcount, rowid))
+                        conn.execute("RELEASE coalesced_write")
+            except Exception as e:
+                outcomes = [e] * len(batch)
+
+            for (_, _, future), outcome in zip(batch, outcomes):
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+    async def _run_read(self, func, *args):
+        """읽기 작업을 reader 스레드 풀에서 실행 (WAL 모드에서 병렬 읽기)"""
+        if self._readers is None:
+            self._readers = ThreadPoolExecutor(
+                max_workers=self._max_readers,
+                thread_name_prefix=f"{self.block_id}-reader",
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._readers, func, *args)
+
+    def close(self) -> None:
+        """스레드 풀, 영속 연결과 읽기 전용 연결 풀 종료"""
+        for executor in (self._writer, self._readers):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        self._writer = self._readers = None
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+        while True:
+            try:
+                self._ro_pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+    def _get_layout(self, input_data: Dict[str, Any]) -> str:
+        """결과 레이아웃 검증 (aos: 행별 딕셔너리, soa: columns + rows)"""
+        layout = input_data.get("layout", "aos")
+        if layout not in self.ROW_LAYOUTS:
+            raise AgentExecutionError(
+                f"Unknown layout: {layout}. Allowed: {self.ROW_LAYOUTS}",
+                self.block_id,
+            )
+        return layout
+
+    def _fetch_rows(self, conn: Any, sql: str, params: Any) -> Tuple[List[str], List[tuple]]:
+        """SELECT 실행 후 (컬럼명 목록, 튜플 행 목록) 반환"""
+        if not self._use_apsw:
+            cursor = conn.execute(sql, params)
+            columns = [d[0] for d in cursor.description]
+            return columns, cursor.fetchall()
+
+        cursor = conn.cursor()
+        cursor.execute(sql, params, prepare_flags=apsw.SQLITE_PREPARE_PERSISTENT)
         try:
-            yield conn
-            if not self._readonly:
-                conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+            columns = [d[0] for d in cursor.getdescription()]
+        except apsw.ExecutionCompleteError:
+            # 결과 행 없음
+            return [], []
+        return columns, cursor.fetchall()
+
+    def _json_columns(self, conn: sqlite3.Connection, table: str) -> FrozenSet[str]:
+        """선언 타입이 JSON인 컬럼 집합 (테이블별 캐시)"""
+        columns = self._json_column_cache.get(table)
+        if columns is None:
+            cursor = conn.execute(
+                "SELECT name FROM pragma_table_info(?) WHERE upper(type) = 'JSON'",
+                (self._sanitize_identifier(table),),
+            )
+            columns = frozenset(row[0] for row in cursor.fetchall())
+            self._json_column_cache[table] = columns
+        return columns
+
+    @staticmethod
+    def _encode_row(row: tuple, indexes: List[int]) -> tuple:
+        """지정 위치의 dict/list 값을 JSON 텍스트로 직렬화"""
+        values = list(row)
+        for i in indexes:
+            if isinstance(values[i], (dict, list)):
+                values[i] = _json_dumps(values[i])
+        return tuple(values)
+
+    @staticmethod
+    def _decode_row(row: tuple, indexes: List[int]) -> tuple:
+        """지정 위치의 JSON 텍스트 값을 역직렬화"""
+        values = list(row)
+        for i in indexes:
+            values[i] = _json_loads(values[i])
+        return tuple(values)
 
     def _validate_table(self, table: str) -> bool:
-        """테이블 이름 검증"""
+        """테이블 이름 검증 (통과한 테이블은 기억해 반복 호출 시 생략)"""
+        if table in self._validated_tables:
+            return True
         if table in self.PROTECTED_TABLES:
             raise AgentExecutionError(
                 f"Cannot access protected table: {table}", self.block_id
             )
         if table not in self.ALLOWED_TABLES:
             self.logger.warning(f"Accessing non-standard table: {table}")
+        self._validated_tables.add(table)
         return True
 
     def _sanitize_identifier(self, name: str) -> str:
         """SQL 식별자 sanitize"""
-        # 알파벳, 숫자, 언더스코어만 허용
-        sanitized = "".join(c if c.isalnum() or c == "_" else "" for c in name)
-        return sanitized
+        # 알파벳, 숫자, 언더스코어만 허용 (테이블/컬럼명은 소수라 결과를 캐시)
+        return _sanitize_identifier(name)
+
+    def _cached_sql(
+        self, key: Tuple[Any, ...], build: Callable[[], str]
+    ) -> Tuple[str, int]:
+        """
+        (액션, 테이블, 컬럼 구성) 키별 (SQL 문자열, 추정 토큰 수) 메모이즈
+
+        같은 SQL 문자열이 재사용되면 sqlite3 연결의 문장 캐시가
+        컴파일된 prepared statement를 그대로 재사용합니다.
+        토큰 추정도 SQL 생성 시 한 번만 계산합니다.
+        """
+        entry = self._sql_cache.get(key)
+        if entry is None:
+            if len(self._sql_cache) >= self.SQL_CACHE_SIZE:
+                self._sql_cache.clear()
+            sql = build()
+            entry = self._sql_cache[key] = (sql, self._estimate_tokens(sql))
+        return entry
 
     async def execute(
         self, context: AgentContext, input_data: Dict[str, Any]
@@ -163,24 +611,12 @@ class StorageAgent(BaseAgent):
 
             action = input_data.get("action", "query_records")
 
-            if action == "save_record":
-                result = await self._save_record(input_data)
-            elif action == "update_record":
-                result = await self._update_record(input_data)
-            elif action == "delete_record":
-                result = await self._delete_record(input_data)
-            elif action == "query_records":
-                result = await self._query_records(input_data)
-            elif action == "bulk_upsert":
-                result = await self._bulk_upsert(input_data)
-            elif action == "execute_sql":
-                result = await self._execute_sql(input_data)
-            elif action == "get_schema":
-                result = await self._get_schema(input_data)
-            else:
+            handler = self._handlers.get(action)
+            if handler is None:
                 raise AgentExecutionError(
                     f"Unknown action: {action}", self.block_id
                 )
+            result = await handler(input_data)
 
             await self.post_execute(result)
             return result
@@ -200,22 +636,23 @@ class StorageAgent(BaseAgent):
             )
 
         self._validate_table(table)
-        table = self._sanitize_identifier(table)
 
-        columns = [self._sanitize_identifier(k) for k in data.keys()]
-        placeholders = ["?" for _ in columns]
-        values = list(data.values())
+        def build_sql() -> str:
+            name = self._sanitize_identifier(table)
+            columns = [self._sanitize_identifier(k) for k in data.keys()]
+            placeholders = ["?" for _ in columns]
+            return (
+                f"INSERT INTO {name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(placeholders)}){self._RETURNING}"
+            )
 
-        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(placeholders)})"
+        sql, tokens = self._cached_sql(("save_record", table, tuple(data)), build_sql)
+        values = _encode_values(list(data.values()))
 
-        self._track_tokens(self._estimate_tokens(sql))
+        self._track_tokens(tokens)
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, values)
-            result = QueryResult(
-                affected_rows=cursor.rowcount,
-                last_insert_id=cursor.lastrowid,
-            )
+        rowcount, lastrowid = await self._submit_write(sql, values)
+        result = QueryResult(affected_rows=rowcount, last_insert_id=lastrowid)
 
         self.logger.info(f"Saved record to {table}, id={result.last_insert_id}")
 
@@ -243,19 +680,22 @@ class StorageAgent(BaseAgent):
             )
 
         self._validate_table(table)
-        table = self._sanitize_identifier(table)
 
-        set_parts = [f"{self._sanitize_identifier(k)} = ?" for k in data.keys()]
-        where_parts = [f"{self._sanitize_identifier(k)} = ?" for k in where.keys()]
+        def build_sql() -> str:
+            name = self._sanitize_identifier(table)
+            set_parts = [f"{self._sanitize_identifier(k)} = ?" for k in data.keys()]
+            where_parts = [f"{self._sanitize_identifier(k)} = ?" for k in where.keys()]
+            return f"UPDATE {name} SET {', '.join(set_parts)} WHERE {' AND '.join(where_parts)}"
 
-        sql = f"UPDATE {table} SET {', '.join(set_parts)} WHERE {' AND '.join(where_parts)}"
-        values = list(data.values()) + list(where.values())
+        sql, tokens = self._cached_sql(
+            ("update_record", table, tuple(data), tuple(where)), build_sql
+        )
+        values = _encode_values(list(data.values())) + list(where.values())
 
-        self._track_tokens(self._estimate_tokens(sql))
+        self._track_tokens(tokens)
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, values)
-            result = QueryResult(affected_rows=cursor.rowcount)
+        rowcount, _ = await self._submit_write(sql, values)
+        result = QueryResult(affected_rows=rowcount)
 
         self.logger.info(f"Updated {result.affected_rows} records in {table}")
 
@@ -282,17 +722,19 @@ class StorageAgent(BaseAgent):
             )
 
         self._validate_table(table)
-        table = self._sanitize_identifier(table)
 
-        where_parts = [f"{self._sanitize_identifier(k)} = ?" for k in where.keys()]
-        sql = f"DELETE FROM {table} WHERE {' AND '.join(where_parts)}"
+        def build_sql() -> str:
+            name = self._sanitize_identifier(table)
+            where_parts = [f"{self._sanitize_identifier(k)} = ?" for k in where.keys()]
+            return f"DELETE FROM {name} WHERE {' AND '.join(where_parts)}"
+
+        sql, tokens = self._cached_sql(("delete_record", table, tuple(where)), build_sql)
         values = list(where.values())
 
-        self._track_tokens(self._estimate_tokens(sql))
+        self._track_tokens(tokens)
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, values)
-            result = QueryResult(affected_rows=cursor.rowcount)
+        rowcount, _ = await self._submit_write(sql, values)
+        result = QueryResult(affected_rows=rowcount)
 
         self.logger.info(f"Deleted {result.affected_rows} records from {table}")
 
@@ -317,32 +759,47 @@ class StorageAgent(BaseAgent):
             )
 
         self._validate_table(table)
-        table = self._sanitize_identifier(table)
-
-        if columns == ["*"]:
-            col_str = "*"
-        else:
-            col_str = ", ".join(self._sanitize_identifier(c) for c in columns)
 
-        sql = f"SELECT {col_str} FROM {table}"
-        values = []
+        def build_sql() -> str:
+            name = self._sanitize_identifier(table)
+            if columns == ["*"]:
+                col_str = "*"
+            else:
+                col_str = ", ".join(self._sanitize_identifier(c) for c in columns)
+
+            sql = f"SELECT {col_str} FROM {name}"
+            if where:
+                where_parts = [f"{self._sanitize_identifier(k)} = ?" for k in where.keys()]
+                sql += f" WHERE {' AND '.join(where_parts)}"
+            if order_by:
+                sql += f" ORDER BY {self._sanitize_identifier(order_by)}"
+            # LIMIT/OFFSET은 바인딩하여 페이지가 달라도 같은 SQL 문자열을 재사용
+            return sql + " LIMIT ? OFFSET ?"
+
+        sql, tokens = self._cached_sql(
+            ("query_records", table, tuple(columns), tuple(where), order_by),
+            build_sql,
+        )
+        values = list(where.values()) + [int(limit), int(offset)]
 
-        if where:
-            where_parts = [f"{self._sanitize_identifier(k)} = ?" for k in where.keys()]
-            sql += f" WHERE {' AND '.join(where_parts)}"
-            values = list(where.values())
+        self._track_tokens(tokens)
 
-        if order_by:
-            sql += f" ORDER BY {self._sanitize_identifier(order_by)}"
+        layout = self._get_layout(input_data)
 
-        sql += f" LIMIT {int(limit)} OFFSET {int(offset)}"
+        def run_query() -> Tuple[List[str], List[tuple]]:
+            with self._get_ro_connection() as conn:
+                columns, rows = self._fetch_rows(conn, sql, values)
+                json_columns = self._json_columns(conn, table)
+            # JSON으로 선언된 컬럼은 역직렬화해서 반환
+            indexes = [i for i, c in enumerate(columns) if c in json_columns]
+            if indexes:
+                rows = [self._decode_row(row, indexes) for row in rows]
+            return columns, rows
 
-        self._track_tokens(self._estimate_tokens(sql))
-
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, values)
-            rows = [dict(row) for row in cursor.fetchall()]
-            result = QueryResult(rows=rows, affected_rows=len(rows))
+        columns, rows = await self._run_read(run_query)
+        result = QueryResult(
+            rows=_pack_rows(columns, rows, layout), affected_rows=len(rows)
+        )
 
         return AgentResult.success_result(
             data=result.to_dict(),
@@ -354,6 +811,7 @@ class StorageAgent(BaseAgent):
         table = input_data.get("table", "")
         records = input_data.get("records", [])
         conflict_columns = input_data.get("conflict_columns", [])
+        return_ids = bool(input_data.get("return_ids", False)) and bool(self._RETURNING)
 
         if not table or not records:
             return AgentResult.failure_result(
@@ -362,7 +820,6 @@ class StorageAgent(BaseAgent):
             )
 
         self._validate_table(table)
-        table = self._sanitize_identifier(table)
 
         if not records:
             return AgentResult.success_result(
@@ -370,39 +827,118 @@ class StorageAgent(BaseAgent):
             )
 
         # 첫 번째 레코드에서 컬럼 추출
-        columns = [self._sanitize_identifier(k) for k in records[0].keys()]
-        placeholders = ["?" for _ in columns]
-
-        # UPSERT SQL 생성 (SQLite 3.24+)
-        if conflict_columns:
-            conflict_cols = ", ".join(self._sanitize_identifier(c) for c in conflict_columns)
-            update_cols = ", ".join(
-                f"{c} = excluded.{c}" for c in columns if c not in conflict_columns
+        keys = list(records[0].keys())
+
+        def build_sql(row_count: int) -> str:
+            name = self._sanitize_identifier(table)
+            columns = [self._sanitize_identifier(k) for k in keys]
+            row = f"({', '.join('?' for _ in columns)})"
+            values_sql = ", ".join([row] * row_count)
+            returning = self._RETURNING if return_ids else ""
+
+            # UPSERT SQL 생성 (SQLite 3.24+)
+            if conflict_columns:
+                conflict = [self._sanitize_identifier(c) for c in conflict_columns]
+                update_cols = ", ".join(
+                    f"{c} = excluded.{c}" for c in columns if c not in conflict
+                )
+                # 충돌 컬럼 외에 갱신할 컬럼이 없으면 DO NOTHING
+                action = f"DO UPDATE SET {update_cols}" if update_cols else "DO NOTHING"
+                return (
+                    f"INSERT INTO {name} ({', '.join(columns)}) "
+                    f"VALUES {values_sql} "
+                    f"ON CONFLICT ({', '.join(conflict)}) {action}"
+                    f"{returning}"
+                )
+            return (
+                f"INSERT OR REPLACE INTO {name} ({', '.join(columns)}) "
+                f"VALUES {values_sql}{returning}"
             )
-            sql = (
-                f"INSERT INTO {table} ({', '.join(columns)}) "
-                f"VALUES ({', '.join(placeholders)}) "
-                f"ON CONFLICT ({conflict_cols}) DO UPDATE SET {update_cols}"
+
+        # 한 문장에 여러 행을 바인딩 (바인딩 변수 상한 이내)
+        rows_per_statement = max(
+            1, min(self.MULTI_ROW_SIZE, self.MAX_VARIABLE_NUMBER // len(keys))
+        )
+        full_count = len(records) - len(records) % rows_per_statement
+        sql_key = (
+            "bulk_upsert", table, tuple(keys), tuple(conflict_columns), return_ids
+        )
+        sql, tokens = self._cached_sql(sql_key + (1,), lambda: build_sql(1))
+
+        self._track_tokens(tokens * len(records) // 10)
+
+        # 값 추출: 모든 레코드에 첫 레코드의 키가 있으면 itemgetter로 한 번에 튜플화,
+        # 일부 키가 빠진 레코드가 섞여 있으면 기존 get() 의미(None) 유지
+        first_keys = records[0].keys()
+        if all(first_keys <= record.keys() for record in records):
+            if len(keys) > 1:
+                getter = itemgetter(*keys)
+            else:
+                getter = lambda record, key=keys[0]: (record[key],)
+        else:
+            getter = lambda record: tuple(record.get(k) for k in keys)
+
+        # 어느 레코드에서든 dict/list 값이 있는 컬럼은 JSON 텍스트로 직렬화
+        # (첫 레코드가 None이어도 이후 레코드의 값은 save_record와 같이 인코딩)
+        json_indexes = [
+            i
+            for i, k in enumerate(keys)
+            if any(isinstance(record.get(k), (dict, list)) for record in records)
+        ]
+        if json_indexes:
+            extract = getter
+            getter = lambda record: self._encode_row(extract(record), json_indexes)
+
+        # 전체 배치를 하나의 트랜잭션(커밋 1회) 안에서 실행:
+        # rows_per_statement 단위 다중 행 INSERT + 나머지는 단일 행 INSERT
+        # (return_ids면 executemany 대신 execute로 RETURNING 결과를 수집)
+        # 임시(staging) 테이블에 적재 후 INSERT ... SELECT로 병합하는 방식은 쓰지 않음:
+        # 다중 행 바인딩으로 Python↔C 왕복이 이미 128행 단위로 줄어 있어, 같은 행을
+        # 한 번 더 복사하는 staging 경로가 20만 행 기준 오히려 느렸음
+        if rows_per_statement > 1 and full_count:
+            multi_sql, _ = self._cached_sql(
+                sql_key + (rows_per_statement,),
+                lambda: build_sql(rows_per_statement),
             )
         else:
-            sql = (
-                f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}) "
-                f"VALUES ({', '.join(placeholders)})"
+            full_count = 0
+
+        def run_write() -> Tuple[int, List[int]]:
+            affected = 0
+            ids: List[int] = []
+            flat_values = (
+                tuple(
+                    chain.from_iterable(map(getter, records[i : i + rows_per_statement]))
+                )
+                for i in range(0, full_count, rows_per_statement)
             )
+            rest_values = map(getter, records[full_count:])
 
-        self._track_tokens(self._estimate_tokens(sql) * len(records) // 10)
-
-        total_affected = 0
-        with self._get_connection() as conn:
-            for record in records:
-                values = [record.get(k) for k in records[0].keys()]
-                cursor = conn.execute(sql, values)
-                total_affected += cursor.rowcount
+            with self._get_connection() as conn:
+                if return_ids:
+                    statements = chain(
+                        ((multi_sql, v) for v in flat_values),
+                        ((sql, v) for v in rest_values),
+                    )
+                    for statement, values in statements:
+                        cursor = conn.execute(statement, values)
+                        ids.extend(row[0] for row in cursor.fetchall())
+                        affected += cursor.rowcount
+                else:
+                    if full_count:
+                        affected += conn.executemany(multi_sql, flat_values).rowcount
+                    affected += conn.executemany(sql, rest_values).rowcount
+            return affected, ids
+
+        total_affected, ids = await self._run_write(run_write)
 
         self.logger.info(f"Bulk upserted {total_affected} records to {table}")
 
+        data = {"affected_rows": total_affected, "total_records": len(records)}
+        if return_ids:
+            data["ids"] = ids
         return AgentResult.success_result(
-            data={"affected_rows": total_affected, "total_records": len(records)},
+            data=data,
             metrics={"rows_affected": total_affected},
         )
 
@@ -427,10 +963,15 @@ class StorageAgent(BaseAgent):
 
         self._track_tokens(self._estimate_tokens(sql))
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(sql, params)
-            rows = [dict(row) for row in cursor.fetchall()]
-            result = QueryResult(rows=rows, affected_rows=len(rows))
+        layout = self._get_layout(input_data)
+        def run_query() -> Tuple[List[str], List[tuple]]:
+            with self._get_ro_connection() as conn:
+                return self._fetch_rows(conn, sql, params)
+
+        columns, rows = await self._run_read(run_query)
+        result = QueryResult(
+            rows=_pack_rows(columns, rows, layout), affected_rows=len(rows)
+        )
 
         return AgentResult.success_result(
             data=result.to_dict(),
@@ -443,11 +984,14 @@ class StorageAgent(BaseAgent):
 
         if not table:
             # 모든 테이블 목록 반환
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "SELECT name FROM sqlite_master WHERE type='table'"
-                )
-                tables = [row["name"] for row in cursor.fetchall()]
+            def run_tables() -> List[str]:
+                with self._get_ro_connection() as conn:
+                    cursor = conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type='table'"
+                    )
+                    return [row[0] for row in cursor.fetchall()]
+
+            tables = await self._run_read(run_tables)
 
             return AgentResult.success_result(
                 data={"tables": tables},
@@ -456,19 +1000,118 @@ class StorageAgent(BaseAgent):
         self._validate_table(table)
         table = self._sanitize_identifier(table)
 
-        with self._get_connection() as conn:
-            cursor = conn.execute(f"PRAGMA table_info({table})")
-            columns = [
-                {
-                    "name": row["name"],
-                    "type": row["type"],
-                    "nullable": not row["notnull"],
-                    "default": row["dflt_value"],
-                    "primary_key": bool(row["pk"]),
-                }
-                for row in cursor.fetchall()
-            ]
+        def run_query() -> List[tuple]:
+            # 테이블명을 바인딩하는 테이블 반환 함수형 PRAGMA (문장 캐시 재사용 가능)
+            with self._get_ro_connection() as conn:
+                return conn.execute(
+                    'SELECT name, type, "notnull", dflt_value, pk '
+                    "FROM pragma_table_info(?) ORDER BY cid",
+                    (table,),
+                ).fetchall()
+
+        columns = [
+            {
+                "name": name,
+                "type": col_type,
+                "nullable": not notnull,
+                "default": default,
+                "primary_key": bool(pk),
+            }
+            for name, col_type, notnull, default, pk in await self._run_read(run_query)
+        ]
 
         return AgentResult.success_result(
             data={"table": table, "columns": columns},
         )
+
+    async def _create_fts_index(self, input_data: Dict[str, Any]) -> AgentResult:
+        """
+        FTS5 전문 검색 인덱스 생성 (1회성 마이그레이션)
+
+        원본 테이블을 content로 하는 외부 콘텐츠 FTS5 테이블 {table}_fts와
+        INSERT/UPDATE/DELETE 동기화 트리거를 만들고 기존 데이터를 색인합니다.
+        이미 존재하면 rebuild만 수행합니다.
+        """
+        table = input_data.get("table", "")
+
+        if table not in self.FTS_COLUMNS:
+            return AgentResult.failure_result(
+                error=f"FTS index is not supported for table: {table}",
+                error_type="ValidationError",
+            )
+
+        self._validate_table(table)
+        fts = f"{table}_fts"
+        columns = self.FTS_COLUMNS[table]
+        col_str = ", ".join(columns)
+        new_values = ", ".join(f"new.{c}" for c in columns)
+        old_values = ", ".join(f"old.{c}" for c in columns)
+
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{col_str}, content='{table}', tokenize='porter unicode61')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {col_str}) VALUES (new.rowid, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_str}) "
+            f"VALUES ('delete', old.rowid, {old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {col_str}) "
+            f"VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {col_str}) VALUES (new.rowid, {new_values}); END",
+            f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+        ]
+
+        def run_write() -> None:
+            with self._get_connection() as conn:
+                for sql in statements:
+                    conn.execute(sql)
+
+        await self._run_write(run_write)
+
+        self.logger.info(f"Created FTS index {fts} on {table}({col_str})")
+
+        return AgentResult.success_result(
+            data={"table": table, "fts_table": fts, "columns": columns},
+        )
+
+    async def _create_indexes(self, input_data: Dict[str, Any]) -> AgentResult:
+        """
+        INDEXES에 정의된 보조 인덱스 생성 (1회성 마이그레이션)
+
+        table을 지정하면 해당 테이블의 인덱스만 만듭니다.
+        이미 존재하는 인덱스는 건너뜁니다.
+        """
+        table = input_data.get("table")
+
+        if table is None:
+            tables = list(self.INDEXES)
+        elif table in self.INDEXES:
+            tables = [table]
+        else:
+            return AgentResult.failure_result(
+                error=f"No indexes are defined for table: {table}",
+                error_type="ValidationError",
+            )
+
+        statements = []
+        created = []
+        for name in tables:
+            self._validate_table(name)
+            for index_name, columns in self.INDEXES[name]:
+                statements.append(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} "
+                    f"ON {name}({', '.join(columns)})"
+                )
+                created.append(index_name)
+
+        def run_write() -> None:
+            with self._get_connection() as conn:
+                for sql in statements:
+                    conn.execute(sql)
+
+        await self._run_write(run_write)
+
+        self.logger.info(f"Created indexes: {created}")
+
+        return AgentResult.success_result(data={"indexes": created})
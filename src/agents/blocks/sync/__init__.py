@@ -11,5 +11,6 @@ Capabilities:
 """
 
 from .sync_agent import SyncAgent
+from .file_cache import FileInfoCache
 
-__all__ = ["SyncAgent"]
+__all__ = ["SyncAgent", "FileInfoCache"]
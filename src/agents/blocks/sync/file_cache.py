@@ -0,0 +1,194 @@
+"""
+FileInfoCache - 파일 체크섬/디렉토리 목록 영속 캐시
+
+(path, size, mtime_ns)가 같으면 파일 내용도 같다고 보고
+이전에 계산한 체크섬을 재사용합니다. 캐시 적중 시 파일 전체 읽기를 생략합니다.
+
+디렉토리 mtime이 그대로면 이전 스캔의 목록을 재사용해 scandir을 생략합니다.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+# xxhash (SIMD 가속 비암호 해시, 선택 의존성)
+try:
+    import xxhash
+
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+# crc32c (SSE4.2 가속 CRC32C, 선택 의존성)
+try:
+    import crc32c
+
+    CRC32C_AVAILABLE = True
+except ImportError:
+    CRC32C_AVAILABLE = False
+
+
+# 파일 읽기 단위 (1 MiB)
+READ_CHUNK_SIZE = 1 << 20
+
+# 지원 해시 알고리즘 (모두 비암호 용도, 64비트 이하)
+HASH_ALGOS = ("xxh3", "crc32c", "crc32", "blake2b")
+
+# 사용 가능한 기본 해시 알고리즘 (xxhash 미설치 시 blake2b 64비트)
+DEFAULT_HASH_ALGO = "xxh3" if XXHASH_AVAILABLE else "blake2b"
+
+# 디렉토리 목록 항목: (이름, 디렉토리 여부, 크기, 수정 시각 ns)
+# 확장자 필터에 걸리지 않아 stat하지 않은 파일은 크기/수정 시각이 None
+ListingEntry = Tuple[str, bool, Optional[int], Optional[int]]
+
+# 스레드별 읽기 버퍼 (파일마다 새 bytes를 만들지 않음)
+_buffers = threading.local()
+
+
+def hash_algo_available(algo: str) -> bool:
+    """해시 알고리즘 사용 가능 여부"""
+    if algo == "xxh3":
+        return XXHASH_AVAILABLE
+    if algo == "crc32c":
+        return CRC32C_AVAILABLE
+    return algo in HASH_ALGOS
+
+
+def file_digest(path: str, algo: str = DEFAULT_HASH_ALGO) -> int:
+    """파일 내용의 64비트 정수 체크섬 (SQLite INTEGER에 맞게 부호 있는 값)"""
+    buf = getattr(_buffers, "buf", None)
+    if buf is None:
+        buf = _buffers.buf = bytearray(READ_CHUNK_SIZE)
+    view = memoryview(buf)
+
+    with open(path, "rb", buffering=0) as f:
+        # CRC 계열은 누적 값을 직접 이어서 계산
+        if algo in ("crc32", "crc32c"):
+            update = crc32c.crc32c if algo == "crc32c" else zlib.crc32
+            value = 0
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    return value
+                value = update(view[:n], value)
+
+        if algo == "xxh3":
+            hasher = xxhash.xxh3_64()
+        else:
+            hasher = hashlib.blake2b(digest_size=8)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return int.from_bytes(hasher.digest(), "big", signed=True)
+
+
+def digest_hex(digest: int) -> str:
+    """정수 체크섬을 16자리 hex 문자열로 변환"""
+    return f"{digest & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+class FileInfoCache:
+    """
+    (path, size, mtime_ns) → 체크섬 캐시
+
+    사용법:
+        cache = FileInfoCache(".sync_cache.sqlite")
+        digest = cache.get(path, size, mtime_ns)
+        if digest is None:
+            digest = file_digest(path)
+            cache.put_many([(path, size, mtime_ns, digest)])
+    """
+
+    def __init__(self, db_path: str, algo: str = DEFAULT_HASH_ALGO):
+        """
+        Args:
+            db_path: 캐시 SQLite 파일 경로
+            algo: 체크섬 알고리즘 이름 (다른 알고리즘 값은 캐시 미스로 처리)
+        """
+        self.db_path = db_path
+        self.algo = algo
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "algo TEXT, digest INTEGER)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dir_meta ("
+            "dir_path TEXT PRIMARY KEY, mtime_ns INTEGER)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS dir_entries ("
+            "dir_path TEXT, name TEXT, is_dir INTEGER, size INTEGER, "
+            "mtime_ns INTEGER, PRIMARY KEY (dir_path, name)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def get(self, path: str, size: int, mtime_ns: int) -> Optional[int]:
+        """캐시된 체크섬 조회 (크기/수정 시각/알고리즘이 다르면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM meta "
+                "WHERE path = ? AND size = ? AND mtime_ns = ? AND algo = ?",
+                (path, size, mtime_ns, self.algo),
+            ).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, entries: Iterable[Tuple[str, int, int, int]]) -> None:
+        """(path, size, mtime_ns, digest) 일괄 저장"""
+        algo = self.algo
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO meta "
+                    "(path, size, mtime_ns, algo, digest) VALUES (?, ?, ?, ?, ?)",
+                    [(p, s, m, algo, d) for p, s, m, d in entries],
+                )
+
+    def get_listing(
+        self, dir_path: str, mtime_ns: int
+    ) -> Optional[List[ListingEntry]]:
+        """디렉토리 mtime이 같을 때 캐시된 목록 반환 (없거나 바뀌었으면 None)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns FROM dir_meta WHERE dir_path = ?", (dir_path,)
+            ).fetchone()
+            if row is None or row[0] != mtime_ns:
+                return None
+            rows = self._conn.execute(
+                "SELECT name, is_dir, size, mtime_ns FROM dir_entries "
+                "WHERE dir_path = ?",
+                (dir_path,),
+            ).fetchall()
+        return [(name, bool(is_dir), size, mtime) for name, is_dir, size, mtime in rows]
+
+    def put_listing(
+        self, dir_path: str, mtime_ns: int, entries: Iterable[ListingEntry]
+    ) -> None:
+        """디렉토리 목록을 한 트랜잭션으로 교체 저장"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "DELETE FROM dir_entries WHERE dir_path = ?", (dir_path,)
+                )
+                self._conn.executemany(
+                    "INSERT INTO dir_entries "
+                    "(dir_path, name, is_dir, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                    [(dir_path, n, int(d), s, m) for n, d, s, m in entries],
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO dir_meta (dir_path, mtime_ns) VALUES (?, ?)",
+                    (dir_path, mtime_ns),
+                )
+
+    def close(self) -> None:
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
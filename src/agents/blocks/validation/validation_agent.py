@@ -10,12 +10,14 @@ ValidationAgent - 데이터 검증 전담 에이전트
 - 검증 리포트 생성
 """
 
+import asyncio
 import os
 import re
-from typing import Any, Dict, List, Optional, Set, Callable
+import stat as stat_module
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Callable, Pattern, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-from pathlib import Path
 from datetime import datetime
 import sqlite3
 from contextlib import contextmanager
@@ -24,6 +26,7 @@ from ...core.base_agent import BaseAgent
 from ...core.agent_context import AgentContext
 from ...core.agent_result import AgentResult
 from ...core.exceptions import AgentExecutionError
+from ..sqlite_pragmas import CONNECTION_PRAGMAS
 
 
 class ValidationSeverity(Enum):
@@ -33,7 +36,12 @@ class ValidationSeverity(Enum):
     INFO = "info"
 
 
-@dataclass
+# 레코드/이슈 단위 핫 패스용 심각도 상수 (Enum 멤버를 클래스 속성으로 매번 조회하는 비용 제거)
+_SEVERITY_ERROR = ValidationSeverity.ERROR
+_SEVERITY_WARNING = ValidationSeverity.WARNING
+
+
+@dataclass(slots=True)
 class ValidationIssue:
     """검증 이슈"""
 
@@ -55,7 +63,7 @@ class ValidationIssue:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ValidationReport:
     """검증 리포트"""
 
@@ -69,12 +77,20 @@ class ValidationReport:
     def add_issue(self, issue: ValidationIssue) -> None:
         """이슈 추가"""
         self.issues.append(issue)
-        if issue.severity == ValidationSeverity.ERROR:
+        severity = issue.severity
+        if severity is _SEVERITY_ERROR:
             self.errors += 1
             self.passed = False
-        elif issue.severity == ValidationSeverity.WARNING:
+        elif severity is _SEVERITY_WARNING:
             self.warnings += 1
 
+    def merge(self, other: "ValidationReport") -> None:
+        """다른 리포트의 이슈/집계 병합 (checked_items는 호출측에서 처리)"""
+        self.issues.extend(other.issues)
+        self.errors += other.errors
+        self.warnings += other.warnings
+        self.passed = self.passed and other.passed
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "passed": self.passed,
@@ -122,6 +138,226 @@ RECORD_SCHEMAS = {
 }
 
 
+@dataclass(frozen=True)
+class CompiledSchema:
+    """검증 루프용으로 미리 변환한 스키마 (dict 조회/정규식 컴파일 제거)"""
+
+    required: Tuple[str, ...]
+    types: Tuple[Tuple[str, type], ...]
+    constraints: Tuple[Tuple[str, Optional[Any], Optional[Any]], ...]  # (필드, min, max)
+    patterns: Tuple[Tuple[str, Pattern[str]], ...]
+
+
+def compile_schema(schema: Dict[str, Any]) -> CompiledSchema:
+    """스키마 정의를 CompiledSchema로 변환"""
+    return CompiledSchema(
+        required=tuple(schema.get("required", [])),
+        types=tuple(schema.get("types", {}).items()),
+        constraints=tuple(
+            (name, constraint.get("min"), constraint.get("max"))
+            for name, constraint in schema.get("constraints", {}).items()
+        ),
+        patterns=tuple(
+            (name, re.compile(pattern, re.IGNORECASE))
+            for name, pattern in schema.get("patterns", {}).items()
+        ),
+    )
+
+
+# 모듈 로드 시 한 번만 컴파일
+COMPILED_SCHEMAS = {name: compile_schema(schema) for name, schema in RECORD_SCHEMAS.items()}
+
+
+# 레코드 검증 함수: (데이터, 레코드 ID, 리포트) → 리포트에 이슈 추가
+RecordValidator = Callable[[Dict[str, Any], Optional[str], "ValidationReport"], None]
+
+
+def build_validator(schema: CompiledSchema) -> RecordValidator:
+    """CompiledSchema로 단일 레코드 검증 클로저 생성 (이슈를 리포트에 직접 추가)"""
+    required = schema.required
+    types = schema.types
+    constraints = schema.constraints
+    patterns = schema.patterns
+
+    def validate(
+        data: Dict[str, Any], record_id: Optional[str], report: ValidationReport
+    ) -> None:
+        # 필수 필드 체크
+        for required_field in required:
+            if data.get(required_field) is None:
+                report.add_issue(
+                    ValidationIssue(
+                        code="MISSING_REQUIRED_FIELD",
+                        message=f"Required field '{required_field}' is missing",
+                        severity=_SEVERITY_ERROR,
+                        field=required_field,
+                        record_id=record_id,
+                        suggestion=f"Add '{required_field}' field to the record",
+                    )
+                )
+
+        # 타입 체크
+        for field_name, expected_type in types:
+            value = data.get(field_name)
+            if value is not None and not isinstance(value, expected_type):
+                report.add_issue(
+                    ValidationIssue(
+                        code="TYPE_MISMATCH",
+                        message=f"Field '{field_name}' should be {expected_type.__name__}, got {type(value).__name__}",
+                        severity=_SEVERITY_ERROR,
+                        field=field_name,
+                        record_id=record_id,
+                    )
+                )
+
+        # 제약 조건 체크
+        # 레코드당 비교 몇 번뿐이라 numba 커널은 쓰지 않음 (dict → 배열 추출이 더 느림)
+        for field_name, minimum, maximum in constraints:
+            value = data.get(field_name)
+            if value is None:
+                continue
+            if minimum is not None and value < minimum:
+                report.add_issue(
+                    ValidationIssue(
+                        code="VALUE_TOO_SMALL",
+                        message=f"Field '{field_name}' value {value} is below minimum {minimum}",
+                        severity=_SEVERITY_ERROR,
+                        field=field_name,
+                        record_id=record_id,
+                    )
+                )
+            if maximum is not None and value > maximum:
+                report.add_issue(
+                    ValidationIssue(
+                        code="VALUE_TOO_LARGE",
+                        message=f"Field '{field_name}' value {value} exceeds maximum {maximum}",
+                        severity=_SEVERITY_ERROR,
+                        field=field_name,
+                        record_id=record_id,
+                    )
+                )
+
+        # 패턴 체크
+        for field_name, pattern in patterns:
+            value = data.get(field_name)
+            if value is not None and not pattern.match(str(value)):
+                report.add_issue(
+                    ValidationIssue(
+                        code="PATTERN_MISMATCH",
+                        message=f"Field '{field_name}' does not match pattern: {pattern.pattern}",
+                        severity=_SEVERITY_WARNING,
+                        field=field_name,
+                        record_id=record_id,
+                    )
+                )
+
+    return validate
+
+
+# 일관성 체크별 CTE: (CTE 이름, 본문). 모든 CTE는 (id, value, cnt) 컬럼을 반환
+CONSISTENCY_CHECKS = {
+    # 중복 파일명 (StorageAgent create_indexes의 idx_vf_filename 사용)
+    "duplicates": (
+        "dup",
+        "SELECT NULL AS id, filename AS value, COUNT(*) AS cnt "
+        "FROM video_files GROUP BY filename HAVING cnt > 1",
+    ),
+    # 필수 필드 NULL
+    "nulls": (
+        "null_rows",
+        "SELECT id, filename AS value, NULL AS cnt "
+        "FROM video_files WHERE filename IS NULL OR filename = ''",
+    ),
+    # 참조 무결성 (project 필드가 projects 테이블에 있는지)
+    "references": (
+        "orphan_refs",
+        "SELECT v.id, v.project AS value, NULL AS cnt "
+        "FROM video_files v LEFT JOIN projects p ON v.project = p.name "
+        "WHERE v.project IS NOT NULL AND p.name IS NULL LIMIT 100",
+    ),
+}
+
+
+def build_consistency_query(checks: List[str]) -> str:
+    """선택한 일관성 체크를 (kind, id, value, cnt) 단일 UNION ALL 쿼리로 조합"""
+    ctes = ", ".join(
+        f"{CONSISTENCY_CHECKS[name][0]} AS ({CONSISTENCY_CHECKS[name][1]})"
+        for name in checks
+    )
+    selects = " UNION ALL ".join(
+        f"SELECT '{name}' AS kind, id, value, cnt FROM {CONSISTENCY_CHECKS[name][0]}"
+        for name in checks
+    )
+    return f"WITH {ctes} {selects}"
+
+
+# 경로 상태: 없으면 None, 있으면 (파일 여부, 크기). 크기 미조회/파일 아님은 -1
+PathStatus = Optional[Tuple[bool, int]]
+
+
+def _stat_path(path: str, with_size: bool) -> PathStatus:
+    """단일 경로 stat (scandir로 판단할 수 없을 때의 폴백)"""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    is_file = stat_module.S_ISREG(st.st_mode)
+    return (is_file, st.st_size if with_size and is_file else -1)
+
+
+def stat_paths(
+    paths: Iterable[str], with_size: bool = True, group_by_dir: bool = True
+) -> Dict[str, PathStatus]:
+    """
+    파일 존재 여부 일괄 확인
+
+    부모 디렉토리별로 묶어 디렉토리당 scandir 한 번으로 판단합니다.
+    목록에 없는 이름(대소문자 무시 파일시스템 등)과 심볼릭 링크만 개별 stat합니다.
+    group_by_dir=False이면 경로마다 stat합니다 (큰 디렉토리에 확인할 파일이 적을 때).
+    """
+    if not group_by_dir:
+        return {path: _stat_path(path, with_size) for path in paths}
+
+    groups: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+    results: Dict[str, PathStatus] = {}
+
+    for path in paths:
+        dir_path, name = os.path.split(path)
+        if name in ("", ".", ".."):
+            results[path] = _stat_path(path, with_size)
+        else:
+            groups[dir_path or "."].append((path, name))
+
+    for dir_path, members in groups.items():
+        try:
+            with os.scandir(dir_path) as it:
+                entries = {entry.name: entry for entry in it}
+        except (FileNotFoundError, NotADirectoryError):
+            for path, _ in members:
+                results[path] = None
+            continue
+        except (OSError, ValueError):
+            # 목록 권한이 없는 디렉토리 등
+            for path, _ in members:
+                results[path] = _stat_path(path, with_size)
+            continue
+
+        for path, name in members:
+            entry = entries.get(name)
+            if entry is None or entry.is_symlink():
+                results[path] = _stat_path(path, with_size)
+                continue
+            try:
+                is_file = entry.is_file()
+                size = entry.stat().st_size if with_size and is_file else -1
+            except OSError:
+                results[path] = None
+                continue
+            results[path] = (is_file, size)
+
+    return results
+
+
 class ValidationAgent(BaseAgent):
     """
     데이터 검증 전담 에이전트
@@ -145,6 +381,18 @@ class ValidationAgent(BaseAgent):
         - generate_report: 검증 리포트 생성
     """
 
+    # 연결 생성 시 한 번 적용하는 PRAGMA (공통 튜닝, journal_mode는 StorageAgent가 지정)
+    CONNECTION_PRAGMAS = CONNECTION_PRAGMAS
+
+    # 스레드 하나가 처리할 파일 경로 수
+    STAT_CHUNK_SIZE = 1000
+    # 동시에 실행할 stat 스레드 수
+    STAT_CONCURRENCY = os.cpu_count() or 4
+    # check_orphans 파일 확인 방식
+    ORPHAN_SCAN_MODES = ("auto", "per_dir", "per_file")
+    # auto 모드에서 디렉토리당 경로 수가 이 값을 넘으면 scandir 사용
+    ORPHAN_PATHS_PER_DIR = 4
+
     def __init__(self, config: Optional[Dict[str, Any]] = None):
         """
         Args:
@@ -152,13 +400,24 @@ class ValidationAgent(BaseAgent):
                 - db_path: 데이터베이스 경로
                 - strict_mode: 엄격 모드 (경고도 에러로)
                 - file_check_enabled: 파일 존재 체크 활성화
+                - orphan_scan_mode: 고아 레코드 파일 확인 방식
+                  (auto/per_dir/per_file, 기본: auto)
         """
         super().__init__("BLOCK_VALIDATION", config)
 
         self._db_path = self.config.get("db_path", "")
         self._strict_mode = self.config.get("strict_mode", False)
         self._file_check_enabled = self.config.get("file_check_enabled", True)
-        self._schemas = RECORD_SCHEMAS.copy()
+        self._orphan_scan_mode = self.config.get("orphan_scan_mode", "auto")
+        if self._orphan_scan_mode not in self.ORPHAN_SCAN_MODES:
+            raise ValueError(
+                f"Unknown orphan_scan_mode: {self._orphan_scan_mode}. "
+                f"Allowed: {self.ORPHAN_SCAN_MODES}"
+            )
+        # 스키마 이름 → CompiledSchema (검증 시 스키마당 dict 조회 1회)
+        self._compiled_schemas = COMPILED_SCHEMAS.copy()
+        self._validators: Dict[str, RecordValidator] = {}
+        self._conn: Optional[sqlite3.Connection] = None
 
     def get_capabilities(self) -> List[str]:
         """에이전트 능력 목록"""
@@ -171,19 +430,68 @@ class ValidationAgent(BaseAgent):
             "generate_report",
         ]
 
+    def _get_validator(self, schema_name: str) -> RecordValidator:
+        """스키마별 검증 클로저 (최초 사용 시 생성 후 캐시)"""
+        validator = self._validators.get(schema_name)
+        if validator is None:
+            validator = build_validator(self._compiled_schemas[schema_name])
+            self._validators[schema_name] = validator
+        return validator
+
+    async def _stat_paths(
+        self, paths: List[str], with_size: bool = True, group_by_dir: bool = True
+    ) -> Dict[str, PathStatus]:
+        """이벤트 루프를 막지 않도록 stat_paths를 스레드에서 실행 (많으면 청크 병렬)"""
+        chunk_size = self.STAT_CHUNK_SIZE
+        if len(paths) <= chunk_size:
+            return await asyncio.to_thread(stat_paths, paths, with_size, group_by_dir)
+
+        # 같은 디렉토리 경로가 한 청크에 모이도록 정렬 후 분할
+        ordered = sorted(paths, key=os.path.dirname)
+        semaphore = asyncio.Semaphore(self.STAT_CONCURRENCY)
+
+        async def run(chunk: List[str]) -> Dict[str, PathStatus]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    stat_paths, chunk, with_size, group_by_dir
+                )
+
+        parts = await asyncio.gather(
+            *(run(ordered[i:i + chunk_size]) for i in range(0, len(ordered), chunk_size))
+        )
+        results: Dict[str, PathStatus] = {}
+        for part in parts:
+            results.update(part)
+        return results
+
     @contextmanager
     def _get_connection(self):
-        """데이터베이스 연결"""
+        """
+        데이터베이스 연결
+
+        연결을 한 번 열어 두고 재사용합니다 (페이지 캐시 유지, 종료는 close()).
+        """
         if not self._db_path:
             raise AgentExecutionError("db_path is not configured", self.block_id)
 
-        conn = sqlite3.connect(self._db_path)
-        conn.row_factory = sqlite3.Row
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self._db_path,
+                # close()는 다른 스레드에서 호출될 수 있음
+                check_same_thread=False,
+            )
+            conn.row_factory = sqlite3.Row
+            for pragma in self.CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._conn = conn
 
-        try:
-            yield conn
-        finally:
-            conn.close()
+        yield self._conn
+
+    def close(self) -> None:
+        """영속 연결 종료"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
     async def execute(
         self, context: AgentContext, input_data: Dict[str, Any]
@@ -226,92 +534,44 @@ class ValidationAgent(BaseAgent):
         except Exception as e:
             return await self.handle_error(e, context)
 
+    def _validate_record_report(
+        self, schema_name: str, data: Dict[str, Any], record_id: Optional[str]
+    ) -> ValidationReport:
+        """단일 레코드 검증 (리포트 객체 반환)"""
+        report = ValidationReport(checked_items=1)
+        self._track_tokens(self._estimate_tokens(str(data)))
+        self._get_validator(schema_name)(data, record_id, report)
+        return report
+
+    def _validate_batch_report(
+        self, schema_name: str, records: List[Dict[str, Any]]
+    ) -> ValidationReport:
+        """다중 레코드 검증 (리포트 객체 반환)"""
+        report = ValidationReport(checked_items=len(records))
+        validate = self._get_validator(schema_name)
+
+        # 레코드마다 await/dict 직렬화 없이 한 리포트에 바로 누적
+        # pandas 열 단위 검증은 쓰지 않음: DataFrame 변환 + 마스크 계산만으로 이 루프보다
+        # 느리고 (이슈 생성 제외), isinstance 타입 체크 의미(bool ⊂ int 등)도 달라짐
+        for i, record in enumerate(records):
+            self._track_tokens(self._estimate_tokens(str(record)))
+            validate(record, record.get("id", str(i)), report)
+
+        return report
+
     async def _validate_record(self, input_data: Dict[str, Any]) -> AgentResult:
         """단일 레코드 검증"""
         schema_name = input_data.get("schema", "video_files")
         data = input_data.get("data", {})
         record_id = input_data.get("record_id")
 
-        if schema_name not in self._schemas:
+        if schema_name not in self._compiled_schemas:
             return AgentResult.failure_result(
                 errors=[f"Unknown schema: {schema_name}"],
                 error_type="ValidationError",
             )
 
-        schema = self._schemas[schema_name]
-        report = ValidationReport(checked_items=1)
-
-        self._track_tokens(self._estimate_tokens(str(data)))
-
-        # 필수 필드 체크
-        for required_field in schema.get("required", []):
-            if required_field not in data or data[required_field] is None:
-                report.add_issue(
-                    ValidationIssue(
-                        code="MISSING_REQUIRED_FIELD",
-                        message=f"Required field '{required_field}' is missing",
-                        severity=ValidationSeverity.ERROR,
-                        field=required_field,
-                        record_id=record_id,
-                        suggestion=f"Add '{required_field}' field to the record",
-                    )
-                )
-
-        # 타입 체크
-        types = schema.get("types", {})
-        for field_name, expected_type in types.items():
-            if field_name in data and data[field_name] is not None:
-                if not isinstance(data[field_name], expected_type):
-                    report.add_issue(
-                        ValidationIssue(
-                            code="TYPE_MISMATCH",
-                            message=f"Field '{field_name}' should be {expected_type.__name__}, got {type(data[field_name]).__name__}",
-                            severity=ValidationSeverity.ERROR,
-                            field=field_name,
-                            record_id=record_id,
-                        )
-                    )
-
-        # 제약 조건 체크
-        constraints = schema.get("constraints", {})
-        for field_name, constraint in constraints.items():
-            if field_name in data and data[field_name] is not None:
-                value = data[field_name]
-                if "min" in constraint and value < constraint["min"]:
-                    report.add_issue(
-                        ValidationIssue(
-                            code="VALUE_TOO_SMALL",
-                            message=f"Field '{field_name}' value {value} is below minimum {constraint['min']}",
-                            severity=ValidationSeverity.ERROR,
-                            field=field_name,
-                            record_id=record_id,
-                        )
-                    )
-                if "max" in constraint and value > constraint["max"]:
-                    report.add_issue(
-                        ValidationIssue(
-                            code="VALUE_TOO_LARGE",
-                            message=f"Field '{field_name}' value {value} exceeds maximum {constraint['max']}",
-                            severity=ValidationSeverity.ERROR,
-                            field=field_name,
-                            record_id=record_id,
-                        )
-                    )
-
-        # 패턴 체크
-        patterns = schema.get("patterns", {})
-        for field_name, pattern in patterns.items():
-            if field_name in data and data[field_name] is not None:
-                if not re.match(pattern, str(data[field_name]), re.IGNORECASE):
-                    report.add_issue(
-                        ValidationIssue(
-                            code="PATTERN_MISMATCH",
-                            message=f"Field '{field_name}' does not match pattern: {pattern}",
-                            severity=ValidationSeverity.WARNING,
-                            field=field_name,
-                            record_id=record_id,
-                        )
-                    )
+        report = self._validate_record_report(schema_name, data, record_id)
 
         return AgentResult.success_result(
             data=report.to_dict(),
@@ -329,33 +589,20 @@ class ValidationAgent(BaseAgent):
                 error_type="ValidationError",
             )
 
-        combined_report = ValidationReport(checked_items=len(records))
+        if schema_name not in self._compiled_schemas:
+            return AgentResult.failure_result(
+                error=f"Unknown schema: {schema_name}",
+                error_type="ValidationError",
+            )
 
-        for i, record in enumerate(records):
-            result = await self._validate_record({
-                "schema": schema_name,
-                "data": record,
-                "record_id": record.get("id", str(i)),
-            })
-
-            if result.data:
-                for issue_data in result.data.get("issues", []):
-                    issue = ValidationIssue(
-                        code=issue_data["code"],
-                        message=issue_data["message"],
-                        severity=ValidationSeverity(issue_data["severity"]),
-                        field=issue_data.get("field"),
-                        record_id=issue_data.get("record_id"),
-                        suggestion=issue_data.get("suggestion"),
-                    )
-                    combined_report.add_issue(issue)
+        report = self._validate_batch_report(schema_name, records)
 
         return AgentResult.success_result(
-            data=combined_report.to_dict(),
+            data=report.to_dict(),
             metrics={
                 "total_records": len(records),
-                "errors": combined_report.errors,
-                "warnings": combined_report.warnings,
+                "errors": report.errors,
+                "warnings": report.warnings,
             },
         )
 
@@ -370,15 +617,16 @@ class ValidationAgent(BaseAgent):
             paths = [file_path]
 
         report.checked_items = len(paths)
+        self._track_tokens(10 * len(paths))  # 파일 체크당 토큰
 
-        for path in paths:
-            self._track_tokens(10)  # 파일 체크당 토큰
+        statuses = await self._stat_paths([path for path in paths if path])
 
+        for path in paths:
             if not path:
                 continue
 
-            path_obj = Path(path)
-            if not path_obj.exists():
+            status = statuses[path]
+            if status is None:
                 report.add_issue(
                     ValidationIssue(
                         code="FILE_NOT_FOUND",
@@ -388,7 +636,7 @@ class ValidationAgent(BaseAgent):
                         suggestion="Check file path or sync from source",
                     )
                 )
-            elif not path_obj.is_file():
+            elif not status[0]:
                 report.add_issue(
                     ValidationIssue(
                         code="NOT_A_FILE",
@@ -397,7 +645,7 @@ class ValidationAgent(BaseAgent):
                         record_id=path,
                     )
                 )
-            elif path_obj.stat().st_size == 0:
+            elif status[1] == 0:
                 report.add_issue(
                     ValidationIssue(
                         code="EMPTY_FILE",
@@ -415,91 +663,67 @@ class ValidationAgent(BaseAgent):
             },
         )
 
-    async def _check_consistency(self, input_data: Dict[str, Any]) -> AgentResult:
-        """데이터 일관성 체크"""
-        checks = input_data.get("checks", ["duplicates", "nulls", "references"])
-
+    def _check_consistency_report(self, checks: List[str]) -> ValidationReport:
+        """데이터 일관성 체크 (리포트 객체 반환)"""
         report = ValidationReport()
 
-        with self._get_connection() as conn:
-            if "duplicates" in checks:
-                # 중복 파일명 체크
-                cursor = conn.execute(
-                    """
-                    SELECT filename, COUNT(*) as cnt
-                    FROM video_files
-                    GROUP BY filename
-                    HAVING cnt > 1
-                    """
-                )
-                duplicates = cursor.fetchall()
-                report.checked_items += 1
+        active = [name for name in CONSISTENCY_CHECKS if name in checks]
+        if not active:
+            return report
 
-                for row in duplicates:
+        with self._get_connection() as conn:
+            # 체크 전체를 UNION ALL 한 번으로 실행하고 커서를 그대로 순회
+            try:
+                cursor = conn.execute(build_consistency_query(active))
+            except sqlite3.OperationalError:
+                # projects 테이블이 없을 수 있음 → 참조 체크만 제외하고 재시도
+                if "references" not in active:
+                    raise
+                active.remove("references")
+                if not active:
+                    return report
+                cursor = conn.execute(build_consistency_query(active))
+
+            for kind, record_id, value, count in cursor:
+                if kind == "duplicates":
                     report.add_issue(
                         ValidationIssue(
                             code="DUPLICATE_FILENAME",
-                            message=f"Duplicate filename found: {row['filename']} ({row['cnt']} occurrences)",
+                            message=f"Duplicate filename found: {value} ({count} occurrences)",
                             severity=ValidationSeverity.WARNING,
                             field="filename",
                             suggestion="Review and merge/remove duplicate entries",
                         )
                     )
-
-            if "nulls" in checks:
-                # 필수 필드 NULL 체크
-                cursor = conn.execute(
-                    """
-                    SELECT id, filename
-                    FROM video_files
-                    WHERE filename IS NULL OR filename = ''
-                    """
-                )
-                nulls = cursor.fetchall()
-                report.checked_items += 1
-
-                for row in nulls:
+                elif kind == "nulls":
                     report.add_issue(
                         ValidationIssue(
                             code="NULL_REQUIRED_FIELD",
-                            message=f"Record {row['id']} has null/empty filename",
+                            message=f"Record {record_id} has null/empty filename",
                             severity=ValidationSeverity.ERROR,
                             field="filename",
-                            record_id=str(row['id']),
+                            record_id=str(record_id),
                         )
                     )
-
-            if "references" in checks:
-                # 참조 무결성 체크 (project 존재 여부 등)
-                # 여기서는 예시로 project 필드가 projects 테이블에 있는지 체크
-                try:
-                    cursor = conn.execute(
-                        """
-                        SELECT v.id, v.project
-                        FROM video_files v
-                        LEFT JOIN projects p ON v.project = p.name
-                        WHERE v.project IS NOT NULL AND p.name IS NULL
-                        LIMIT 100
-                        """
-                    )
-                    orphan_refs = cursor.fetchall()
-                    report.checked_items += 1
-
-                    for row in orphan_refs:
-                        report.add_issue(
-                            ValidationIssue(
-                                code="INVALID_REFERENCE",
-                                message=f"Record {row['id']} references non-existent project: {row['project']}",
-                                severity=ValidationSeverity.WARNING,
-                                field="project",
-                                record_id=str(row['id']),
-                            )
+                else:
+                    report.add_issue(
+                        ValidationIssue(
+                            code="INVALID_REFERENCE",
+                            message=f"Record {record_id} references non-existent project: {value}",
+                            severity=ValidationSeverity.WARNING,
+                            field="project",
+                            record_id=str(record_id),
                         )
-                except sqlite3.OperationalError:
-                    # projects 테이블이 없을 수 있음
-                    pass
+                    )
 
+        report.checked_items += len(active)
         self._track_tokens(report.checked_items * 50)
+        return report
+
+    async def _check_consistency(self, input_data: Dict[str, Any]) -> AgentResult:
+        """데이터 일관성 체크"""
+        checks = input_data.get("checks", ["duplicates", "nulls", "references"])
+        report = self._check_consistency_report(checks)
 
         return AgentResult.success_result(
             data=report.to_dict(),
@@ -528,21 +752,25 @@ class ValidationAgent(BaseAgent):
             )
             rows = cursor.fetchall()
 
-            report.checked_items = len(rows)
+        report.checked_items = len(rows)
+        paths = [row["path"] for row in rows if row["path"]]
+        statuses = await self._stat_paths(
+            paths, with_size=False, group_by_dir=self._orphans_by_dir(paths)
+        )
 
-            for row in rows:
-                path = row["path"]
-                if path and not Path(path).exists():
-                    report.add_issue(
-                        ValidationIssue(
-                            code="ORPHAN_RECORD",
-                            message=f"File no longer exists: {path}",
-                            severity=ValidationSeverity.WARNING,
-                            field=path_column,
-                            record_id=str(row["id"]),
-                            suggestion="Remove record or update path",
-                        )
+        for row in rows:
+            path = row["path"]
+            if path and statuses[path] is None:
+                report.add_issue(
+                    ValidationIssue(
+                        code="ORPHAN_RECORD",
+                        message=f"File no longer exists: {path}",
+                        severity=ValidationSeverity.WARNING,
+                        field=path_column,
+                        record_id=str(row["id"]),
+                        suggestion="Remove record or update path",
                     )
+                )
 
         self._track_tokens(report.checked_items * 5)
 
@@ -554,6 +782,14 @@ class ValidationAgent(BaseAgent):
             },
         )
 
+    def _orphans_by_dir(self, paths: List[str]) -> bool:
+        """고아 레코드 확인에 디렉토리 단위 scandir을 쓸지 결정"""
+        if self._orphan_scan_mode != "auto":
+            return self._orphan_scan_mode == "per_dir"
+        # 경로가 몇 개 안 되는 큰 디렉토리는 전체 목록보다 개별 stat이 저렴
+        dir_count = len({os.path.dirname(path) for path in paths})
+        return len(paths) > self.ORPHAN_PATHS_PER_DIR * dir_count
+
     async def _generate_report(self, input_data: Dict[str, Any]) -> AgentResult:
         """종합 검증 리포트 생성"""
         include_checks = input_data.get(
@@ -569,37 +805,16 @@ class ValidationAgent(BaseAgent):
                 cursor = conn.execute("SELECT * FROM video_files LIMIT 100")
                 records = [dict(row) for row in cursor.fetchall()]
 
-            batch_result = await self._validate_batch({
-                "schema": "video_files",
-                "records": records,
-            })
-            if batch_result.data:
-                for issue_data in batch_result.data.get("issues", []):
-                    combined_report.add_issue(
-                        ValidationIssue(
-                            code=issue_data["code"],
-                            message=issue_data["message"],
-                            severity=ValidationSeverity(issue_data["severity"]),
-                            field=issue_data.get("field"),
-                            record_id=issue_data.get("record_id"),
-                        )
-                    )
-                combined_report.checked_items += batch_result.data.get("checked_items", 0)
+            if records:
+                batch_report = self._validate_batch_report("video_files", records)
+                combined_report.merge(batch_report)
+                combined_report.checked_items += batch_report.checked_items
 
         # 일관성 검증
         if "consistency" in include_checks:
-            consistency_result = await self._check_consistency({})
-            if consistency_result.data:
-                for issue_data in consistency_result.data.get("issues", []):
-                    combined_report.add_issue(
-                        ValidationIssue(
-                            code=issue_data["code"],
-                            message=issue_data["message"],
-                            severity=ValidationSeverity(issue_data["severity"]),
-                            field=issue_data.get("field"),
-                            record_id=issue_data.get("record_id"),
-                        )
-                    )
+            combined_report.merge(
+                self._check_consistency_report(["duplicates", "nulls", "references"])
+            )
 
         self._track_tokens(combined_report.checked_items * 10)
 
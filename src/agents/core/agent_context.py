@@ -4,13 +4,14 @@
 각 에이전트 실행 시 전달되는 컨텍스트 정보를 정의합니다.
 """
 
+import time
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import uuid4
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentContext:
     """
     에이전트 실행 컨텍스트
@@ -44,8 +45,10 @@ class AgentContext:
     """
 
     # 필수 필드 (자동 생성)
-    task_id: str = field(default_factory=lambda: str(uuid4()))
-    correlation_id: str = field(default_factory=lambda: str(uuid4()))
+    # 지연 생성하지 않음: task_id는 pre_execute에서 항상 읽고,
+    # slots 데이터클래스에서 property로 감싸면 생성자 인자(task_id=...)가 깨짐
+    task_id: str = field(default_factory=lambda: uuid4().hex)
+    correlation_id: str = field(default_factory=lambda: uuid4().hex)
 
     # 워크플로우 관련
     parent_task_id: Optional[str] = None
@@ -66,8 +69,8 @@ class AgentContext:
     shared_state: Dict[str, Any] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-    # 타임스탬프
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    # 타임스탬프 (UTC epoch ns, to_dict에서만 ISO 문자열로 변환)
+    created_at: int = field(default_factory=time.time_ns)
 
     def increment_retry(self) -> bool:
         """
@@ -98,7 +101,7 @@ class AgentContext:
         return self.shared_state.get(key, default)
 
     def to_dict(self) -> Dict[str, Any]:
-        """딕셔너리 변환"""
+        """딕셔너리 변환 (필드명 튜플 + getattr 컴프리헨션보다 dict 리터럴이 빠름)"""
         return {
             "task_id": self.task_id,
             "correlation_id": self.correlation_id,
@@ -110,7 +113,9 @@ class AgentContext:
             "max_retries": self.max_retries,
             "estimated_tokens": self.estimated_tokens,
             "priority": self.priority,
-            "created_at": self.created_at.isoformat(),
+            "created_at": datetime.fromtimestamp(
+                self.created_at / 1e9, tz=timezone.utc
+            ).isoformat(),
         }
 
     def __repr__(self) -> str:
@@ -120,7 +125,7 @@ class AgentContext:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class WorkflowContext:
     """
     워크플로우 전체 컨텍스트
@@ -138,7 +143,7 @@ class WorkflowContext:
         errors: 발생한 에러 목록
     """
 
-    workflow_id: str = field(default_factory=lambda: str(uuid4()))
+    workflow_id: str = field(default_factory=lambda: uuid4().hex)
     workflow_name: str = ""
 
     # 실행 상태
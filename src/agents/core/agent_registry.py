@@ -29,6 +29,9 @@ class AgentRegistry:
         # 능력으로 조회
         agents = registry.find_by_capability("parse_filename")
 
+        # 종료 시 에이전트 리소스(스레드 풀, DB 연결) 해제
+        registry.close_all()
+
     Note:
         싱글톤 패턴을 사용하므로 여러 번 인스턴스화해도
         동일한 인스턴스가 반환됩니다.
@@ -173,6 +176,19 @@ class AgentRegistry:
         """모든 에이전트 정보"""
         return [agent.to_dict() for agent in self._agents.values()]
 
+    def close_all(self) -> None:
+        """
+        등록된 모든 에이전트의 리소스 해제 (애플리케이션 종료 시 호출)
+
+        에이전트는 등록 상태로 남으며, 이후 실행 시 리소스를 다시 생성합니다.
+        한 에이전트의 해제 실패가 나머지 해제를 막지 않습니다.
+        """
+        for block_id, agent in list(self._agents.items()):
+            try:
+                agent.close()
+            except Exception as e:
+                self.logger.warning(f"Failed to close agent {block_id}: {e}")
+
     def clear(self) -> None:
         """
         모든 에이전트 등록 해제 (테스트용)
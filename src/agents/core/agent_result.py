@@ -7,6 +7,15 @@
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional
 from datetime import datetime
+import json
+
+# orjson (C 구현 JSON 직렬화, 선택 의존성)
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 @dataclass
@@ -99,6 +108,19 @@ class AgentResult:
             "completed_at": self.completed_at.isoformat(),
         }
 
+    def to_json(self) -> bytes:
+        """
+        JSON(UTF-8 bytes) 직렬화
+
+        orjson이 설치되어 있으면 사용하고, 없으면 표준 json으로 대체합니다.
+        JSON 기본 타입이 아닌 값은 str()로 변환합니다.
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(
+                self.to_dict(), default=str, option=orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str).encode()
+
     @classmethod
     def success_result(
         cls,
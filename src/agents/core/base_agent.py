@@ -257,7 +257,11 @@ class BaseAgent(ABC):
         if not content:
             return 0
 
-        ascii_chars = sum(1 for c in content if ord(c) < 128)
+        # SQL/파일명 등 대부분의 입력은 ASCII 전용 (C 레벨 검사로 문자 순회 생략)
+        if content.isascii():
+            return len(content) // 4 + 1
+
+        ascii_chars = len(content.encode("ascii", "ignore"))
         non_ascii_chars = len(content) - ascii_chars
 
         return (ascii_chars // 4) + (non_ascii_chars // 2) + 1
@@ -399,6 +403,25 @@ class BaseAgent(ABC):
         """
         pass
 
+    # ─────────────────────────────────────────────────────────────────
+    # Resource Lifecycle
+    # ─────────────────────────────────────────────────────────────────
+
+    def close(self) -> None:
+        """
+        보유 리소스(DB 연결, 스레드 풀 등) 해제
+
+        리소스를 지연 생성하는 에이전트가 재정의합니다. 에이전트를 직접
+        생성했다면 사용 후 close()를 호출하거나 async with 블록으로 사용하세요.
+        레지스트리에 등록된 에이전트는 AgentRegistry.close_all()로 해제됩니다.
+        """
+
+    async def __aenter__(self) -> "BaseAgent":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
     # ─────────────────────────────────────────────────────────────────
     # Tool Management
     # ─────────────────────────────────────────────────────────────────
@@ -55,6 +55,24 @@ class TestAgentContext:
 
         assert ctx.input_from_previous["files"] == ["a.mp4", "b.mp4"]
 
+    def test_context_defaults(self):
+        """자동 생성 ID/생성 시각 테스트"""
+        ctx = AgentContext()
+
+        assert len(ctx.task_id) == 32
+        assert ctx.task_id != ctx.correlation_id
+        created = datetime.fromisoformat(ctx.to_dict()["created_at"])
+        assert created.tzinfo is not None
+        assert abs(created.timestamp() - ctx.created_at / 1e9) < 1e-3
+
+    def test_context_slots(self):
+        """slots 컨텍스트 테스트 (__dict__ 없음, 선언되지 않은 속성 거부)"""
+        ctx = AgentContext(task_id="test-task-003")
+
+        assert not hasattr(ctx, "__dict__")
+        with pytest.raises(AttributeError):
+            ctx.unknown_field = 1
+
 
 # ─────────────────────────────────────────────────────────────────
 # AgentResult Tests
@@ -96,6 +114,19 @@ class TestAgentResult:
         assert "data" in d
         assert d["success"] is True
 
+    def test_result_to_json(self):
+        """JSON 직렬화 테스트 (튜플 행, 비문자열 키, 비ASCII 포함)"""
+        import json
+
+        result = AgentResult.success_result(
+            data={"columns": ["id", "title"], "rows": [(1, "메인 이벤트")], 2023: "WSOP"}
+        )
+        d = json.loads(result.to_json())
+
+        assert d["success"] is True
+        assert d["data"]["rows"] == [[1, "메인 이벤트"]]
+        assert d["data"]["2023"] == "WSOP"
+
 
 # ─────────────────────────────────────────────────────────────────
 # BaseAgent Tests
@@ -220,6 +251,18 @@ class TestBaseAgent:
         assert result.success is True
         assert result.data["echo"]["message"] == "hello"
 
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes(self):
+        """async with 종료 시 close() 호출 테스트"""
+        closed = []
+        agent = DummyAgent()
+        agent.close = lambda: closed.append(True)
+
+        async with agent as entered:
+            assert entered is agent
+
+        assert closed == [True]
+
 
 # ─────────────────────────────────────────────────────────────────
 # AgentRegistry Tests
@@ -263,6 +306,28 @@ class TestAgentRegistry:
         not_found = registry.find_by_capability("nonexistent")
         assert len(not_found) == 0
 
+    def test_close_all(self):
+        """등록된 에이전트 전체 리소스 해제 테스트 (해제 실패 격리)"""
+        registry = AgentRegistry()
+        closed = []
+        failing = DummyAgent("BLOCK_CLOSE_FAIL")
+        closing = DummyAgent("BLOCK_CLOSE_OK")
+
+        def fail():
+            raise RuntimeError("close failed")
+
+        failing.close = fail
+        closing.close = lambda: closed.append(closing.block_id)
+        registry.register(failing)
+        registry.register(closing)
+        try:
+            registry.close_all()
+        finally:
+            registry.unregister("BLOCK_CLOSE_FAIL")
+            registry.unregister("BLOCK_CLOSE_OK")
+
+        assert closed == ["BLOCK_CLOSE_OK"]
+
 
 # ─────────────────────────────────────────────────────────────────
 # EventBus Tests
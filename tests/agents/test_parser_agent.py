@@ -141,6 +141,33 @@ class TestParserAgent:
         # 해상도 또는 코덱 정보가 추출되어야 함
         assert "extra" in data
 
+    @pytest.mark.parametrize(
+        "filename,expected_extra",
+        [
+            (
+                "WSOP_2023_Event1_Day1_1080p_h264.mp4",
+                {"extension": "mp4", "resolution": "1080p", "codec": "h264"},
+            ),
+            (
+                "EPT 2021 1920x1080 HEVC.MKV",
+                {"extension": "mkv", "resolution": "1920x1080", "codec": "hevc"},
+            ),
+            ("WPT 2022 Final", {}),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_extract_metadata_extra(
+        self, parser_agent, context, filename, expected_extra
+    ):
+        """해상도/코덱/확장자 추출 테스트"""
+        result = await parser_agent.execute(
+            context,
+            {"action": "extract_metadata", "filename": filename},
+        )
+
+        assert result.success is True
+        assert result.data["extra"] == expected_extra
+
     @pytest.mark.asyncio
     async def test_suggest_normalization(self, parser_agent, context):
         """정규화 제안 테스트"""
@@ -155,6 +182,23 @@ class TestParserAgent:
         assert result.success is True
         assert "normalized" in result.data
         assert "original" in result.data
+        assert "parsed" not in result.data
+
+    @pytest.mark.asyncio
+    async def test_suggest_normalization_include_parsed(self, parser_agent, context):
+        """정규화 제안 - 파싱 상세 포함 테스트"""
+        result = await parser_agent.execute(
+            context,
+            {
+                "action": "suggest_normalization",
+                "filename": "WSOP 2023 Event 1.mp4",
+                "include_parsed": True,
+            },
+        )
+
+        assert result.success is True
+        assert result.data["normalized"].endswith(".mp4")
+        assert result.data["parsed"]["project"] == "WSOP"
 
     @pytest.mark.asyncio
     async def test_parse_with_date(self, parser_agent, context):
@@ -252,3 +296,88 @@ class TestParserPatterns:
         assert result.success is True
         # stage가 감지되어야 함
         assert result.data["stage"] is not None
+
+    @pytest.mark.parametrize(
+        "filename,expected_raw",
+        [
+            ("wSoP 2021 Final Table.mp4", "wSoP 2021 F"),
+            ("İ WSOP 2023 Main Event.mp4", "WSOP 2023 M"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_case_insensitive_match_keeps_original(
+        self, agent, filename, expected_raw
+    ):
+        """대소문자 무시 매칭 시 원본 문자열 보존 테스트"""
+        ctx = AgentContext(task_id="test-case")
+        result = await agent.execute(
+            ctx,
+            {"action": "parse_filename", "filename": filename},
+        )
+
+        assert result.success is True
+        assert result.data["project"] == "WSOP"
+        assert result.data["raw_match"] == expected_raw
+
+    @pytest.mark.parametrize(
+        "filename,expected_date,expected_year",
+        [
+            ("DAY 32022_01_03 Bubble.mp4", "2022-01-03", 2022),
+            ("Final Table_GG Pokerday22022_01_03.mp4", "2022-01-03", 2022),
+            ("01-02-2023-04-05.mp4", "2023-04-05", 2023),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_date_next_to_stage_token(
+        self, agent, filename, expected_date, expected_year
+    ):
+        """스테이지 토큰과 붙어 있는 날짜 추출 테스트"""
+        ctx = AgentContext(task_id="test-date")
+        result = await agent.execute(
+            ctx,
+            {"action": "parse_filename", "filename": filename},
+        )
+
+        assert result.success is True
+        assert result.data["date"] == expected_date
+        assert result.data["year"] == expected_year
+
+    @pytest.mark.parametrize(
+        "filename,expected_stage",
+        [
+            ("WSOP 2023 Day 1 Day 2.mp4", "Day 1"),
+            ("WSOP 2023 Day 1 2023-05-15 - Day 2 recap.mp4", "Day 1"),
+            ("WPT 2022 Final Table Heads Up.mp4", "Final Table"),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_first_stage_token_wins(self, agent, filename, expected_stage):
+        """스테이지 토큰이 여러 개일 때 첫 토큰 선택 테스트"""
+        ctx = AgentContext(task_id="test-stage-order")
+        result = await agent.execute(
+            ctx,
+            {"action": "parse_filename", "filename": filename},
+        )
+
+        assert result.success is True
+        assert result.data["stage"] == expected_stage
+
+    @pytest.mark.parametrize(
+        "filename,expected_confidence",
+        [
+            ("2023 EPT Ep5 Day 2.mp4", 0.6),
+            ("WSOP 2023 Event #5 Main Event Day 2 Part 1 2023-07-15.mp4", 0.9),
+            ("random_clip.mp4", 0.0),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_confidence_exact(self, agent, filename, expected_confidence):
+        """신뢰도 합계 정확값 테스트 (가산 순서에 따른 부동소수점 오차 없음)"""
+        ctx = AgentContext(task_id="test-confidence")
+        result = await agent.execute(
+            ctx,
+            {"action": "parse_filename", "filename": filename},
+        )
+
+        assert result.success is True
+        assert result.data["confidence"] == expected_confidence
@@ -0,0 +1,605 @@
+"""
+QueryAgent 테스트
+
+SQLite 임시 DB를 사용해 검색/집계 기능을 테스트합니다.
+"""
+
+import asyncio
+import sqlite3
+
+import pytest
+from src.agents.core.agent_context import AgentContext
+from src.agents.blocks.query import QueryAgent
+from src.agents.blocks.query.query_agent import (
+    QueryBuilder,
+    QueryFilter,
+    _sanitize_identifier,
+)
+from src.agents.blocks.storage import StorageAgent
+
+
+SAMPLE_ROWS = [
+    ("WSOP_2023_Main_Event_Day1.mp4", "Main Event Day 1", "WSOP main event", "WSOP", 2023),
+    ("WSOP_2023_Main_Event_Day2.mp4", "Main Event Day 2", "WSOP main event", "WSOP", 2023),
+    ("WSOP_2022_High_Roller.mp4", "High Roller", "WSOP high roller", "WSOP", 2022),
+    ("WPT_2022_Legends_Ep5.mp4", "Legends of Poker", "WPT legends", "WPT", 2022),
+    ("EPT_2021_Barcelona.mp4", "Barcelona Main", "EPT barcelona", "EPT", 2021),
+]
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """샘플 video_files 테이블을 가진 SQLite DB"""
+    path = tmp_path / "query.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE video_files ("
+        "id INTEGER PRIMARY KEY, filename TEXT NOT NULL, title TEXT, "
+        "description TEXT, project TEXT, year INTEGER)"
+    )
+    conn.executemany(
+        "INSERT INTO video_files (filename, title, description, project, year) "
+        "VALUES (?, ?, ?, ?, ?)",
+        SAMPLE_ROWS,
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def query_agent(db_path):
+    """QueryAgent 픽스처"""
+    agent = QueryAgent(config={"db_path": db_path})
+    yield agent
+    agent.close()
+
+
+@pytest.fixture
+def context():
+    """AgentContext 픽스처"""
+    return AgentContext(task_id="test-query-001")
+
+
+class TestQueryAgent:
+    """QueryAgent 테스트"""
+
+    def test_get_capabilities(self, query_agent):
+        """능력 목록 테스트"""
+        caps = query_agent.get_capabilities()
+
+        assert "search" in caps
+        assert "faceted_search" in caps
+        assert "count" in caps
+
+    @pytest.mark.asyncio
+    async def test_search_with_filter(self, query_agent, context):
+        """필터 검색 테스트"""
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "search",
+                "table": "video_files",
+                "filters": [{"field": "project", "operator": "eq", "value": "WSOP"}],
+                "order_by": [{"field": "id"}],
+            },
+        )
+
+        assert result.success is True
+        assert result.data["total"] == 3
+        assert [item["year"] for item in result.data["items"]] == [2023, 2023, 2022]
+
+    @pytest.mark.asyncio
+    async def test_search_pagination(self, query_agent, context):
+        """페이지네이션 테스트"""
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "search",
+                "table": "video_files",
+                "order_by": [{"field": "id"}],
+                "page": 2,
+                "page_size": 2,
+            },
+        )
+
+        assert result.success is True
+        assert result.data["total"] == 5
+        assert result.data["total_pages"] == 3
+        assert [item["id"] for item in result.data["items"]] == [3, 4]
+        assert "_total" not in result.data["items"][0]
+
+    @pytest.mark.parametrize(
+        "page,expected_ids,has_more",
+        [(2, [3, 4], True), (3, [5], False)],
+    )
+    @pytest.mark.asyncio
+    async def test_search_without_total(
+        self, query_agent, context, page, expected_ids, has_more
+    ):
+        """include_total=False (has_more만 계산) 테스트"""
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "search",
+                "table": "video_files",
+                "order_by": [{"field": "id"}],
+                "page": page,
+                "page_size": 2,
+                "include_total": False,
+            },
+        )
+
+        assert result.success is True
+        assert [item["id"] for item in result.data["items"]] == expected_ids
+        assert result.data["total"] is None
+        assert result.data["has_more"] is has_more
+        assert "total_pages" not in result.data
+
+    @pytest.mark.asyncio
+    async def test_search_batch(self, query_agent, context):
+        """배치 검색 (형태별 그룹 실행, 입력 순서 유지) 테스트"""
+        queries = [
+            {
+                "table": "video_files",
+                "filters": [{"field": "project", "operator": "eq", "value": project}],
+            }
+            for project in ("WSOP", "WPT", "EPT")
+        ]
+        queries.insert(1, {"table": "video_files", "page_size": 1})
+
+        result = await query_agent.execute(
+            context, {"action": "search_batch", "queries": queries}
+        )
+
+        assert result.success is True
+        assert [r["total"] for r in result.data["results"]] == [3, 5, 1, 1]
+        assert result.data["results"][2]["items"][0]["project"] == "WPT"
+        assert result.metrics["shapes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stream_rows(self, db_path):
+        """결과 스트리밍 (fetchmany 배치) 테스트"""
+        agent = QueryAgent(config={"db_path": db_path, "stream_batch_size": 2})
+        try:
+            rows = [
+                row
+                async for row in agent.stream_rows(
+                    {
+                        "table": "video_files",
+                        "columns": ["id", "project"],
+                        "filters": [{"field": "year", "operator": "gte", "value": 2022}],
+                        "order_by": [{"field": "id", "order": "desc"}],
+                    }
+                )
+            ]
+        finally:
+            agent.close()
+
+        assert rows == [
+            {"id": 4, "project": "WPT"},
+            {"id": 3, "project": "WSOP"},
+            {"id": 2, "project": "WSOP"},
+            {"id": 1, "project": "WSOP"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_search_soa_layout(self, query_agent, context):
+        """컬럼 지향(soa) 결과 레이아웃 테스트"""
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "search",
+                "table": "video_files",
+                "columns": ["id", "project"],
+                "order_by": [{"field": "id"}],
+                "page_size": 2,
+                "layout": "soa",
+            },
+        )
+
+        assert result.success is True
+        assert result.data["items"] == {
+            "columns": ["id", "project"],
+            "rows": [(1, "WSOP"), (2, "WSOP")],
+        }
+        assert result.data["total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_search_page_past_end(self, query_agent, context):
+        """마지막 페이지 이후 요청 시 총 개수 유지 테스트"""
+        result = await query_agent.execute(
+            context,
+            {"action": "search", "table": "video_files", "page": 4, "page_size": 2},
+        )
+
+        assert result.success is True
+        assert result.data["items"] == []
+        assert result.data["total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_search_filtered_total(self, query_agent, context):
+        """필터 검색의 꽉 찬 페이지/마지막 페이지 이후 총 개수 테스트 (별도 COUNT)"""
+        filters = [{"field": "year", "operator": "gte", "value": 2022}]
+        full = await query_agent.execute(
+            context,
+            {"action": "search", "filters": filters, "page": 2, "page_size": 2},
+        )
+        past_end = await query_agent.execute(
+            context,
+            {"action": "search", "filters": filters, "page": 5, "page_size": 2},
+        )
+
+        assert full.data["total"] == 4
+        assert len(full.data["items"]) == 2
+        assert past_end.data["items"] == []
+        assert past_end.data["total"] == 4
+
+    @pytest.mark.asyncio
+    async def test_full_text_search(self, query_agent, context):
+        """전문 검색 테스트"""
+        result = await query_agent.execute(
+            context,
+            {"action": "full_text_search", "table": "video_files", "query": "Barcelona"},
+        )
+
+        assert result.success is True
+        assert result.data["total"] == 1
+        assert result.data["items"][0]["project"] == "EPT"
+
+    @pytest.mark.asyncio
+    async def test_faceted_search(self, query_agent, context):
+        """패싯 검색 테스트"""
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "faceted_search",
+                "table": "video_files",
+                "facets": ["project", "year"],
+            },
+        )
+
+        assert result.success is True
+        assert result.data["total"] == 5
+        assert result.data["facets"]["project"][0] == {"value": "WSOP", "count": 3}
+        assert {f["value"] for f in result.data["facets"]["year"]} == {2021, 2022, 2023}
+        year_counts = [f["count"] for f in result.data["facets"]["year"]]
+        assert year_counts == sorted(year_counts, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_count(self, query_agent, context):
+        """레코드 수 조회 테스트"""
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "count",
+                "table": "video_files",
+                "filters": [{"field": "year", "operator": "gte", "value": 2022}],
+            },
+        )
+
+        assert result.success is True
+        assert result.data["count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_count_unfiltered_tracks_changes(self, query_agent, db_path, context):
+        """필터 없는 COUNT 캐시가 외부 변경을 반영하는지 테스트"""
+        request = {"action": "count", "table": "video_files"}
+        first = await query_agent.execute(context, request)
+        repeated = await query_agent.execute(context, request)
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("DELETE FROM video_files WHERE project = 'WPT'")
+        conn.commit()
+        conn.close()
+
+        after_delete = await query_agent.execute(context, request)
+
+        assert first.data["count"] == repeated.data["count"] == 5
+        assert after_delete.data["count"] == 4
+
+    @pytest.mark.asyncio
+    async def test_aggregate(self, query_agent, context):
+        """집계 테스트"""
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "aggregate",
+                "table": "video_files",
+                "aggregations": [{"function": "COUNT", "field": "*", "alias": "cnt"}],
+                "group_by": ["project"],
+            },
+        )
+
+        assert result.success is True
+        counts = {row["project"]: row["cnt"] for row in result.data["results"]}
+        assert counts == {"WSOP": 3, "WPT": 1, "EPT": 1}
+
+    @pytest.mark.parametrize(
+        "request_extra",
+        [
+            {"columns": ["id", "filename; DROP TABLE video_files"]},
+            {"filters": [{"field": "missing", "value": 1}]},
+            {"order_by": [{"field": "missing"}]},
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_search_unknown_column(self, query_agent, context, request_extra):
+        """허용 목록에 없는 컬럼 거부 테스트"""
+        result = await query_agent.execute(
+            context,
+            {"action": "search", "table": "video_files", **request_extra},
+        )
+
+        assert result.success is False
+        assert "Unknown column" in result.errors[0]
+
+    @pytest.mark.asyncio
+    async def test_unsearchable_table(self, query_agent, context):
+        """검색 불가 테이블 에러 테스트"""
+        result = await query_agent.execute(
+            context,
+            {"action": "search", "table": "sqlite_master"},
+        )
+
+        assert result.success is False
+
+    @pytest.mark.asyncio
+    async def test_full_text_search_fts_index(self, query_agent, db_path, context):
+        """FTS5 인덱스 전문 검색 및 트리거 동기화 테스트"""
+        storage = StorageAgent(config={"db_path": db_path})
+        created = await storage.execute(
+            context, {"action": "create_fts_index", "table": "video_files"}
+        )
+        assert created.success is True
+        assert created.data["fts_table"] == "video_files_fts"
+
+        result = await query_agent.execute(
+            context,
+            {"action": "full_text_search", "table": "video_files", "query": "legend"},
+        )
+        assert result.success is True
+        assert result.data["total"] == 1
+        assert result.data["items"][0]["project"] == "WPT"
+
+        # 인덱스 생성 이후 저장된 레코드도 트리거로 색인됨
+        await storage.execute(
+            context,
+            {
+                "action": "save_record",
+                "table": "video_files",
+                "data": {"filename": "APT_2023_Legends.mp4", "project": "APT"},
+            },
+        )
+        storage.close()
+        result = await query_agent.execute(
+            context,
+            {"action": "full_text_search", "table": "video_files", "query": 'legends "'},
+        )
+        assert result.success is True
+        assert result.data["total"] == 2
+
+    @pytest.mark.parametrize("with_fts_index", [False, True])
+    @pytest.mark.asyncio
+    async def test_full_text_search_blank_query(
+        self, query_agent, db_path, context, with_fts_index
+    ):
+        """공백뿐인 전문 검색 쿼리 검증 에러 테스트"""
+        if with_fts_index:
+            storage = StorageAgent(config={"db_path": db_path})
+            await storage.execute(
+                context, {"action": "create_fts_index", "table": "video_files"}
+            )
+            storage.close()
+
+        result = await query_agent.execute(
+            context,
+            {"action": "full_text_search", "table": "video_files", "query": "   "},
+        )
+
+        assert result.success is False
+        assert result.error_type == "ValidationError"
+
+    @pytest.mark.parametrize("with_fts_index", [False, True])
+    @pytest.mark.asyncio
+    async def test_full_text_search_with_filters(
+        self, query_agent, db_path, context, with_fts_index
+    ):
+        """전문 검색 + 추가 필터 테스트 (FTS CTE / LIKE 경로)"""
+        if with_fts_index:
+            storage = StorageAgent(config={"db_path": db_path})
+            await storage.execute(
+                context, {"action": "create_fts_index", "table": "video_files"}
+            )
+            storage.close()
+
+        result = await query_agent.execute(
+            context,
+            {
+                "action": "full_text_search",
+                "table": "video_files",
+                "query": "main",
+                "filters": [{"field": "year", "operator": "eq", "value": 2023}],
+                "page_size": 1,
+            },
+        )
+
+        assert result.success is True
+        assert result.data["total"] == 2
+        assert len(result.data["items"]) == 1
+        assert result.data["items"][0]["year"] == 2023
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches(self, query_agent, context):
+        """동시 검색 (스레드 풀 실행) 테스트"""
+        results = await asyncio.gather(
+            *[
+                query_agent.execute(
+                    context,
+                    {
+                        "action": "count",
+                        "table": "video_files",
+                        "filters": [{"field": "year", "operator": "eq", "value": year}],
+                    },
+                )
+                for year in (2021, 2022, 2023) * 4
+            ]
+        )
+
+        assert all(r.success for r in results)
+        assert [r.data["count"] for r in results[:3]] == [1, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_apsw_hot_path(self, db_path, context):
+        """APSW 영속 statement 경로 테스트"""
+        pytest.importorskip("apsw")
+        agent = QueryAgent(config={"db_path": db_path, "use_apsw": True})
+        try:
+            search = await agent.execute(
+                context,
+                {
+                    "action": "search",
+                    "table": "video_files",
+                    "filters": [{"field": "project", "operator": "eq", "value": "WSOP"}],
+                    "page": 3,
+                    "page_size": 2,
+                },
+            )
+            count = await agent.execute(
+                context,
+                {"action": "count", "table": "video_files"},
+            )
+        finally:
+            agent.close()
+
+        assert search.success is True
+        assert search.data["items"] == []
+        assert search.data["total"] == 3
+        assert count.data["count"] == 5
+
+    @pytest.mark.asyncio
+    async def test_result_cache(self, db_path, context):
+        """결과 캐시 적중 및 data_version 기반 무효화 테스트"""
+        agent = QueryAgent(config={"db_path": db_path, "result_cache_ttl": 60})
+        request = {"action": "count", "table": "video_files"}
+        try:
+            first = await agent.execute(context, request)
+            cached = await agent.execute(context, dict(request))
+
+            conn = sqlite3.connect(db_path)
+            conn.execute("INSERT INTO video_files (filename) VALUES ('new.mp4')")
+            conn.commit()
+            conn.close()
+
+            fresh = await agent.execute(context, request)
+        finally:
+            agent.close()
+
+        # 적중 시 저장된 결과 객체를 복사 없이 반환
+        assert cached.data is first.data
+        assert cached.data["count"] == 5
+        assert cached.metrics["cache_hit"] is True
+        # 다른 연결의 커밋 후에는 invalidate_cache() 없이도 새로 조회
+        assert fresh.data["count"] == 6
+        assert "cache_hit" not in fresh.metrics
+
+    @pytest.mark.asyncio
+    async def test_async_with_releases_connections(self, db_path, context):
+        """async with 종료 시 영속 연결 해제 테스트"""
+        async with QueryAgent(config={"db_path": db_path}) as agent:
+            result = await agent.execute(
+                context, {"action": "count", "table": "video_files"}
+            )
+            conn = agent._connections[0]
+
+        assert result.success is True
+        assert agent._connections == []
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+    def test_connection_reused(self, query_agent):
+        """영속 연결 재사용 테스트"""
+        with query_agent._get_connection() as first:
+            pass
+        with query_agent._get_connection() as second:
+            pass
+
+        assert first is second
+
+    def test_connection_pragmas(self, query_agent):
+        """연결 PRAGMA 적용 테스트"""
+        with query_agent._get_connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            busy_timeout = conn.execute("PRAGMA busy_timeout").fetchone()[0]
+            cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+
+        # 읽기 에이전트는 DB 파일의 journal_mode를 바꾸지 않음
+        assert journal_mode == "delete"
+        assert busy_timeout == 5000
+        assert cache_size == -65536
+
+
+class TestQueryBuilder:
+    """QueryBuilder 테스트"""
+
+    def test_build_where_reuse(self):
+        """WHERE 조건/바인딩 값 분리 테스트"""
+        builder = QueryBuilder(
+            table="video_files",
+            columns=["project", "COUNT(*) as cnt"],
+            filters=[
+                QueryFilter(field="year", operator="gte", value=2022),
+                QueryFilter(field="title", operator="like", value="Main"),
+            ],
+            group_by=["project"],
+            having=[QueryFilter(field="cnt", operator="gt", value=1)],
+        )
+
+        built = builder.build()
+
+        assert built.where_clause == "year >= ? AND title LIKE ?"
+        assert built.where_params == [2022, "%Main%"]
+        assert built.params == [2022, "%Main%", 1]
+        assert f"WHERE {built.where_clause} GROUP BY project" in built.sql
+
+    def test_pagination_bound(self):
+        """LIMIT/OFFSET 바인딩 (페이지 간 SQL 텍스트 동일) 테스트"""
+        page1 = QueryBuilder(table="video_files", limit=20, offset=0).build()
+        page9 = QueryBuilder(table="video_files", limit=20, offset=160).build()
+        offset_only = QueryBuilder(table="video_files", offset=3).build()
+
+        assert page1.sql == page9.sql
+        assert page1.sql.endswith("LIMIT ? OFFSET ?")
+        assert page9.params == [20, 160]
+        assert offset_only.sql.endswith("LIMIT -1 OFFSET ?")
+        assert offset_only.params == [3]
+
+        # 총 개수는 SQL에 창 함수를 붙이지 않고 별도 COUNT로 계산
+        with_total = QueryBuilder(
+            table="video_files", limit=20, offset=0, with_total=True
+        ).build()
+        assert with_total.sql == page1.sql
+        assert "OVER" not in with_total.sql
+
+    def test_unknown_operator(self):
+        """알 수 없는 연산자 에러 테스트"""
+        builder = QueryBuilder(
+            table="video_files",
+            filters=[QueryFilter(field="year", operator="regexp", value="20")],
+        )
+
+        with pytest.raises(ValueError, match="Unknown operator"):
+            builder.build()
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("project", "project"),
+            ("year; DROP TABLE x--", "yearDROPTABLEx"),
+            ("event_name", "event_name"),
+            ("연도", "연도"),
+        ],
+    )
+    def test_sanitize_identifier(self, name, expected):
+        """식별자 sanitize 테스트 (isalnum 기준 유지)"""
+        assert _sanitize_identifier(name) == expected
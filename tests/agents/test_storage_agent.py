@@ -0,0 +1,629 @@
+"""
+StorageAgent 테스트
+
+SQLite 임시 DB를 사용해 CRUD 기능을 테스트합니다.
+"""
+
+import asyncio
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+from src.agents.core.agent_context import AgentContext
+from src.agents.blocks.storage import StorageAgent
+from src.agents.blocks.storage import storage_agent as storage_module
+from src.agents.blocks.storage.storage_agent import _sanitize_identifier
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """빈 video_files 테이블을 가진 SQLite DB"""
+    path = tmp_path / "storage.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE video_files ("
+        "id INTEGER PRIMARY KEY, filename TEXT NOT NULL UNIQUE, title TEXT, "
+        "description TEXT, project TEXT, year INTEGER)"
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def storage_agent(db_path):
+    """StorageAgent 픽스처"""
+    agent = StorageAgent(config={"db_path": db_path})
+    yield agent
+    agent.close()
+
+
+@pytest.fixture
+def context():
+    """AgentContext 픽스처"""
+    return AgentContext(task_id="test-storage-001")
+
+
+def _records(count, project="WSOP"):
+    return [
+        {"filename": f"file_{i}.mp4", "project": project, "year": 2000 + i}
+        for i in range(count)
+    ]
+
+
+class TestStorageAgent:
+    """StorageAgent 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_save_and_query(self, storage_agent, context):
+        """저장 후 조회 테스트"""
+        saved = await storage_agent.execute(
+            context,
+            {
+                "action": "save_record",
+                "table": "video_files",
+                "data": {"filename": "a.mp4", "project": "WSOP", "year": 2023},
+            },
+        )
+        assert saved.success is True
+        assert saved.data["last_insert_id"] == 1
+
+        result = await storage_agent.execute(
+            context,
+            {"action": "query_records", "table": "video_files", "where": {"project": "WSOP"}},
+        )
+
+        assert result.success is True
+        assert result.data["rows"][0]["filename"] == "a.mp4"
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert(self, storage_agent, context, db_path):
+        """대량 upsert 테스트 (충돌 시 업데이트)"""
+        result = await storage_agent.execute(
+            context,
+            {"action": "bulk_upsert", "table": "video_files", "records": _records(50)},
+        )
+        assert result.success is True
+        assert result.data["affected_rows"] == 50
+
+        result = await storage_agent.execute(
+            context,
+            {
+                "action": "bulk_upsert",
+                "table": "video_files",
+                "records": _records(10, project="WPT"),
+                "conflict_columns": ["filename"],
+            },
+        )
+        assert result.success is True
+        assert result.data["affected_rows"] == 10
+
+        conn = sqlite3.connect(db_path)
+        counts = dict(
+            conn.execute(
+                "SELECT project, COUNT(*) FROM video_files GROUP BY project"
+            ).fetchall()
+        )
+        conn.close()
+        assert counts == {"WPT": 10, "WSOP": 40}
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_rolls_back_on_error(self, storage_agent, context, db_path):
+        """배치 중 오류 시 전체 롤백 테스트"""
+        records = _records(5) + [{"filename": None, "project": "WSOP", "year": 1}]
+
+        result = await storage_agent.execute(
+            context,
+            {"action": "bulk_upsert", "table": "video_files", "records": records},
+        )
+
+        assert result.success is False
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM video_files").fetchone()[0] == 0
+        conn.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_pragmas(self, storage_agent, context, db_path):
+        """WAL 저널 모드 적용 테스트"""
+        await storage_agent.execute(
+            context,
+            {"action": "save_record", "table": "video_files", "data": {"filename": "a.mp4"}},
+        )
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    @pytest.mark.asyncio
+    async def test_wal_after_db_recreated(self, db_path, context):
+        """같은 경로에 DB를 다시 만들어도 WAL 적용 테스트"""
+        record = {
+            "action": "save_record",
+            "table": "video_files",
+            "data": {"filename": "a.mp4"},
+        }
+        first = StorageAgent(config={"db_path": db_path})
+        await first.execute(context, record)
+        first.close()
+
+        os.remove(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE video_files (id INTEGER PRIMARY KEY, filename TEXT)")
+        conn.commit()
+        conn.close()
+
+        second = StorageAgent(config={"db_path": db_path})
+        await second.execute(context, record)
+        second.close()
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+    @pytest.mark.asyncio
+    async def test_connection_reused(self, storage_agent, context):
+        """영속 연결 재사용 테스트"""
+        await storage_agent.execute(
+            context,
+            {"action": "save_record", "table": "video_files", "data": {"filename": "a.mp4"}},
+        )
+        conn = storage_agent._connection
+
+        await storage_agent.execute(
+            context, {"action": "query_records", "table": "video_files"}
+        )
+
+        assert storage_agent._connection is conn
+        assert conn.in_transaction is False
+        assert conn.isolation_level is None
+        assert storage_agent._ro_pool.qsize() == 1
+
+        storage_agent.close()
+        assert storage_agent._connection is None
+        assert storage_agent._ro_pool.empty()
+
+    @pytest.mark.asyncio
+    async def test_read_connection_is_readonly(self, storage_agent, context):
+        """읽기 전용 연결 쓰기 거부 테스트"""
+        await storage_agent.execute(
+            context, {"action": "get_schema", "table": "video_files"}
+        )
+
+        with storage_agent._get_ro_connection() as conn:
+            with pytest.raises(sqlite3.OperationalError, match="readonly"):
+                conn.execute("INSERT INTO video_files (filename) VALUES ('x.mp4')")
+
+    @pytest.mark.asyncio
+    async def test_sql_cache(self, storage_agent, context):
+        """같은 컬럼 구성의 SQL 재사용 테스트"""
+        for i in range(3):
+            result = await storage_agent.execute(
+                context,
+                {
+                    "action": "save_record",
+                    "table": "video_files",
+                    "data": {"filename": f"{i}.mp4", "year": 2020 + i},
+                },
+            )
+            assert result.success is True
+
+        for offset in (0, 1, 2):
+            result = await storage_agent.execute(
+                context,
+                {
+                    "action": "query_records",
+                    "table": "video_files",
+                    "order_by": "year",
+                    "limit": 1,
+                    "offset": offset,
+                },
+            )
+            assert result.data["rows"][0]["year"] == 2020 + offset
+
+        assert len(storage_agent._sql_cache) == 2
+
+        # 토큰 추정은 SQL 생성 시 한 번 계산해 캐시 (마지막 실행은 query_records)
+        sql, tokens = list(storage_agent._sql_cache.values())[-1]
+        assert tokens == storage_agent._estimate_tokens(sql)
+        assert storage_agent.tokens_used == tokens
+
+    @pytest.mark.parametrize(
+        "records",
+        [
+            [{"filename": "a.mp4"}, {"filename": "b.mp4"}],
+            [{"filename": "a.mp4", "year": 1}, {"filename": "b.mp4"}],
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_record_shapes(self, storage_agent, context, db_path, records):
+        """단일 컬럼/누락 키 레코드 upsert 테스트"""
+        result = await storage_agent.execute(
+            context,
+            {"action": "bulk_upsert", "table": "video_files", "records": records},
+        )
+
+        assert result.success is True
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT filename, year FROM video_files ORDER BY id").fetchall()
+        conn.close()
+        assert [r[0] for r in rows] == ["a.mp4", "b.mp4"]
+        assert rows[1][1] is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_multi_row(self, storage_agent, context, db_path):
+        """다중 행 INSERT 청크 + 나머지 행 upsert 테스트"""
+        count = StorageAgent.MULTI_ROW_SIZE * 2 + 7
+        records = _records(count)
+        # 같은 배치 안에서 충돌하는 레코드는 뒤의 값으로 갱신
+        records[-1] = {"filename": "file_0.mp4", "project": "WPT", "year": 1}
+
+        result = await storage_agent.execute(
+            context,
+            {
+                "action": "bulk_upsert",
+                "table": "video_files",
+                "records": records,
+                "conflict_columns": ["filename"],
+            },
+        )
+
+        assert result.success is True
+        assert result.data["affected_rows"] == count
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT COUNT(*) FROM video_files").fetchone()[0] == count - 1
+        assert conn.execute(
+            "SELECT project, year FROM video_files WHERE filename = 'file_0.mp4'"
+        ).fetchone() == ("WPT", 1)
+        conn.close()
+
+    @pytest.mark.asyncio
+    async def test_query_soa_layout(self, storage_agent, context):
+        """columns + rows 레이아웃 조회 테스트"""
+        await storage_agent.execute(
+            context,
+            {"action": "bulk_upsert", "table": "video_files", "records": _records(3)},
+        )
+
+        result = await storage_agent.execute(
+            context,
+            {
+                "action": "execute_sql",
+                "sql": "SELECT filename, year FROM video_files ORDER BY year",
+                "layout": "soa",
+            },
+        )
+
+        assert result.success is True
+        assert result.data["rows"]["columns"] == ["filename", "year"]
+        assert result.data["rows"]["rows"][0] == ("file_0.mp4", 2000)
+        assert result.data["affected_rows"] == 3
+
+    @pytest.mark.asyncio
+    async def test_get_schema(self, storage_agent, context):
+        """스키마 조회 테스트"""
+        result = await storage_agent.execute(
+            context, {"action": "get_schema", "table": "video_files"}
+        )
+
+        assert result.success is True
+        columns = {c["name"]: c for c in result.data["columns"]}
+        assert columns["id"]["primary_key"] is True
+        assert columns["filename"]["nullable"] is False
+
+        result = await storage_agent.execute(context, {"action": "get_schema"})
+        assert result.data["tables"] == ["video_files"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes(self, storage_agent, context, db_path):
+        """동시 쓰기 요청의 writer 스레드 직렬화 테스트"""
+        results = await asyncio.gather(
+            *(
+                storage_agent.execute(
+                    context,
+                    {
+                        "action": "save_record",
+                        "table": "video_files",
+                        "data": {"filename": f"{i}.mp4"},
+                    },
+                )
+                for i in range(20)
+            )
+        )
+
+        assert all(r.success for r in results)
+        assert sorted(r.data["last_insert_id"] for r in results) == list(range(1, 21))
+
+    @pytest.mark.asyncio
+    async def test_coalesced_write_failure_isolated(self, storage_agent, context, db_path):
+        """묶음 트랜잭션 안에서 실패한 쓰기만 되돌리는지 테스트"""
+        filenames = ["a.mp4", "b.mp4", "a.mp4", "c.mp4"]  # 세 번째는 UNIQUE 위반
+        results = await asyncio.gather(
+            *(
+                storage_agent.execute(
+                    context,
+                    {
+                        "action": "save_record",
+                        "table": "video_files",
+                        "data": {"filename": name},
+                    },
+                )
+                for name in filenames
+            )
+        )
+
+        assert [r.success for r in results] == [True, True, False, True]
+        assert storage_agent._drain_scheduled is False
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT filename FROM video_files ORDER BY id").fetchall()
+        conn.close()
+        assert [r[0] for r in rows] == ["a.mp4", "b.mp4", "c.mp4"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_return_ids(self, storage_agent, context, db_path):
+        """대량 upsert RETURNING id 수집 테스트"""
+        count = StorageAgent.MULTI_ROW_SIZE + 3
+
+        result = await storage_agent.execute(
+            context,
+            {
+                "action": "bulk_upsert",
+                "table": "video_files",
+                "records": _records(count),
+                "conflict_columns": ["filename"],
+                "return_ids": True,
+            },
+        )
+
+        assert result.success is True
+        assert result.data["affected_rows"] == count
+        conn = sqlite3.connect(db_path)
+        expected = [r[0] for r in conn.execute("SELECT id FROM video_files ORDER BY id")]
+        conn.close()
+        assert sorted(result.data["ids"]) == expected
+
+    @pytest.mark.parametrize("parse_decltypes", [False, True])
+    @pytest.mark.asyncio
+    async def test_parse_decltypes(self, db_path, context, parse_decltypes):
+        """선언 타입 변환 옵션 테스트"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE sync_history (id INTEGER PRIMARY KEY, synced_at TIMESTAMP)")
+        conn.execute("INSERT INTO sync_history (synced_at) VALUES ('2023-07-15 12:00:00')")
+        conn.commit()
+        conn.close()
+        agent = StorageAgent(config={"db_path": db_path, "parse_decltypes": parse_decltypes})
+
+        result = await agent.execute(
+            context, {"action": "query_records", "table": "sync_history"}
+        )
+        agent.close()
+
+        synced_at = result.data["rows"][0]["synced_at"]
+        if parse_decltypes:
+            assert synced_at == datetime(2023, 7, 15, 12, 0)
+        else:
+            assert synced_at == "2023-07-15 12:00:00"
+
+    @pytest.mark.parametrize("use_orjson", [False, True])
+    @pytest.mark.asyncio
+    async def test_json_columns(self, db_path, context, monkeypatch, use_orjson):
+        """중첩 값 JSON 직렬화/역직렬화 테스트"""
+        if use_orjson:
+            pytest.importorskip("orjson")
+        monkeypatch.setattr(storage_module, "ORJSON_AVAILABLE", use_orjson)
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE video_metadata (id INTEGER PRIMARY KEY, event_name TEXT, extra JSON)"
+        )
+        conn.commit()
+        conn.close()
+        agent = StorageAgent(config={"db_path": db_path})
+
+        saved = await agent.execute(
+            context,
+            {
+                "action": "save_record",
+                "table": "video_metadata",
+                "data": {"event_name": "Main", "extra": {"players": ["A", "비"]}},
+            },
+        )
+        bulk = await agent.execute(
+            context,
+            {
+                "action": "bulk_upsert",
+                "table": "video_metadata",
+                "records": [{"event_name": "Day 2", "extra": [1, 2]}],
+            },
+        )
+        # 첫 레코드 값이 None이어도 이후 레코드의 dict는 직렬화
+        mixed = await agent.execute(
+            context,
+            {
+                "action": "bulk_upsert",
+                "table": "video_metadata",
+                "records": [
+                    {"event_name": "Day 3", "extra": None},
+                    {"event_name": "Day 4", "extra": {"level": 5}},
+                ],
+            },
+        )
+        result = await agent.execute(
+            context,
+            {"action": "query_records", "table": "video_metadata", "order_by": "id"},
+        )
+        agent.close()
+
+        assert saved.success is True and bulk.success is True
+        assert mixed.success is True
+        assert [r["extra"] for r in result.data["rows"]] == [
+            {"players": ["A", "비"]},
+            [1, 2],
+            None,
+            {"level": 5},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_repeated_bulk_upsert_reuses_preamble(
+        self, storage_agent, context, db_path, caplog
+    ):
+        """같은 형태의 반복 upsert에서 검증/SQL 생성 생략 테스트"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE custom_items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+        conn.commit()
+        conn.close()
+
+        for i in range(3):
+            result = await storage_agent.execute(
+                context,
+                {
+                    "action": "bulk_upsert",
+                    "table": "custom_items",
+                    "records": [{"name": f"item_{i}"}],
+                    "conflict_columns": ["name"],
+                },
+            )
+            assert result.success is True
+
+        warnings = [r for r in caplog.records if "non-standard table" in r.getMessage()]
+        assert len(warnings) == 1
+        assert len(storage_agent._sql_cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_apsw_read_path(self, db_path, context):
+        """APSW 읽기 경로 테스트"""
+        pytest.importorskip("apsw")
+        agent = StorageAgent(config={"db_path": db_path, "use_apsw": True})
+        try:
+            await agent.execute(
+                context,
+                {"action": "bulk_upsert", "table": "video_files", "records": _records(3)},
+            )
+            result = await agent.execute(
+                context,
+                {"action": "query_records", "table": "video_files", "order_by": "year"},
+            )
+            empty = await agent.execute(
+                context,
+                {"action": "query_records", "table": "video_files", "where": {"year": 0}},
+            )
+            schema = await agent.execute(
+                context, {"action": "get_schema", "table": "video_files"}
+            )
+        finally:
+            agent.close()
+
+        assert [r["filename"] for r in result.data["rows"]] == [
+            "file_0.mp4",
+            "file_1.mp4",
+            "file_2.mp4",
+        ]
+        assert empty.data["rows"] == []
+        assert schema.data["columns"][0]["name"] == "id"
+
+    @pytest.mark.asyncio
+    async def test_get_schema_fresh_db(self, tmp_path, context):
+        """DB 파일이 없을 때 빈 스키마 반환 테스트"""
+        db_path = tmp_path / "fresh.db"
+        agent = StorageAgent(config={"db_path": str(db_path)})
+        try:
+            result = await agent.execute(context, {"action": "get_schema"})
+        finally:
+            agent.close()
+
+        assert result.success is True
+        assert result.data["tables"] == []
+        assert db_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_create_indexes(self, storage_agent, context, db_path):
+        """보조 인덱스 생성 테스트"""
+        created = await storage_agent.execute(
+            context, {"action": "create_indexes", "table": "video_files"}
+        )
+        again = await storage_agent.execute(context, {"action": "create_indexes"})
+        unknown = await storage_agent.execute(
+            context, {"action": "create_indexes", "table": "projects"}
+        )
+
+        conn = sqlite3.connect(db_path)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(video_files)")}
+        conn.close()
+
+        assert created.data["indexes"] == ["idx_vf_filename"]
+        assert again.success is True
+        assert unknown.success is False
+        assert "idx_vf_filename" in indexes
+
+    def test_capabilities_match_handlers(self, storage_agent):
+        """능력 목록과 액션 핸들러 일치 테스트"""
+        assert set(storage_agent.get_capabilities()) == set(storage_agent._handlers)
+
+    @pytest.mark.asyncio
+    async def test_unknown_action(self, storage_agent, context):
+        """알 수 없는 액션 에러 테스트"""
+        result = await storage_agent.execute(context, {"action": "drop_table"})
+
+        assert result.success is False
+        assert "Unknown action" in result.errors[0]
+
+    @pytest.mark.parametrize(
+        "vfs_config,expected_vfs",
+        [
+            ({"vfs": "unix-none"}, "unix-none"),
+            ({"vfs": "no_such_vfs"}, None),
+            ({"vfs": "iouring", "vfs_extension": "/nonexistent/libsqlite_iouring.so"}, None),
+        ],
+    )
+    @pytest.mark.asyncio
+    async def test_vfs_config(self, db_path, context, vfs_config, expected_vfs):
+        """VFS 설정 및 미지원 시 기본 VFS 대체 테스트"""
+        agent = StorageAgent(config={"db_path": db_path, **vfs_config})
+        try:
+            saved = await agent.execute(
+                context,
+                {"action": "save_record", "table": "video_files", "data": {"filename": "a.mp4"}},
+            )
+            result = await agent.execute(
+                context, {"action": "query_records", "table": "video_files"}
+            )
+        finally:
+            agent.close()
+
+        assert agent._vfs == expected_vfs
+        assert saved.success is True
+        assert result.data["rows"][0]["filename"] == "a.mp4"
+
+    @pytest.mark.asyncio
+    async def test_readonly_mode_discards_writes(self, db_path, context):
+        """readonly 모드 쓰기 트랜잭션 롤백 테스트"""
+        agent = StorageAgent(config={"db_path": db_path, "readonly": True})
+        try:
+            await agent.execute(
+                context,
+                {"action": "save_record", "table": "video_files", "data": {"filename": "a.mp4"}},
+            )
+            result = await agent.execute(
+                context, {"action": "query_records", "table": "video_files"}
+            )
+        finally:
+            agent.close()
+
+        assert result.data["rows"] == []
+
+
+class TestStorageHelpers:
+    """StorageAgent 헬퍼 테스트"""
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            ("video_files", "video_files"),
+            ("files; DROP TABLE x", "filesDROPTABLEx"),
+            ("연도", "연도"),
+            ("a-b.c", "abc"),
+        ],
+    )
+    def test_sanitize_identifier(self, name, expected):
+        """식별자 sanitize 테스트"""
+        assert _sanitize_identifier(name) == expected
+        assert StorageAgent()._sanitize_identifier(name) == expected
@@ -0,0 +1,570 @@
+"""
+SyncAgent 테스트
+
+임시 디렉토리 트리를 사용해 스캔/비교 기능을 테스트합니다.
+"""
+
+import base64
+import json
+import os
+import time
+import zlib
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from src.agents.core.agent_context import AgentContext
+from src.agents.blocks.sync import SyncAgent
+from src.agents.blocks.sync import sync_agent as sync_module
+from src.agents.blocks.sync import file_cache as cache_module
+from src.agents.blocks.sync.file_cache import FileInfoCache, file_digest
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """중첩된 동영상 파일 트리"""
+    (tmp_path / "a" / "b" / "c").mkdir(parents=True)
+    (tmp_path / "top.mp4").write_bytes(b"x" * 10)
+    (tmp_path / "notes.txt").write_bytes(b"skip")
+    (tmp_path / ".mp4").write_bytes(b"hidden")
+    (tmp_path / "a" / "one.MKV").write_bytes(b"x" * 20)
+    (tmp_path / "a" / "b" / "two.mov").write_bytes(b"x" * 30)
+    (tmp_path / "a" / "b" / "c" / "deep.mp4").write_bytes(b"x" * 40)
+    return tmp_path
+
+
+@pytest.fixture
+def sync_agent():
+    """SyncAgent 픽스처"""
+    return SyncAgent()
+
+
+@pytest.fixture
+def context():
+    """AgentContext 픽스처"""
+    return AgentContext(task_id="test-sync-001")
+
+
+class TestSyncAgent:
+    """SyncAgent 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_scan_tree(self, sync_agent, context, tree):
+        """확장자 필터링과 파일 메타데이터 테스트"""
+        result = await sync_agent.execute(
+            context, {"action": "scan_nas", "path": str(tree)}
+        )
+
+        assert result.success
+        files = {f["filename"]: f for f in result.data["files"]}
+        assert set(files) == {"top.mp4", "one.MKV", "two.mov", "deep.mp4"}
+        assert files["two.mov"]["size"] == 30
+        assert files["two.mov"]["path"] == str(tree / "a" / "b" / "two.mov")
+        assert files["top.mp4"]["modified_time"] is not None
+        assert result.metrics["total_size"] == 100
+
+    @pytest.mark.asyncio
+    async def test_scan_max_depth(self, context, tree):
+        """최대 스캔 깊이 제한 테스트"""
+        agent = SyncAgent(config={"max_depth": 1})
+        result = await agent.execute(
+            context, {"action": "scan_nas", "path": str(tree)}
+        )
+
+        assert result.success
+        names = {f["filename"] for f in result.data["files"]}
+        assert names == {"top.mp4", "one.MKV"}
+
+    @pytest.mark.asyncio
+    async def test_scan_parallel_subdirs(self, context, tmp_path):
+        """하위 디렉토리 병렬 스캔 결과 병합"""
+        for i in range(50):
+            sub = tmp_path / f"d{i}" / "inner"
+            sub.mkdir(parents=True)
+            (sub / f"f{i}.mp4").write_bytes(b"x" * i)
+
+        agent = SyncAgent(config={"scan_workers": 4})
+        try:
+            result = await agent.execute(
+                context, {"action": "scan_nas", "path": str(tmp_path)}
+            )
+        finally:
+            agent.close()
+
+        assert result.data["total"] == 50
+        assert result.metrics["total_size"] == sum(range(50))
+        assert agent._scan_pool is None
+
+    @pytest.mark.asyncio
+    async def test_do_scan_yields_chunks(self, tmp_path):
+        """스캔 결과를 청크 단위로 전달"""
+        for i in range(25):
+            sub = tmp_path / f"d{i}"
+            sub.mkdir()
+            (sub / f"f{i}.mp4").write_bytes(b"x")
+
+        agent = SyncAgent()
+        agent.SCAN_CHUNK_SIZE = 10
+        try:
+            chunks = [
+                chunk
+                async for chunk in agent._do_scan(str(tmp_path), frozenset({"mp4"}), "nas")
+            ]
+        finally:
+            agent.close()
+
+        assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+
+    @pytest.mark.asyncio
+    async def test_do_scan_dicts_match_to_dict(self, sync_agent, tree):
+        """as_dicts 결과는 FileInfo.to_dict()와 동일"""
+        extensions = frozenset({"mp4", "mov"})
+        infos = [
+            f
+            async for chunk in sync_agent._do_scan(str(tree), extensions, "nas")
+            for f in chunk
+        ]
+        records = [
+            f
+            async for chunk in sync_agent._do_scan(
+                str(tree), extensions, "nas", as_dicts=True
+            )
+            for f in chunk
+        ]
+        sync_agent.close()
+
+        key = lambda f: f["path"]
+        assert sorted(records, key=key) == sorted(
+            (f.to_dict() for f in infos), key=key
+        )
+
+    @pytest.mark.asyncio
+    async def test_scan_checksum_cache(self, context, tree, tmp_path_factory, monkeypatch):
+        """체크섬 캐시 적중 시 파일을 다시 읽지 않음"""
+        cache_path = str(tmp_path_factory.mktemp("cache") / "sync_cache.sqlite")
+        config = {"compute_checksum": True, "checksum_cache": cache_path}
+        input_data = {"action": "scan_nas", "path": str(tree)}
+
+        agent = SyncAgent(config=config)
+        try:
+            first = await agent.execute(context, input_data)
+        finally:
+            agent.close()
+        checksums = {f["filename"]: f["checksum"] for f in first.data["files"]}
+        assert all(checksums.values())
+        assert checksums["top.mp4"] != checksums["deep.mp4"]
+
+        reads = []
+        monkeypatch.setattr(
+            sync_module, "file_digest", lambda path, algo: reads.append(path) or 0
+        )
+        (tree / "top.mp4").write_bytes(b"y" * 11)
+        agent = SyncAgent(config=config)
+        try:
+            second = await agent.execute(context, input_data)
+        finally:
+            agent.close()
+
+        assert reads == [str(tree / "top.mp4")]
+        again = {f["filename"]: f["checksum"] for f in second.data["files"]}
+        assert again["deep.mp4"] == checksums["deep.mp4"]
+
+    @pytest.mark.asyncio
+    async def test_scan_listing_cache(self, context, tree, tmp_path_factory, monkeypatch):
+        """디렉토리 mtime이 그대로면 scandir 없이 이전 목록 재사용"""
+        past = time.time() - 60
+        for dir_path, _, _ in os.walk(tree):
+            os.utime(dir_path, (past, past))
+        cache_path = str(tmp_path_factory.mktemp("cache") / "sync_cache.sqlite")
+        config = {"cache_listings": True, "checksum_cache": cache_path}
+        input_data = {"action": "scan_nas", "path": str(tree)}
+        key = lambda f: f["path"]
+
+        agent = SyncAgent(config=config)
+        try:
+            first = await agent.execute(context, input_data)
+
+            scanned = []
+            real_scandir = os.scandir
+            monkeypatch.setattr(
+                sync_module.os,
+                "scandir",
+                lambda path: scanned.append(path) or real_scandir(path),
+            )
+            second = await agent.execute(context, input_data)
+            assert scanned == []
+            assert sorted(second.data["files"], key=key) == sorted(
+                first.data["files"], key=key
+            )
+
+            # 파일 추가로 mtime이 바뀐 디렉토리만 다시 scandir
+            (tree / "a" / "new.mp4").write_bytes(b"n")
+            third = await agent.execute(context, input_data)
+        finally:
+            agent.close()
+
+        assert scanned == [str(tree / "a")]
+        assert third.data["total"] == first.data["total"] + 1
+
+    def test_listing_cache_requires_path(self):
+        """checksum_cache 없이 cache_listings는 비활성화"""
+        agent = SyncAgent(config={"cache_listings": True})
+
+        assert agent._cache_listings is False
+
+    @pytest.mark.asyncio
+    async def test_scan_gcs_simulated(self, sync_agent, context, monkeypatch):
+        """google-cloud-storage 미설치 시 경고와 함께 빈 결과"""
+        monkeypatch.setattr(sync_module, "GCS_AVAILABLE", False)
+        result = await sync_agent.execute(
+            context, {"action": "scan_gcs", "bucket": "poker-vod"}
+        )
+
+        assert result.success
+        assert result.data["total"] == 0
+        assert result.has_warnings
+
+    @pytest.mark.asyncio
+    async def test_scan_gcs_shards(self, context, monkeypatch):
+        """접두사 샤드별 list_blobs 결과 병합과 GCS 해시 사용"""
+        crc = zlib.crc32(b"x").to_bytes(4, "big")
+        updated = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        blobs = {
+            "vod/a": [
+                SimpleNamespace(
+                    name="vod/a/one.mp4", size=3, updated=updated,
+                    md5_hash=base64.b64encode(b"\x01\x02").decode(),
+                    crc32c=base64.b64encode(crc).decode(),
+                ),
+                SimpleNamespace(
+                    name="vod/a/cover.jpg", size=1, updated=updated,
+                    md5_hash=None, crc32c=None,
+                ),
+            ],
+            "vod/b": [
+                SimpleNamespace(
+                    name="vod/b/two.mkv", size=4, updated=updated,
+                    md5_hash=None, crc32c=None,
+                ),
+            ],
+        }
+        calls = []
+
+        class FakeClient:
+            def list_blobs(self, bucket, prefix, fields, page_size):
+                calls.append((bucket, prefix, fields))
+                return iter(blobs[prefix])
+
+        monkeypatch.setattr(sync_module, "GCS_AVAILABLE", True)
+        monkeypatch.setattr(
+            sync_module, "gcs_storage", SimpleNamespace(Client=FakeClient), raising=False
+        )
+        agent = SyncAgent(config={"gcs_shard_prefixes": ["a", "b"]})
+        try:
+            result = await agent.execute(
+                context, {"action": "scan_gcs", "bucket": "poker-vod", "prefix": "vod/"}
+            )
+        finally:
+            agent.close()
+
+        assert result.success
+        assert sorted(prefix for _, prefix, _ in calls) == ["vod/a", "vod/b"]
+        assert calls[0][2] == SyncAgent.GCS_LIST_FIELDS
+        files = {f["filename"]: f for f in result.data["files"]}
+        assert set(files) == {"one.mp4", "two.mkv"}
+        assert files["one.mp4"]["path"] == "gs://poker-vod/vod/a/one.mp4"
+        assert files["one.mp4"]["checksum"] is None
+        assert files["one.mp4"]["extra"] == {"md5": "0102", "crc32c": crc.hex()}
+        assert result.metrics["total_size"] == 7
+
+    @pytest.mark.asyncio
+    async def test_compare_sources(self, sync_agent, context):
+        """소스/타겟 전용, 변경, 동일 파일 분류"""
+        source = [
+            {"path": "/a/only.mp4", "filename": "only.mp4", "size": 1},
+            {"path": "/a/same.mp4", "filename": "same.mp4", "size": 2},
+            {"path": "/a/diff.mp4", "filename": "diff.mp4", "size": 3},
+        ]
+        target = [
+            {"path": "/b/same.mp4", "filename": "same.mp4", "size": 2},
+            {"path": "/b/diff.mp4", "filename": "diff.mp4", "size": 4},
+            {"path": "/b/extra.mp4", "filename": "extra.mp4", "size": 5},
+        ]
+        result = await sync_agent.execute(
+            context,
+            {"action": "compare_sources", "source_files": source, "target_files": target},
+        )
+
+        assert result.success
+        assert [f["filename"] for f in result.data["source_only"]] == ["only.mp4"]
+        assert [f["filename"] for f in result.data["target_only"]] == ["extra.mp4"]
+        assert result.data["modified"][0]["target"]["size"] == 4
+        assert result.data["identical_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_compare_scan_results(self, sync_agent, context, tree):
+        """스캔 결과 딕셔너리를 그대로 비교 입력으로 사용"""
+        scanned = await sync_agent.execute(
+            context, {"action": "scan_nas", "path": str(tree)}
+        )
+        files = scanned.data["files"]
+        result = await sync_agent.execute(
+            context,
+            {"action": "compare_sources", "source_files": files, "target_files": files[1:]},
+        )
+
+        assert result.success
+        assert result.data["source_only"] == [files[0]]
+        assert result.metrics["identical"] == len(files) - 1
+
+    def test_file_info_slots(self):
+        """FileInfo는 __dict__ 없이 extra를 지연 할당"""
+        info = sync_module.FileInfo(path="/a/x.mp4", filename="x.mp4")
+
+        assert not hasattr(info, "__dict__")
+        assert info.extra is None
+        assert info.to_dict()["extra"] == {}
+
+    @pytest.mark.asyncio
+    async def test_generate_sync_plan(self, sync_agent, context):
+        """diff 결과로 복사/업데이트/삭제 계획 생성"""
+        diff = {
+            "source_only": [{"path": "/a/new.mp4"}],
+            "modified": [{"source": {"path": "/a/m.mp4"}, "target": {"path": "/b/m.mp4"}}],
+            "target_only": [{"path": "/b/old.mp4"}, {"path": "/b/old2.mp4"}],
+        }
+        result = await sync_agent.execute(
+            context, {"action": "generate_sync_plan", "diff": diff}
+        )
+
+        assert result.success
+        assert [a["action"] for a in result.data["actions"]] == [
+            "copy", "update", "delete", "delete"
+        ]
+        assert result.data["actions"][1]["target"] == "/b/m.mp4"
+        assert result.data["summary"] == {"to_copy": 1, "to_update": 1, "to_delete": 2}
+
+        kept = await sync_agent.execute(
+            context,
+            {"action": "generate_sync_plan", "diff": diff, "strategy": "newer_wins"},
+        )
+        assert kept.metrics["to_delete"] == 0
+
+    @pytest.mark.asyncio
+    async def test_compare_sources_checksum(self, sync_agent, context):
+        """크기가 같아도 체크섬이 다르면 modified"""
+        source = [
+            {"path": "/a/x.mp4", "filename": "x.mp4", "size": 5, "checksum": "01"},
+            {"path": "/a/y.mp4", "filename": "y.mp4", "size": 5, "checksum": "02"},
+        ]
+        target = [
+            {"path": "/b/x.mp4", "filename": "x.mp4", "size": 5, "checksum": "ff"},
+            {"path": "/b/y.mp4", "filename": "y.mp4", "size": 5, "checksum": "02"},
+        ]
+        result = await sync_agent.execute(
+            context,
+            {"action": "compare_sources", "source_files": source, "target_files": target},
+        )
+
+        assert result.success
+        assert result.metrics["modified"] == 1
+        assert result.metrics["identical"] == 1
+
+    @pytest.mark.asyncio
+    async def test_scan_raw_files_json(self, sync_agent, context, tree, monkeypatch):
+        """raw_files 결과를 orjson으로 직렬화하면 딕셔너리 결과와 동일"""
+        pytest.importorskip("orjson")
+        input_data = {"action": "scan_nas", "path": str(tree)}
+        records = await sync_agent.execute(context, input_data)
+        raw = await sync_agent.execute(context, {**input_data, "raw_files": True})
+
+        assert all(isinstance(f, sync_module.FileInfo) for f in raw.data["files"])
+        assert raw.metrics == records.metrics
+        encoded = json.loads(raw.to_json())["data"]["files"]
+        for f in encoded:
+            assert f.pop("extra") is None
+        expected = [
+            {k: v for k, v in f.items() if k != "extra"} for f in records.data["files"]
+        ]
+        key = lambda f: f["path"]
+        assert sorted(encoded, key=key) == sorted(expected, key=key)
+
+        monkeypatch.setattr(sync_module, "ORJSON_AVAILABLE", False)
+        fallback = await sync_agent.execute(context, {**input_data, "raw_files": True})
+        assert all(isinstance(f, dict) for f in fallback.data["files"])
+
+    @pytest.mark.asyncio
+    async def test_scan_extensions_input(self, sync_agent, context, tree):
+        """입력 확장자 지정 시 기본값 대신 사용 (대소문자/점 무시)"""
+        result = await sync_agent.execute(
+            context, {"action": "scan_nas", "path": str(tree), "extensions": ["MKV", ".mov"]}
+        )
+
+        assert {f["filename"] for f in result.data["files"]} == {"one.MKV", "two.mov"}
+        assert sync_agent._resolve_extensions({}) is sync_agent._extension_keys
+
+    @pytest.mark.asyncio
+    async def test_scan_skip_dirs(self, context, tree):
+        """제외 디렉토리(이름/glob)는 하위로 내려가지 않음"""
+        for name in (".git", "@eaDir", "backup_2020"):
+            (tree / name).mkdir()
+            (tree / name / "hidden.mp4").write_bytes(b"x")
+
+        default = SyncAgent()
+        result = await default.execute(
+            context, {"action": "scan_nas", "path": str(tree)}
+        )
+        default.close()
+        names = {f["path"] for f in result.data["files"]}
+        assert str(tree / "backup_2020" / "hidden.mp4") in names
+        assert str(tree / ".git" / "hidden.mp4") not in names
+
+        agent = SyncAgent(config={"skip_dirs": ["backup_*", "b"]})
+        result = await agent.execute(
+            context, {"action": "scan_nas", "path": str(tree)}
+        )
+        agent.close()
+        names = {f["filename"] for f in result.data["files"]}
+        assert names == {"top.mp4", "one.MKV", "hidden.mp4"}
+        assert len(result.data["files"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_scan_missing_path(self, sync_agent, context, tmp_path):
+        """존재하지 않는 경로는 빈 결과"""
+        result = await sync_agent.execute(
+            context, {"action": "scan_nas", "path": str(tmp_path / "missing")}
+        )
+
+        assert result.success
+        assert result.data["total"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(
+        not sync_module.LIBURING_AVAILABLE, reason="liburing not installed"
+    )
+    async def test_scan_io_uring(self, sync_agent, context, tree):
+        """io_uring 배치 statx 결과가 stat() 경로와 동일"""
+        (tree / "a" / "broken.mp4").symlink_to(tree / "missing.mp4")
+        agent = SyncAgent(config={"use_io_uring": True})
+        try:
+            batched = await agent.execute(
+                context, {"action": "scan_nas", "path": str(tree)}
+            )
+        finally:
+            agent.close()
+        plain = await sync_agent.execute(
+            context, {"action": "scan_nas", "path": str(tree)}
+        )
+
+        assert batched.success
+        key = lambda f: f["path"]
+        assert sorted(batched.data["files"], key=key) == sorted(
+            plain.data["files"], key=key
+        )
+        assert batched.data["total"] == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(
+        not sync_module.LIBURING_AVAILABLE, reason="liburing not installed"
+    )
+    async def test_io_uring_shares_checksum_cache(
+        self, context, tree, tmp_path_factory, monkeypatch
+    ):
+        """io_uring/stat() 스캔이 같은 체크섬 캐시 키를 사용"""
+        cache_path = str(tmp_path_factory.mktemp("cache") / "sync_cache.sqlite")
+        config = {"compute_checksum": True, "checksum_cache": cache_path}
+        input_data = {"action": "scan_nas", "path": str(tree)}
+
+        agent = SyncAgent(config={**config, "use_io_uring": True})
+        try:
+            await agent.execute(context, input_data)
+        finally:
+            agent.close()
+
+        reads = []
+        monkeypatch.setattr(
+            sync_module, "file_digest", lambda path, algo: reads.append(path) or 0
+        )
+        for use_io_uring in (False, True):
+            agent = SyncAgent(config={**config, "use_io_uring": use_io_uring})
+            try:
+                result = await agent.execute(context, input_data)
+            finally:
+                agent.close()
+            assert result.data["total"] == 4
+
+        assert reads == []
+
+    def test_mtime_key_matches_stat(self, tree):
+        """stat() 경로의 캐시 키가 float mtime 기준으로 계산됨"""
+        stat = os.stat(tree / "top.mp4")
+
+        assert sync_module._mtime_key(stat.st_mtime) == round(stat.st_mtime * 1e9)
+        assert abs(sync_module._mtime_key(stat.st_mtime) - stat.st_mtime_ns) < 1000
+
+    def test_io_uring_requires_liburing(self, monkeypatch):
+        """liburing 미설치 시 stat() 경로로 폴백"""
+        monkeypatch.setattr(sync_module, "LIBURING_AVAILABLE", False)
+        agent = SyncAgent(config={"use_io_uring": True})
+
+        assert agent._use_io_uring is False
+
+
+class TestFileInfoCache:
+    """FileInfoCache 테스트"""
+
+    def test_get_put(self, tmp_path):
+        """(path, size, mtime_ns)가 모두 같을 때만 적중"""
+        data = tmp_path / "a.mp4"
+        data.write_bytes(b"payload")
+        digest = file_digest(str(data))
+
+        cache = FileInfoCache(str(tmp_path / "cache.sqlite"))
+        try:
+            cache.put_many([(str(data), 7, 100, digest)])
+            assert cache.get(str(data), 7, 100) == digest
+            assert cache.get(str(data), 7, 101) is None
+            assert cache.get(str(data), 8, 100) is None
+        finally:
+            cache.close()
+
+        other = FileInfoCache(str(tmp_path / "cache.sqlite"), algo="other")
+        try:
+            assert other.get(str(data), 7, 100) is None
+        finally:
+            other.close()
+
+    @pytest.mark.parametrize("algo", ["xxh3", "crc32c", "crc32", "blake2b"])
+    def test_file_digest_algos(self, tmp_path, algo):
+        """알고리즘별 체크섬이 청크 경계와 무관하게 일정"""
+        if not cache_module.hash_algo_available(algo):
+            pytest.skip(f"{algo} not installed")
+        data = tmp_path / "big.mp4"
+        payload = bytes(range(256)) * (cache_module.READ_CHUNK_SIZE // 128 + 3)
+        data.write_bytes(payload)
+
+        digest = file_digest(str(data), algo)
+
+        assert digest == file_digest(str(data), algo)
+        assert -(1 << 63) <= digest < (1 << 63)
+        if algo == "crc32":
+            assert digest == zlib.crc32(payload)
+
+    def test_unknown_hash_algo(self):
+        """지원하지 않는 알고리즘은 거부"""
+        with pytest.raises(ValueError):
+            SyncAgent(config={"hash_algo": "md5"})
+
+    def test_listing(self, tmp_path):
+        """디렉토리 mtime이 같을 때만 목록 반환"""
+        cache = FileInfoCache(str(tmp_path / "cache.sqlite"))
+        try:
+            entries = [("sub", True, None, None), ("a.mp4", False, 3, 100)]
+            cache.put_listing("/root", 10, entries)
+            assert sorted(cache.get_listing("/root", 10)) == sorted(entries)
+            assert cache.get_listing("/root", 11) is None
+
+            cache.put_listing("/root", 11, [("b.mp4", False, None, None)])
+            assert cache.get_listing("/root", 11) == [("b.mp4", False, None, None)]
+        finally:
+            cache.close()
@@ -0,0 +1,396 @@
+"""
+ValidationAgent 테스트
+
+스키마 기반 레코드 검증 기능을 테스트합니다.
+"""
+
+import os
+import sqlite3
+
+import pytest
+from src.agents.core.agent_context import AgentContext
+from src.agents.blocks.validation import ValidationAgent
+from src.agents.blocks.validation import validation_agent as validation_module
+from src.agents.blocks.validation.validation_agent import (
+    ValidationIssue,
+    ValidationReport,
+    ValidationSeverity,
+    stat_paths,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """video_files/projects 테이블을 가진 SQLite DB"""
+    path = tmp_path / "validation.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE video_files ("
+        "id INTEGER PRIMARY KEY, filename TEXT, path TEXT, project TEXT, "
+        "year INTEGER)"
+    )
+    conn.execute("CREATE TABLE projects (name TEXT PRIMARY KEY)")
+    conn.execute("INSERT INTO projects VALUES ('WSOP')")
+    conn.executemany(
+        "INSERT INTO video_files (filename, path, project, year) VALUES (?, ?, ?, ?)",
+        [
+            ("a.mp4", "/nas/a.mp4", "WSOP", 2024),
+            ("a.mp4", "/nas/x/a.mp4", "WSOP", 2024),
+            ("", "/nas/empty", None, 2024),
+            ("c.txt", "/nas/c.txt", "HCL", 1999),
+        ],
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def validation_agent():
+    """ValidationAgent 픽스처"""
+    return ValidationAgent()
+
+
+@pytest.fixture
+def db_agent(db_path):
+    """DB를 사용하는 ValidationAgent 픽스처"""
+    agent = ValidationAgent(config={"db_path": db_path})
+    yield agent
+    agent.close()
+
+
+@pytest.fixture
+def context():
+    """AgentContext 픽스처"""
+    return AgentContext(task_id="test-validation-001")
+
+
+VALID_RECORD = {
+    "filename": "final_table.mp4",
+    "path": "/nas/wsop/final_table.mp4",
+    "year": 2024,
+    "part": 1,
+    "size": 1024,
+}
+
+
+class TestValidationAgent:
+    """ValidationAgent 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_valid_record(self, validation_agent, context):
+        """유효한 레코드 검증 테스트"""
+        result = await validation_agent.execute(
+            context, {"action": "validate_record", "data": VALID_RECORD}
+        )
+
+        assert result.success
+        assert result.data["passed"]
+        assert result.data["issues"] == []
+
+    @pytest.mark.asyncio
+    async def test_missing_required_and_type(self, validation_agent, context):
+        """필수 필드 누락/타입 오류 테스트"""
+        result = await validation_agent.execute(
+            context,
+            {
+                "action": "validate_record",
+                "data": {"project": 2024},
+                "record_id": "r1",
+            },
+        )
+
+        assert not result.data["passed"]
+        codes = [issue["code"] for issue in result.data["issues"]]
+        assert codes == ["MISSING_REQUIRED_FIELD", "TYPE_MISMATCH"]
+        assert result.data["issues"][0]["field"] == "filename"
+        assert result.data["issues"][0]["record_id"] == "r1"
+
+    @pytest.mark.asyncio
+    async def test_constraints_and_pattern(self, validation_agent, context):
+        """제약 조건 오류/패턴 경고 테스트"""
+        data = dict(VALID_RECORD, filename="notes.TXT", year=1999, part=101)
+        result = await validation_agent.execute(
+            context, {"action": "validate_record", "data": data}
+        )
+
+        assert not result.data["passed"]
+        assert result.data["errors"] == 2
+        assert result.data["warnings"] == 1
+        issues = {issue["code"]: issue for issue in result.data["issues"]}
+        assert set(issues) == {"VALUE_TOO_SMALL", "VALUE_TOO_LARGE", "PATTERN_MISMATCH"}
+        assert "minimum 2000" in issues["VALUE_TOO_SMALL"]["message"]
+        assert r"mp4|mkv" in issues["PATTERN_MISMATCH"]["message"]
+
+    @pytest.mark.asyncio
+    async def test_pattern_ignore_case(self, validation_agent, context):
+        """패턴 대소문자 무시 테스트"""
+        data = dict(VALID_RECORD, filename="FINAL.MKV")
+        result = await validation_agent.execute(
+            context, {"action": "validate_record", "data": data}
+        )
+
+        assert result.data["issues"] == []
+
+    def test_compiled_schemas(self):
+        """모듈 로드 시 스키마 컴파일 테스트"""
+        compiled = validation_module.COMPILED_SCHEMAS["video_files"]
+
+        assert compiled.required == ("filename",)
+        assert ("size", 0, None) in compiled.constraints
+        name, pattern = compiled.patterns[0]
+        assert name == "filename"
+        assert pattern.match("clip.M4V")
+
+    @pytest.mark.asyncio
+    async def test_validate_batch(self, validation_agent, context):
+        """배치 검증 테스트 (레코드 ID/이슈 누적)"""
+        records = [
+            VALID_RECORD,
+            {"id": "bad", "filename": "b.avi", "year": 2040},
+            {"project": "WSOP"},
+        ]
+        result = await validation_agent.execute(
+            context, {"action": "validate_batch", "records": records}
+        )
+
+        assert result.success
+        assert result.data["checked_items"] == 3
+        assert result.data["errors"] == 2
+        assert [(i["code"], i["record_id"]) for i in result.data["issues"]] == [
+            ("VALUE_TOO_LARGE", "bad"),
+            ("MISSING_REQUIRED_FIELD", "2"),
+        ]
+        assert result.metrics["total_records"] == 3
+
+    @pytest.mark.asyncio
+    async def test_validator_cached(self, validation_agent, context):
+        """스키마별 검증 클로저 캐시 테스트"""
+        validator = validation_agent._get_validator("projects")
+
+        assert validation_agent._get_validator("projects") is validator
+
+        result = await validation_agent.execute(
+            context,
+            {"action": "validate_batch", "schema": "unknown", "records": [{}]},
+        )
+        assert not result.success
+
+    @pytest.mark.asyncio
+    async def test_check_consistency(self, db_agent, context):
+        """중복/NULL/참조 무결성 체크 테스트"""
+        result = await db_agent.execute(context, {"action": "check_consistency"})
+
+        assert result.success
+        codes = sorted(issue["code"] for issue in result.data["issues"])
+        assert codes == ["DUPLICATE_FILENAME", "INVALID_REFERENCE", "NULL_REQUIRED_FIELD"]
+        assert result.data["checked_items"] == 3
+
+    @pytest.mark.asyncio
+    async def test_generate_report(self, db_agent, context):
+        """스키마/일관성 검증 병합 리포트 테스트"""
+        result = await db_agent.execute(context, {"action": "generate_report"})
+
+        assert result.success
+        report = result.data["report"]
+        codes = sorted(issue["code"] for issue in report["issues"])
+        assert codes == [
+            "DUPLICATE_FILENAME",
+            "INVALID_REFERENCE",
+            "NULL_REQUIRED_FIELD",
+            "PATTERN_MISMATCH",
+            "PATTERN_MISMATCH",
+            "VALUE_TOO_SMALL",
+        ]
+        summary = result.data["summary"]
+        assert not summary["passed"]
+        assert summary["total_checks"] == 4
+        assert summary["total_errors"] == 2
+        assert summary["total_warnings"] == 4
+        assert report["errors"] == summary["total_errors"]
+        # 병합 시 suggestion 등 원본 이슈 필드 유지
+        dup = next(i for i in report["issues"] if i["code"] == "DUPLICATE_FILENAME")
+        assert dup["suggestion"]
+
+    @pytest.mark.asyncio
+    async def test_validate_file(self, validation_agent, context, tmp_path):
+        """파일 존재/종류/크기 검증 테스트"""
+        (tmp_path / "ok.mp4").write_bytes(b"x" * 10)
+        (tmp_path / "empty.mp4").write_bytes(b"")
+        (tmp_path / "dir").mkdir()
+        paths = [
+            str(tmp_path / "ok.mp4"),
+            str(tmp_path / "empty.mp4"),
+            str(tmp_path / "dir"),
+            str(tmp_path / "missing.mp4"),
+            str(tmp_path / "nodir" / "a.mp4"),
+            "",
+        ]
+        result = await validation_agent.execute(
+            context, {"action": "validate_file", "paths": paths}
+        )
+
+        assert result.success
+        issues = {issue["record_id"]: issue["code"] for issue in result.data["issues"]}
+        assert issues == {
+            paths[1]: "EMPTY_FILE",
+            paths[2]: "NOT_A_FILE",
+            paths[3]: "FILE_NOT_FOUND",
+            paths[4]: "FILE_NOT_FOUND",
+        }
+        assert result.metrics["files_checked"] == 6
+        assert result.metrics["missing"] == 3
+
+    def test_stat_paths(self, tmp_path, monkeypatch):
+        """디렉토리 단위 일괄 stat 테스트 (심볼릭 링크/상대 경로 포함)"""
+        (tmp_path / "a.mp4").write_bytes(b"abc")
+        os.symlink(tmp_path / "a.mp4", tmp_path / "link.mp4")
+        os.symlink(tmp_path / "gone.mp4", tmp_path / "dangling.mp4")
+        monkeypatch.chdir(tmp_path)
+
+        statuses = stat_paths(
+            [
+                str(tmp_path / "a.mp4"),
+                str(tmp_path / "link.mp4"),
+                str(tmp_path / "dangling.mp4"),
+                "a.mp4",
+                str(tmp_path) + "/",
+            ]
+        )
+
+        assert statuses[str(tmp_path / "a.mp4")] == (True, 3)
+        assert statuses[str(tmp_path / "link.mp4")] == (True, 3)
+        assert statuses[str(tmp_path / "dangling.mp4")] is None
+        assert statuses["a.mp4"] == (True, 3)
+        assert statuses[str(tmp_path) + "/"] == (False, -1)
+        assert stat_paths(["a.mp4"], with_size=False)["a.mp4"] == (True, -1)
+
+    @pytest.mark.asyncio
+    async def test_check_orphans(self, db_path, db_agent, context, tmp_path):
+        """파일이 사라진 레코드 검색 테스트"""
+        (tmp_path / "nas").mkdir()
+        (tmp_path / "nas" / "a.mp4").write_bytes(b"x")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "UPDATE video_files SET path = ? WHERE id = 1",
+            (str(tmp_path / "nas" / "a.mp4"),),
+        )
+        conn.execute(
+            "UPDATE video_files SET path = ? WHERE id = 2",
+            (str(tmp_path / "nas" / "b.mp4"),),
+        )
+        conn.commit()
+        conn.close()
+
+        result = await db_agent.execute(context, {"action": "check_orphans"})
+
+        assert result.success
+        orphans = sorted(issue["record_id"] for issue in result.data["issues"])
+        assert orphans == ["2", "3", "4"]
+        assert result.metrics["records_checked"] == 4
+
+    @pytest.mark.asyncio
+    async def test_stat_paths_chunked(self, validation_agent, tmp_path, monkeypatch):
+        """경로가 많을 때 청크 단위 스레드 병렬 stat 테스트"""
+        monkeypatch.setattr(ValidationAgent, "STAT_CHUNK_SIZE", 3)
+        paths = []
+        for d in ("x", "y", "z"):
+            (tmp_path / d).mkdir()
+            for i in range(4):
+                (tmp_path / d / f"{i}.mp4").write_bytes(b"x" * i)
+                paths.append(str(tmp_path / d / f"{i}.mp4"))
+        paths.append(str(tmp_path / "x" / "missing.mp4"))
+
+        statuses = await validation_agent._stat_paths(paths)
+
+        assert statuses == stat_paths(paths)
+        assert statuses[str(tmp_path / "y" / "2.mp4")] == (True, 2)
+        assert statuses[paths[-1]] is None
+
+    @pytest.mark.asyncio
+    async def test_check_consistency_without_projects(self, db_path, db_agent, context):
+        """projects 테이블이 없으면 참조 체크만 제외 테스트"""
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE projects")
+        conn.commit()
+        conn.close()
+
+        result = await db_agent.execute(context, {"action": "check_consistency"})
+
+        assert result.success
+        codes = sorted(issue["code"] for issue in result.data["issues"])
+        assert codes == ["DUPLICATE_FILENAME", "NULL_REQUIRED_FIELD"]
+        assert result.data["checked_items"] == 2
+
+        conn = sqlite3.connect(db_path)
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list(video_files)")}
+        conn.close()
+        # 검증 에이전트는 스키마를 변경하지 않음
+        assert "idx_vf_filename" not in indexes
+
+    @pytest.mark.asyncio
+    async def test_check_consistency_subset(self, db_agent, context):
+        """선택한 체크만 실행 테스트"""
+        result = await db_agent.execute(
+            context, {"action": "check_consistency", "checks": ["references"]}
+        )
+
+        assert [issue["code"] for issue in result.data["issues"]] == ["INVALID_REFERENCE"]
+        assert "HCL" in result.data["issues"][0]["message"]
+        assert result.data["issues"][0]["record_id"] == "4"
+        assert result.data["checked_items"] == 1
+
+    @pytest.mark.asyncio
+    async def test_persistent_connection(self, db_agent, context):
+        """영속 연결 재사용/종료 테스트"""
+        await db_agent.execute(context, {"action": "check_consistency"})
+        conn = db_agent._conn
+
+        await db_agent.execute(context, {"action": "generate_report"})
+
+        assert db_agent._conn is conn
+        # 검증 에이전트는 DB 파일의 journal_mode를 바꾸지 않음
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -65536
+        db_agent.close()
+        assert db_agent._conn is None
+
+    def test_report_severity_counts(self):
+        """심각도별 집계 테스트 (INFO는 집계/통과 여부에 영향 없음)"""
+        report = ValidationReport()
+        for severity in ("info", "warning", "error", "warning"):
+            report.add_issue(
+                ValidationIssue(
+                    code="X", message="m", severity=ValidationSeverity(severity)
+                )
+            )
+
+        assert (report.errors, report.warnings, report.passed) == (1, 2, False)
+        assert len(report.issues) == 4
+
+    @pytest.mark.parametrize(
+        "mode, paths, expected",
+        [
+            ("auto", [f"/nas/a/{i}.mp4" for i in range(5)], True),
+            ("auto", [f"/nas/{i}/x.mp4" for i in range(5)], False),
+            ("per_dir", ["/nas/a/x.mp4"], True),
+            ("per_file", [f"/nas/a/{i}.mp4" for i in range(5)], False),
+        ],
+    )
+    def test_orphan_scan_mode(self, mode, paths, expected):
+        """orphan_scan_mode별 scandir 사용 여부 테스트"""
+        agent = ValidationAgent(config={"orphan_scan_mode": mode})
+
+        assert agent._orphans_by_dir(paths) is expected
+
+    def test_orphan_scan_mode_unknown(self):
+        """알 수 없는 orphan_scan_mode 거부 테스트"""
+        with pytest.raises(ValueError):
+            ValidationAgent(config={"orphan_scan_mode": "walk"})
+
+    def test_stat_paths_per_file(self, tmp_path):
+        """개별 stat 모드 결과 일치 테스트"""
+        (tmp_path / "a.mp4").write_bytes(b"abc")
+        paths = [str(tmp_path / "a.mp4"), str(tmp_path / "b.mp4"), str(tmp_path)]
+
+        assert stat_paths(paths, group_by_dir=False) == stat_paths(paths)